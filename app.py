@@ -1,4 +1,5 @@
 # app.py
+import importlib
 import streamlit as st
 import sys
 from pathlib import Path
@@ -6,18 +7,24 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from src.application.auth_service import AuthService
+from src.core import instrumentation
+from src.views.components.diagnostics_panel import render_diagnostics_panel
 
-# Import NEW Views
-from src.views.pages import (
-    assets_view,
-    dashboard_view,
-    portfolio_view,
-    cashflow_view,
-)
+# Page modules (and their pandas/plotly/chromadb imports) load only when selected
+PAGES = {
+    "Dashboard": "src.views.pages.dashboard_view",
+    "Assets": "src.views.pages.assets_view",
+    "Portfolio": "src.views.pages.portfolio_view",
+    "Cashflow": "src.views.pages.cashflow_view",
+}
 
 # Page Config
 st.set_page_config(page_title="Family Office", layout="wide", page_icon="🏛️")
 
+# Fresh per-rerun timing stats for the diagnostics panel, collected if this session turned them on
+instrumentation.begin_rerun()
+instrumentation.set_enabled(st.session_state.get("diagnostics_enabled", False))
+
 # Initialize Auth
 auth = AuthService()
 
@@ -57,23 +64,20 @@ else:
         # --- NAVIGATION ---
         page = st.radio(
             "Navigation",
-            ("Dashboard", "Assets", "Portfolio", "Cashflow")
+            tuple(PAGES)
         )
 
         st.divider()
+        instrumentation.set_enabled(
+            st.toggle("Diagnostics", key="diagnostics_enabled",
+                      help="Record hot-path timings for this session (CFO_DIAGNOSTICS=1 records them for all)")
+        )
         if st.button("Log Out"):
             auth.logout()
             st.rerun()
 
     # --- MAIN CONTENT AREA ---
-    if page == "Dashboard":
-        dashboard_view.render_view()
-    elif page == "Assets":
-        assets_view.render_view()
-    elif page == "Portfolio":
-        portfolio_view.render_view()
-    elif page == "Cashflow":
-        cashflow_view.render_view()
-    else:
-        # Default to dashboard
-        dashboard_view.render_view()
+    # Default to dashboard
+    importlib.import_module(PAGES.get(page, PAGES["Dashboard"])).render_view()
+
+    render_diagnostics_panel()
@@ -0,0 +1,180 @@
+# benchmarks/bench_embeddings.py
+"""
+Compares embedding backends (src/core/embedding_backends.py) on CPU.
+
+Each backend runs in its own process so load time and resident memory are not
+polluted by the others. Reported per backend:
+    load_s           model construction time
+    texts_per_s      throughput embedding the query set (after one warm-up batch)
+    max_rss_mb       peak resident memory of the worker process
+    agreement        share of queries whose top-1 rule category matches the reference backend
+    accept_agreement same, counting only whether each query clears the auto-accept distance
+    mean_cosine      mean cosine similarity to the reference backend's query vectors
+
+Usage:
+    python -m benchmarks.bench_embeddings
+    python -m benchmarks.bench_embeddings --backends sentence-transformers onnx-int8 --threads 2 --batch-size 128
+"""
+import argparse
+import json
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run_benchmarks import ROOT, _git_commit
+from benchmarks.synthetic import INCOME_SOURCES, MERCHANTS
+
+# Rule category for every synthetic counterparty
+CATEGORIES = {
+    "Albert Hypermarket": "Groceries", "Tesco Stores CR": "Groceries", "Lidl Praha": "Groceries",
+    "Kaufland Brno": "Groceries", "Rohlik.cz": "Groceries", "Netflix.com": "Subscriptions",
+    "Spotify AB": "Subscriptions", "Dr. Max Lekarna": "Health", "Benzina Orlen": "Fuel",
+    "Shell Praha": "Fuel", "Alza.cz": "Shopping", "IKEA Zlicin": "Shopping", "Uber BV": "Transport",
+    "Bolt Operations": "Transport", "DPP Jizdenky": "Transport", "Hypoteka splatka": "Housing",
+    "PRE Elektrina": "Utilities", "Vodafone CZ": "Utilities", "Airbnb Payments": "Travel",
+    "Booking.com": "Travel", "Mzda ACME s.r.o.": "Salary", "Raiffeisenbank urok": "Interest",
+    "FU pro Prahu vratka": "Tax Refund", "Dividenda CEZ": "Dividends",
+}
+
+
+def _queries(n: int, seed: int):
+    """Bank-export style descriptions: counterparty plus payment reference, with some noise."""
+    rng = random.Random(seed)
+    parties = MERCHANTS + INCOME_SOURCES
+    out = []
+    for _ in range(n):
+        text = f"{rng.choice(parties)} VS {rng.randint(10**7, 10**8 - 1)}"
+        roll = rng.random()
+        if roll < 0.2:
+            text = text.upper()
+        elif roll < 0.3:
+            text = text.split(" VS ")[0][:8]
+        out.append(text)
+    return out
+
+
+def _worker(backend: str, threads: int, batch_size: int, texts_file: Path, out_dir: Path) -> dict:
+    from src.core.embedding_backends import build_embedding_function
+    from src.core.vector_store import EMBEDDING_MODEL_NAME
+
+    texts = json.loads(texts_file.read_text())
+    start = time.perf_counter()
+    ef = build_embedding_function(EMBEDDING_MODEL_NAME, backend, threads=threads, batch_size=batch_size)
+    load_s = time.perf_counter() - start
+
+    rules = np.asarray(ef(texts["rules"]), dtype=np.float32)
+    ef(texts["queries"][:batch_size])  # warm-up
+    start = time.perf_counter()
+    queries = np.asarray(ef(texts["queries"]), dtype=np.float32)
+    embed_s = time.perf_counter() - start
+
+    np.save(out_dir / f"{backend}.rules.npy", rules)
+    np.save(out_dir / f"{backend}.queries.npy", queries)
+    return {
+        "load_s": load_s,
+        "texts_per_s": len(texts["queries"]) / embed_s,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    return m / np.clip(np.linalg.norm(m, axis=1, keepdims=True), 1e-12, None)
+
+
+def _top1(rules: np.ndarray, queries: np.ndarray):
+    sims = _normalize(queries) @ _normalize(rules).T
+    best = sims.argmax(axis=1)
+    return best, 1.0 - sims[np.arange(len(best)), best]
+
+
+def _run_backends(args, workdir: Path, categories: np.ndarray) -> list:
+    from src.application.rule_service import MATCH_THRESHOLD
+
+    results = []
+    reference = None
+    for backend in args.backends:
+        print(f"Running {backend}...", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_embeddings", "--worker", backend, "--workdir", str(workdir),
+             "--threads", str(args.threads), "--batch-size", str(args.batch_size)],
+            cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            results.append({"name": backend, "error": (proc.stderr.strip().splitlines() or ["failed"])[-1]})
+            continue
+
+        entry = {"name": backend, **json.loads(proc.stdout.strip().splitlines()[-1])}
+        rules = np.load(workdir / f"{backend}.rules.npy")
+        queries = np.load(workdir / f"{backend}.queries.npy")
+        best, distance = _top1(rules, queries)
+        if reference is None:
+            reference = (categories[best], distance < MATCH_THRESHOLD, _normalize(queries))
+        else:
+            ref_categories, ref_accepted, ref_queries = reference
+            entry["agreement"] = float(np.mean(categories[best] == ref_categories))
+            entry["accept_agreement"] = float(np.mean((distance < MATCH_THRESHOLD) == ref_accepted))
+            entry["mean_cosine"] = float(np.mean(np.sum(_normalize(queries) * ref_queries, axis=1)))
+        results.append(entry)
+    return results
+
+
+def main(argv=None):
+    from src.core.embedding_backends import BACKENDS, BATCH_SIZE, THREADS
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS),
+                        help="First one is the reference for agreement (default: all, full precision first).")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=THREADS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        stats = _worker(args.worker, args.threads, args.batch_size, args.workdir / "texts.json", args.workdir)
+        print(json.dumps(stats))
+        return
+
+    rule_texts = list(CATEGORIES)
+    categories = np.array([CATEGORIES[r] for r in rule_texts])
+    workdir = Path(tempfile.mkdtemp(prefix="cfo_bench_emb_"))
+    (workdir / "texts.json").write_text(json.dumps({"rules": rule_texts, "queries": _queries(args.queries, args.seed)}))
+
+    try:
+        results = _run_backends(args, workdir, categories)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "queries": args.queries,
+            "threads": args.threads,
+            "batch_size": args.batch_size,
+            "reference": next((r["name"] for r in results if "error" not in r), None),
+        },
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
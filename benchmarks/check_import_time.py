@@ -0,0 +1,101 @@
+# benchmarks/check_import_time.py
+"""
+Import-time budget for the login page.
+
+Runs app.py (Streamlit bare mode, logged out) under `python -X importtime` in a
+fresh interpreter and fails if
+  * the total import time exceeds the budget, or
+  * any heavy dependency that only logged-in pages need was imported.
+
+Usage:
+    python -m benchmarks.check_import_time --budget-ms 1500 --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = float(os.environ.get("CFO_IMPORT_BUDGET_MS", "1500"))
+
+# Must not be imported before a page is selected. (Streamlit itself imports the
+# top-level `plotly` package lazily, so only plotly.express is checked.)
+FORBIDDEN = [
+    "chromadb",
+    "sentence_transformers",
+    "torch",
+    "scipy",
+    "pandas",
+    "plotly.express",
+    "requests",
+    "sqlalchemy",
+    "sqlmodel",
+]
+
+_PROBE = """
+import json, runpy, sys
+sys.path.insert(0, {root!r})
+runpy.run_path({app!r}, run_name="__main__")
+print(json.dumps([m for m in {forbidden!r} if m in sys.modules]))
+"""
+
+
+def _parse_importtime(stderr: str):
+    """Returns (total_us, {top-level module: cumulative_us})."""
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        if name.startswith("  "):
+            continue
+        top_level[name.strip()] = top_level.get(name.strip(), 0) + int(cumulative)
+    return sum(top_level.values()), top_level
+
+
+def measure_once() -> dict:
+    probe = _PROBE.format(root=str(ROOT), app=str(ROOT / "app.py"), forbidden=FORBIDDEN)
+    # Run from a scratch directory: AuthService creates ./data on start-up
+    with tempfile.TemporaryDirectory(prefix="cfo_importtime_") as workdir:
+        env = dict(os.environ, CFO_DB_FILE=str(Path(workdir) / "cfo.db"))
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                              cwd=workdir, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Login-path probe failed:\n{proc.stderr[-2000:]}")
+
+    total_us, top_level = _parse_importtime(proc.stderr)
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"total_ms": total_us / 1000, "top_level": top_level, "forbidden_loaded": loaded}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs (filters disk-cache noise).")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest top-level imports.")
+    args = parser.parse_args(argv)
+
+    runs = [measure_once() for _ in range(args.repeat)]
+    best = min(runs, key=lambda r: r["total_ms"])
+
+    print(f"Login-path import time: {best['total_ms']:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.repeat})")
+    for name, us in sorted(best["top_level"].items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    loaded = sorted({m for r in runs for m in r["forbidden_loaded"]})
+    if loaded:
+        print(f"FAIL: heavy modules imported on the login path: {', '.join(loaded)}")
+        failed = True
+    if best["total_ms"] > args.budget_ms:
+        print(f"FAIL: import time over budget by {best['total_ms'] - args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# benchmarks/compare.py
+"""
+Compares two benchmark JSON reports.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Exits non-zero if any benchmark's median got slower than the threshold.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _load(path: Path) -> dict:
+    report = json.loads(path.read_text())
+    return {r["name"]: r for r in report["results"]}, report["meta"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed relative slowdown of the median (default 10%%).")
+    args = parser.parse_args(argv)
+
+    base, base_meta = _load(args.baseline)
+    cand, cand_meta = _load(args.candidate)
+    print(f"baseline  {base_meta['commit'][:10]}  ({base_meta['transactions']} tx, {base_meta['users']} users)")
+    print(f"candidate {cand_meta['commit'][:10]}  ({cand_meta['transactions']} tx, {cand_meta['users']} users)")
+
+    regressions = []
+    for name, c in cand.items():
+        b = base.get(name)
+        if not b:
+            print(f"  {name:<45} {c['median_s']:>9.4f}s  (new)")
+            continue
+        change = (c["median_s"] - b["median_s"]) / b["median_s"] if b["median_s"] else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<45} {b['median_s']:>9.4f}s -> {c['median_s']:>9.4f}s  {change:+.1%}{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# benchmarks/run_benchmarks.py
+"""
+Times the core pipelines against a throwaway SQLite database.
+
+Usage:
+    python -m benchmarks.run_benchmarks --scale small --users 5 --output bench.json
+    python -m benchmarks.compare baseline.json bench.json
+
+Scales: small = 10k, medium = 100k, large = 1M transactions (split across users).
+The benchmarked ("probe") user imports its share through the real upload path;
+the remaining users are bulk-inserted so the shared tables have realistic size.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID, uuid5, NAMESPACE_URL
+
+SCALES = {"small": 10_000, "medium": 100_000, "large": 1_000_000}
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class _NullRuleEngine:
+    """Rule engine that never matches - isolates pipeline cost from model inference."""
+
+    def find_match(self, description, threshold: float = 0.3, owner=None):
+        return None
+
+    def find_matches(self, descriptions, threshold: float = 0.3, owner=None):
+        return [None] * len(descriptions)
+
+    def find_candidates(self, descriptions, k: int = 3, owner=None):
+        return [[] for _ in descriptions]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def _measure(name: str, fn, repeat: int = 1, **extra) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    result = {
+        "name": name,
+        "runs": repeat,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "max_s": max(timings),
+    }
+    result.update(extra)
+    print(f"  {name:<45} median {result['median_s']:.4f}s", file=sys.stderr)
+    return result
+
+
+def run(n_transactions: int, n_users: int, seed: int, repeat: int, rules: str, workdir: Path,
+        diagnostics: bool = False) -> dict:
+    # The DB location must be set before anything imports src.core.database
+    os.environ["CFO_DB_FILE"] = str(workdir / "bench.db")
+    sys.path.insert(0, str(ROOT))
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    import streamlit as st
+    from src.core import instrumentation
+    from src.core.database import init_db
+    from src.core.ingestion.csv_strategy import CsvBankStrategy
+    from src.domain.repositories.sql_repository import (
+        SqlAssetRepository, SqlTransactionRepository, SqlPortfolioRepository, SqlLiabilityRepository
+    )
+    from src.application.asset_service import AssetService
+    from src.application.ledger_service import LedgerService
+    from src.application.portfolio_service import PortfolioService
+    from src.application.summary_service import SummaryService
+    from src.application.liability_service import LiabilityService
+    from src.application.rule_service import RuleService
+    from src.application.ingestion_service import IngestionService
+    from benchmarks import synthetic
+
+    init_db()
+
+    asset_repo = SqlAssetRepository()
+    ledger_repo = SqlTransactionRepository()
+    portfolio_repo = SqlPortfolioRepository()
+    liability_repo = SqlLiabilityRepository()
+
+    if rules == "vector":
+        from src.core.vector_store import VectorRuleEngine
+        rule_service = RuleService(VectorRuleEngine(persist_path=str(workdir / "chroma")))
+    elif rules == "tfidf":
+        from src.core.tfidf_rule_engine import TfidfRuleEngine
+        rule_service = RuleService(TfidfRuleEngine())
+    else:
+        rule_service = RuleService(_NullRuleEngine())
+
+    asset_service = AssetService(asset_repo)
+    ingestion_service = IngestionService(rule_service, asset_service)
+    ledger_service = LedgerService(ledger_repo, ingestion_service)
+    portfolio_service = PortfolioService(portfolio_repo)
+    liability_service = LiabilityService(liability_repo)
+    summary_service = SummaryService(asset_service, ledger_service, portfolio_service, liability_service)
+
+    users = [uuid5(NAMESPACE_URL, f"bench-user-{i}") for i in range(n_users)]
+    per_user = max(1, n_transactions // n_users)
+    probe: UUID = users[0]
+
+    print(f"Seeding {n_users} user(s), {per_user} transactions each...", file=sys.stderr)
+    for i, uid in enumerate(users):
+        asset_repo.save_all(synthetic.generate_assets(uid, 30, seed + i))
+        for liab in synthetic.generate_liabilities(uid, 5, seed + i):
+            liability_repo.save(liab)
+        if uid == probe:
+            continue
+        st.session_state["user"] = {"id": str(uid), "username": f"bench{i}"}
+        background = []
+        for upload in synthetic.generate_bank_uploads(per_user, seed + i):
+            txs, _ = ingestion_service.process_file(upload.name, upload.getvalue(), uid, f"Seed_{i}")
+            background.extend(txs)
+        ledger_repo.save_bulk(background)
+
+    st.session_state["user"] = {"id": str(probe), "username": "bench0"}
+    instrumentation.set_enabled(diagnostics)
+    instrumentation.cumulative.reset()
+    uploads = synthetic.generate_bank_uploads(per_user, seed)
+    snapshot = synthetic.generate_snapshot_csv(max(10, per_user // 200), seed)
+    history = synthetic.generate_history_csv(max(100, per_user // 2), seed)
+
+    strategy = CsvBankStrategy()
+    results = [
+        _measure("CsvBankStrategy.parse", lambda: [strategy.parse(u.name, u.getvalue()) for u in uploads],
+                 repeat, rows=per_user, files=len(uploads)),
+        _measure("IngestionService.process_file",
+                 lambda: [ingestion_service.process_file(u.name, u.getvalue(), probe, "Bench") for u in uploads],
+                 repeat, rows=per_user, files=len(uploads)),
+        # Stateful: a second run would only measure deduplication
+        _measure("LedgerService.process_uploads", lambda: ledger_service.process_uploads(uploads),
+                 1, rows=per_user, files=len(uploads)),
+        _measure("PortfolioService.process_files",
+                 lambda: portfolio_service.process_files(synthetic.SyntheticUpload("snap.csv", snapshot),
+                                                         synthetic.SyntheticUpload("hist.csv", history)),
+                 1),
+        _measure("SummaryService.get_executive_summary", summary_service.get_executive_summary, repeat),
+        _measure("PortfolioService.get_portfolio_overview", portfolio_service.get_portfolio_overview, repeat),
+    ]
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "transactions": n_transactions,
+            "users": n_users,
+            "seed": seed,
+            "repeat": repeat,
+            "rules": rules,
+        },
+        "results": results,
+    }
+    if diagnostics:
+        report["diagnostics"] = instrumentation.cumulative.snapshot()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--transactions", type=int, help="Overrides --scale with an explicit total.")
+    parser.add_argument("--users", type=int, default=1, help="Number of users sharing the database (1-50).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per read-only benchmark.")
+    parser.add_argument("--rules", choices=["none", "vector", "tfidf"], default="none",
+                        help="'none' skips rule lookups; 'vector' uses the real VectorRuleEngine, "
+                             "'tfidf' the TfidfRuleEngine.")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="Include the per-method timing breakdown (adds instrumentation overhead).")
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout.")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary database directory.")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.users <= 50:
+        parser.error("--users must be between 1 and 50")
+
+    n_transactions = args.transactions or SCALES[args.scale]
+    workdir = Path(tempfile.mkdtemp(prefix="cfo_bench_"))
+    try:
+        report = run(n_transactions, args.users, args.seed, args.repeat, args.rules, workdir,
+                     args.diagnostics)
+    finally:
+        if not args.keep:
+            import shutil
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
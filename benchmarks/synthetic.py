@@ -0,0 +1,182 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic data for the benchmark suite.
+
+Everything is driven by a seeded `random.Random`, so the same seed and scale
+always produce byte-identical files and comparable timings across commits.
+"""
+import io
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+from uuid import UUID
+
+from src.domain.enums import AssetCategory, CashCategory, LiabilityCategory, RealEstateType
+from src.domain.models.MAsset import Asset
+from src.domain.models.MLiability import Liability
+
+MERCHANTS = [
+    "Albert Hypermarket", "Tesco Stores CR", "Lidl Praha", "Kaufland Brno", "Rohlik.cz",
+    "Netflix.com", "Spotify AB", "Dr. Max Lekarna", "Benzina Orlen", "Shell Praha",
+    "Alza.cz", "IKEA Zlicin", "Uber BV", "Bolt Operations", "DPP Jizdenky",
+    "Hypoteka splatka", "PRE Elektrina", "Vodafone CZ", "Airbnb Payments", "Booking.com",
+]
+INCOME_SOURCES = ["Mzda ACME s.r.o.", "Raiffeisenbank urok", "FU pro Prahu vratka", "Dividenda CEZ"]
+TICKERS = [
+    ("AAPL", "Apple Inc.", "Technology"), ("MSFT", "Microsoft Corp.", "Technology"),
+    ("JNJ", "Johnson & Johnson", "Healthcare"), ("KO", "Coca-Cola Co.", "Consumer Staples"),
+    ("CEZ", "CEZ a.s.", "Utilities"), ("O", "Realty Income", "Real Estate"),
+    ("VWCE", "Vanguard FTSE All-World", "ETF"), ("XOM", "Exxon Mobil", "Energy"),
+]
+
+# Column layouts mirror BANK_CONFIGS in src/core/ingestion/bank_configs.py
+CS_HEADER = ["Own account name", "Own account number", "Processing Date", "Partner Name",
+             "Partner account number", "Note", "Amount", "Currency"]
+RB_HEADER = ["Datum provedení", "Číslo účtu", "Název protiúčtu", "Číslo protiúčtu",
+             "Zpráva", "Zaúčtovaná částka", "Měna"]
+
+
+class SyntheticUpload(io.BytesIO):
+    """Stands in for Streamlit's UploadedFile (name + getvalue/seek/read)."""
+
+    def __init__(self, name: str, content: bytes):
+        super().__init__(content)
+        self.name = name
+
+
+def _czech_amount(value: Decimal) -> str:
+    # "-1 234,56" style as exported by Czech banks
+    return f"{value:,.2f}".replace(",", " ").replace(".", ",")
+
+
+def _random_tx(rng: random.Random, day: date, seq: int):
+    if rng.random() < 0.08:
+        partner = rng.choice(INCOME_SOURCES)
+        amount = Decimal(rng.randint(1_000_00, 120_000_00)) / 100
+    else:
+        partner = rng.choice(MERCHANTS)
+        amount = -Decimal(rng.randint(50, 8_000_00)) / 100
+    partner_acc = f"{rng.randint(10**8, 10**10 - 1)}/{rng.choice(['0800', '0100', '2010', '5500'])}"
+    note = f"VS {seq:08d}"
+    return partner, partner_acc, note, amount
+
+
+def generate_bank_csv(bank: str, n_rows: int, seed: int, own_account: str,
+                      start: date = date(2015, 1, 1)) -> bytes:
+    """
+    Builds one bank statement export.
+    CS exports are UTF-8, RB exports are cp1250 - both ';' separated with decimal commas.
+    """
+    rng = random.Random(f"{bank}-{seed}")
+    lines = []
+    if bank == "CS":
+        lines.append(";".join(CS_HEADER))
+    elif bank == "RB":
+        lines.append(";".join(RB_HEADER))
+    else:
+        raise ValueError(f"Unknown synthetic bank format: {bank}")
+
+    day = start
+    for i in range(n_rows):
+        day += timedelta(days=rng.random() < 0.3)
+        partner, partner_acc, note, amount = _random_tx(rng, day, seed * 10_000_000 + i)
+        d = day.strftime("%d.%m.%Y")
+        if bank == "CS":
+            row = ["Bezny ucet", own_account, d, partner, partner_acc, note, _czech_amount(amount), "CZK"]
+        else:
+            row = [d, own_account, partner, partner_acc, note, _czech_amount(amount), "CZK"]
+        lines.append(";".join(row))
+
+    encoding = "utf-8" if bank == "CS" else "cp1250"
+    return ("\n".join(lines) + "\n").encode(encoding)
+
+
+def generate_bank_uploads(n_transactions: int, seed: int, rows_per_file: int = 5_000) -> List[SyntheticUpload]:
+    """Splits n_transactions over alternating CS/RB monthly-style statement files."""
+    uploads = []
+    n_files = max(1, -(-n_transactions // rows_per_file))
+    remaining = n_transactions
+    for i in range(n_files):
+        bank = "CS" if i % 2 == 0 else "RB"
+        rows = min(rows_per_file, remaining)
+        remaining -= rows
+        own_account = "19-2000145399/0800" if bank == "CS" else "1234567890/5500"
+        content = generate_bank_csv(bank, rows, seed=seed * 1000 + i, own_account=own_account,
+                                    start=date(2010, 1, 1) + timedelta(days=30 * i))
+        uploads.append(SyntheticUpload(f"{bank}_statement_{i:04d}.csv", content))
+    return uploads
+
+
+def generate_snapshot_csv(n_positions: int, seed: int) -> bytes:
+    """Snowball 'Holdings' export."""
+    rng = random.Random(f"snap-{seed}")
+    lines = ["Symbol,Name,Quantity,Price,Value,Cost basis,Sector,Dividend yield"]
+    for i in range(n_positions):
+        ticker, name, sector = TICKERS[i % len(TICKERS)]
+        qty = rng.randint(1, 500)
+        price = rng.randint(10_00, 900_00) / 100
+        cost = round(qty * price * rng.uniform(0.6, 1.2), 2)
+        lines.append(f"{ticker}{i // len(TICKERS) or ''},{name},{qty},{price:.2f},{qty * price:.2f},"
+                     f"{cost:.2f},{sector},{rng.uniform(0, 6):.2f}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def generate_history_csv(n_events: int, seed: int, start: date = date(2010, 1, 1)) -> bytes:
+    """Snowball 'History' export with daily-ish BUY/SELL/DIVIDEND/DEPOSIT events."""
+    rng = random.Random(f"hist-{seed}")
+    lines = ["Date,Symbol,Type,Quantity,Price,Amount,Currency"]
+    day = start
+    for _ in range(n_events):
+        day += timedelta(days=rng.randint(0, 2))
+        ticker = TICKERS[rng.randrange(len(TICKERS))][0]
+        event = rng.choices(["BUY", "SELL", "DIVIDEND", "DEPOSIT"], weights=[60, 10, 20, 10])[0]
+        qty = rng.randint(1, 20) if event in ("BUY", "SELL") else 0
+        price = rng.randint(10_00, 900_00) / 100 if qty else 0
+        amount = qty * price if qty else rng.randint(100, 50_000) / 10
+        lines.append(f"{day.isoformat()},{ticker},{event},{qty},{price:.2f},{amount:.2f},"
+                     f"{rng.choice(['USD', 'EUR', 'CZK'])}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def generate_assets(owner: UUID, n_assets: int, seed: int) -> List[Asset]:
+    rng = random.Random(f"assets-{seed}")
+    assets = []
+    for i in range(n_assets):
+        kind = i % 3
+        if kind == 0:
+            assets.append(Asset(
+                category=AssetCategory.REAL_ESTATE, owner=owner,
+                value=Decimal(rng.randint(3_000_000, 20_000_000)),
+                property_type=RealEstateType.PRIMARY_RESIDENCE,
+                address=f"Ulice {i}", city="Praha", postal_code="11000",
+            ))
+        elif kind == 1:
+            price = Decimal(rng.randint(300_000, 2_000_000))
+            assets.append(Asset(
+                category=AssetCategory.VEHICLE, owner=owner, value=price, acquisition_price=price,
+                brand="Skoda", model="Octavia", year_made=rng.randint(2008, 2025),
+                kilometers_driven=rng.randint(0, 300_000),
+            ))
+        else:
+            assets.append(Asset(
+                category=AssetCategory.CASH, owner=owner,
+                value=Decimal(rng.randint(0, 2_000_000)),
+                cash_type=CashCategory.CHECKING_ACCOUNT.value,
+                account_identifier=f"{rng.randint(10**8, 10**10 - 1)}/0800",
+            ))
+    return assets
+
+
+def generate_liabilities(owner: UUID, n_liabilities: int, seed: int) -> List[Liability]:
+    rng = random.Random(f"liabs-{seed}")
+    return [
+        Liability(
+            owner=owner,
+            amount=Decimal(rng.randint(10_000, 5_000_000)),
+            liability_type=rng.choice(list(LiabilityCategory)),
+            institution=rng.choice(["Hypotecni banka", "CSOB", "Air Bank"]),
+            interest_rate=Decimal(rng.randint(100, 900)) / 100,
+        )
+        for _ in range(n_liabilities)
+    ]
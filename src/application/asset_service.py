@@ -1,12 +1,21 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 from decimal import Decimal
 import streamlit as st
 
+from src.core import data_version
+from src.core.accounts import AccountIndex
+from src.core.money import from_minor
+from src.core.instrumentation import timed
 from src.domain.models.MAsset import Asset, NetWorthSnapshot
 from src.domain.enums import AssetCategory
 from src.domain.repositories.asset_repository import AssetRepository
-from src.views.utils import calculate_vehicle_amortization
+from src.views.utils import calculate_vehicle_amortization, calculate_vehicle_amortization_batch
+
+
+# Asset.name is derived from these in Asset._construct_name()
+NAME_FIELDS = {"category", "property_type", "address", "year_made", "brand", "model",
+               "cash_type", "account_identifier"}
 
 
 def _get_current_user_id() -> UUID:
@@ -19,37 +28,63 @@ def _get_current_user_id() -> UUID:
 class AssetService:
     def __init__(self, repo: AssetRepository):
         self.repo = repo
-
-    def get_user_assets(self) -> List[Asset]:
-        uid = _get_current_user_id()
+        # owner -> (assets data version, index); rebuilt only after an asset change
+        self._account_indexes: Dict[UUID, Tuple[int, AccountIndex]] = {}
+
+    @timed()
+    def get_total_value(self, user_id: UUID = None) -> Decimal:
+        """Sum of all asset values, computed in the database in minor units."""
+        positive, negative = self.repo.get_value_totals(user_id or _get_current_user_id())
+        return from_minor(positive + negative)
+
+    @timed()
+    def get_user_assets(self, user_id: UUID = None) -> List[Asset]:
+        # Background jobs have no session, so they pass the owner explicitly
+        uid = user_id or _get_current_user_id()
         return self.repo.get_all(uid)
 
+    @timed()
+    def get_account_index(self, user_id: UUID = None) -> AccountIndex:
+        """Canonical identifiers of the user's own accounts (for internal-transfer detection)."""
+        uid = user_id or _get_current_user_id()
+        version = data_version.get(uid, data_version.ASSETS)
+        cached = self._account_indexes.get(uid)
+        if cached is None or cached[0] != version:
+            index = AccountIndex.build(a.account_identifier for a in self.repo.get_all(uid) if a.account_identifier)
+            cached = self._account_indexes[uid] = (version, index)
+        return cached[1]
+
+    @timed()
     def update_asset_value(self, asset_id: UUID, new_value: Decimal = None, **kwargs) -> None:
         """
         Update an asset by id. The view should pass the asset id and updated fields;
         the service mutates the domain model and persists it via the repository.
         """
         uid = _get_current_user_id()
-        assets = self.repo.get_all(uid)
-        # Find the asset by id
-        target = None
-        for a in assets:
-            if str(a.id) == str(asset_id):
-                target = a
-                break
-        if not target:
-            raise ValueError(f"Asset not found: {asset_id}")
-
-        # Apply updates
-        if new_value is not None:
-            target.value = new_value
+        asset_id = UUID(str(asset_id))
 
-        for key, val in kwargs.items():
-            if hasattr(target, key):
+        fields = {key: val for key, val in kwargs.items() if key in Asset.model_fields and key != "id"}
+        if new_value is not None:
+            fields["value"] = new_value
+        if not fields:
+            return
+
+        if NAME_FIELDS.isdisjoint(fields):
+            if not self.repo.update_fields(uid, asset_id, **fields):
+                raise ValueError(f"Asset not found: {asset_id}")
+        else:
+            # The display name must be rebuilt, so go through the model
+            target = self.repo.get_by_id(uid, asset_id)
+            if not target:
+                raise ValueError(f"Asset not found: {asset_id}")
+            for key, val in fields.items():
                 setattr(target, key, val)
+            target.name = target._construct_name()
+            self.repo.save(target)
 
-        self.repo.save(target)
+        data_version.bump(uid, data_version.ASSETS)
 
+    @timed()
     def create_asset(self, category: AssetCategory, value: Decimal, **kwargs):
         uid = _get_current_user_id()
 
@@ -64,18 +99,23 @@ class AssetService:
             **kwargs
         )
         self.repo.save(asset)
+        data_version.bump(uid, data_version.ASSETS)
 
+    @timed()
     def delete_asset(self, asset_id: UUID):
-        self.repo.delete(asset_id)
+        uid = _get_current_user_id()
+        self.repo.delete(uid, asset_id)
+        data_version.bump(uid, data_version.ASSETS)
 
+    @timed()
     def run_vehicle_amortization_update(self, vehicle_id: UUID, current_kilometers: int):
         """
         Updates the market value of a specific vehicle based on new mileage.
         """
         uid = _get_current_user_id()
-        vehicle = next((a for a in self.get_user_assets() if a.id == vehicle_id and a.category == AssetCategory.VEHICLE), None)
+        vehicle = self.repo.get_by_id(uid, UUID(str(vehicle_id)))
 
-        if vehicle and vehicle.acquisition_price and vehicle.year_made:
+        if vehicle and vehicle.category == AssetCategory.VEHICLE and vehicle.acquisition_price and vehicle.year_made:
             estimated_value = calculate_vehicle_amortization(
                 acquisition_price=vehicle.acquisition_price,
                 year_made=vehicle.year_made,
@@ -83,11 +123,43 @@ class AssetService:
             )
             self.update_asset_value(vehicle.id, new_value=estimated_value, kilometers_driven=current_kilometers)
 
+    @timed()
+    def revalue_vehicles(self, user_id: Optional[UUID] = None, all_owners: bool = False,
+                         current_year: int = None) -> int:
+        """
+        Re-estimates the market value of every vehicle (of the user, or of everybody with
+        all_owners=True) from age and recorded mileage, in one read and one bulk write.
+        Returns the number of vehicles whose value changed.
+        """
+        owner = None if all_owners else (user_id or _get_current_user_id())
+        vehicles = [v for v in self.repo.get_by_category(owner, AssetCategory.VEHICLE)
+                    if v.acquisition_price and v.year_made]
+        if not vehicles:
+            return 0
+
+        estimates = calculate_vehicle_amortization_batch(
+            [v.acquisition_price for v in vehicles],
+            [v.year_made for v in vehicles],
+            [v.kilometers_driven for v in vehicles],
+            current_year=current_year,
+        )
+        changed = {}
+        for vehicle, estimate in zip(vehicles, estimates):
+            if vehicle.value != estimate:
+                changed.setdefault(vehicle.owner, {})[vehicle.id] = estimate
+
+        # One bulk write per owner (each owner may live in their own shard)
+        for owner_id, values in changed.items():
+            self.repo.update_values(owner_id, values)
+            data_version.bump(owner_id, data_version.ASSETS)
+        return sum(len(values) for values in changed.values())
+
+    @timed()
     def get_net_worth_snapshot(self) -> NetWorthSnapshot:
-        assets = self.get_user_assets()
+        positive, negative = self.repo.get_value_totals(_get_current_user_id())
 
-        total_assets = sum((a.value for a in assets if a.value >= 0), Decimal(0))
-        total_liabilities = sum((-a.value for a in assets if a.value < 0), Decimal(0))
+        total_assets = from_minor(positive)
+        total_liabilities = from_minor(-negative)
 
         return NetWorthSnapshot(
             total_assets=total_assets,
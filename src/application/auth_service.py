@@ -1,12 +1,13 @@
 # services/auth_service.py
 import streamlit as st
-import json
 import hashlib
 from pathlib import Path
 from uuid import uuid4
 import logging
 from typing import Optional
 
+from src.core.user_store import get_user_store
+
 DATA_ROOT = Path("data")
 USERS_FILE = DATA_ROOT / "users.json"
 
@@ -18,26 +19,24 @@ logger.addHandler(logging.NullHandler())
 class AuthService:
     def __init__(self):
         DATA_ROOT.mkdir(exist_ok=True)
-        if not USERS_FILE.exists():
-            USERS_FILE.write_text(json.dumps({}))
+        # Shared, mtime-refreshed index; a missing file is an empty store
+        self.store = get_user_store(USERS_FILE)
         logger.debug("AuthService initialized; users file=%s", USERS_FILE)
 
     # ---------- internal helpers ----------
 
-    def _load_users(self) -> dict:
-        logger.debug("Loading users from %s", USERS_FILE)
-        try:
-            return json.loads(USERS_FILE.read_text())
-        except Exception as e:
-            logger.exception("Failed to load users file: %s", e)
-            return {}
-
-    def _save_users(self, users: dict):
-        try:
-            USERS_FILE.write_text(json.dumps(users, indent=2))
-            logger.debug("Saved users file with %d entries", len(users))
-        except Exception as e:
-            logger.exception("Failed to save users file: %s", e)
+    def _migrate_legacy(self, clean_name: str, username_key: str, legacy: dict) -> str:
+        # Replace the plaintext-username entry with a hashed-key one in a single write
+        user_id = legacy.get("id") or str(uuid4())
+        self.store.apply(
+            upserts={username_key: {
+                "username_hashed": username_key,
+                "password": legacy.get("password"),
+                "id": user_id
+            }},
+            deletes=[clean_name],
+        )
+        return user_id
 
     def _hash_password(self, password: str) -> str:
         # Do NOT log passwords
@@ -54,7 +53,6 @@ class AuthService:
             return False
 
         clean_name = username.lower().strip().replace(" ", "_")
-        users = self._load_users()
         password_hash = self._hash_password(password)
 
         username_key = self._hash_username(clean_name)
@@ -63,65 +61,45 @@ class AuthService:
         logger.info("Login attempt user_key=%s", short_key)
 
         user_id: Optional[str] = None
+        record = self.store.get(username_key)
         # User exists → verify password. Support legacy plaintext keys by migrating them.
-        if username_key in users:
+        if record is not None:
             logger.debug("Found hashed user entry user_key=%s", short_key)
             # modern hashed-key user
-            if users[username_key].get("password") == password_hash:
-                user_id = users[username_key].get("id", str(uuid4()))
-                users[username_key]["id"] = user_id
-                self._save_users(users)
+            if record.get("password") == password_hash:
+                user_id = record.get("id") or str(uuid4())
+                # Written only if the id had to be assigned
+                self.store.apply({username_key: {**record, "id": user_id}})
                 logger.info("User logged in id=%s user_key=%s", user_id, short_key)
             else:
                 # Hashed-key exists but password mismatch. Try legacy plaintext key as fallback (handle partial migrations)
-                if clean_name in users and users[clean_name].get("password") == password_hash:
+                legacy = self.store.get(clean_name)
+                if legacy is not None and legacy.get("password") == password_hash:
                     logger.info("Hashed-key password mismatch but legacy plaintext key matches; migrating legacy entry for user_key=%s", short_key)
-                    user_id = users[clean_name].get("id", str(uuid4()))
-                    users[username_key] = {
-                        "username_hashed": username_key,
-                        "password": users[clean_name].get("password"),
-                        "id": user_id
-                    }
-                    try:
-                        del users[clean_name]
-                    except KeyError:
-                        logger.debug("Legacy plaintext key missing during migration delete: %s", clean_name)
-                    self._save_users(users)
+                    user_id = self._migrate_legacy(clean_name, username_key, legacy)
                     logger.info("Migrated legacy plaintext user to hashed key id=%s user_key=%s", user_id, short_key)
                 else:
                     logger.warning("Password mismatch for user_key=%s", short_key)
                     return False
-        elif clean_name in users:
-            logger.info("Legacy plaintext user key detected for masked user; migrating to hashed key user_key=%s", short_key)
-            # legacy plaintext username key found — verify and migrate
-            if users[clean_name].get("password") != password_hash:
-                logger.warning("Password mismatch for legacy plaintext key (masked) user_key=%s", short_key)
-                return False
-            # retrieve or create id
-            user_id = users[clean_name].get("id", str(uuid4()))
-            # create new hashed-key entry and remove plaintext key
-            users[username_key] = {
-                "username_hashed": username_key,
-                "password": users[clean_name].get("password"),
-                "id": user_id
-            }
-            # remove legacy key
-            try:
-                del users[clean_name]
-            except KeyError:
-                logger.debug("Legacy plaintext key not present when attempting delete: %s", clean_name)
-            self._save_users(users)
-            logger.info("Migrated legacy user to id=%s user_key=%s", user_id, short_key)
         else:
-            # Create new user (remove this block if you want login-only)
-            user_id = str(uuid4())
-            users[username_key] = {
-                "username_hashed": username_key,
-                "password": password_hash,
-                "id": user_id
-            }
-            self._save_users(users)
-            logger.info("Created new user id=%s user_key=%s", user_id, short_key)
+            legacy = self.store.get(clean_name)
+            if legacy is not None:
+                logger.info("Legacy plaintext user key detected for masked user; migrating to hashed key user_key=%s", short_key)
+                # legacy plaintext username key found — verify and migrate
+                if legacy.get("password") != password_hash:
+                    logger.warning("Password mismatch for legacy plaintext key (masked) user_key=%s", short_key)
+                    return False
+                user_id = self._migrate_legacy(clean_name, username_key, legacy)
+                logger.info("Migrated legacy user to id=%s user_key=%s", user_id, short_key)
+            else:
+                # Create new user (remove this block if you want login-only)
+                user_id = str(uuid4())
+                self.store.apply({username_key: {
+                    "username_hashed": username_key,
+                    "password": password_hash,
+                    "id": user_id
+                }})
+                logger.info("Created new user id=%s user_key=%s", user_id, short_key)
 
         # Safety check: ensure user_id is set before proceeding
         if user_id is None:
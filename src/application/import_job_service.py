@@ -0,0 +1,118 @@
+# src/application/import_job_service.py
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import streamlit as st
+
+from src.application.ledger_service import LedgerService
+from src.core.instrumentation import timed
+from src.core.ingestion.parallel import expand_archives
+from src.domain.enums import ImportJobStatus
+from src.domain.models.MImportJob import ImportJob
+from src.domain.repositories.import_job_repository import ImportJobRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# One pool per server process, shared by every session
+IMPORT_WORKERS = int(os.environ.get("CFO_IMPORT_WORKERS", "2"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_recovered = False
+
+
+def _get_user_id() -> UUID:
+    return UUID(st.session_state["user"]["id"])
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import-job")
+        return _executor
+
+
+class ImportJobService:
+    """
+    Runs bank statement imports on a background worker pool.
+    The job row is the only shared state: the UI polls it, workers update it.
+    """
+
+    def __init__(self, repo: ImportJobRepository, ledger_service: LedgerService):
+        self.repo = repo
+        self.ledger_svc = ledger_service
+        self._recover_interrupted()
+
+    def _recover_interrupted(self):
+        # Any job still queued/running when this process first starts belonged to a
+        # previous process and will never finish.
+        global _recovered
+        with _executor_lock:
+            if _recovered:
+                return
+            _recovered = True
+        count = self.repo.fail_unfinished("Interrupted by application restart.")
+        if count:
+            logger.warning("Marked %d interrupted import job(s) as failed", count)
+
+    @timed()
+    def submit(self, files) -> ImportJob:
+        """
+        Queues uploaded files for import and returns immediately.
+        File bytes are read here, while the upload objects are still valid.
+        """
+        user_id = _get_user_id()
+        # Expand ZIPs now so files_total counts the statements actually parsed
+        payload: List[Tuple[str, bytes]] = expand_archives([(f.name, f.getvalue()) for f in files])
+
+        job = ImportJob(
+            owner=user_id,
+            batch_id=f"Import_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            file_names=[name for name, _ in payload],
+            files_total=len(payload),
+        )
+        self.repo.save(job)
+
+        _get_executor().submit(self._run, job, payload)
+        logger.info("Queued import job id=%s files=%d", job.id, job.files_total)
+        return job
+
+    def get_job(self, job_id: UUID) -> Optional[ImportJob]:
+        return self.repo.get(job_id, _get_user_id())
+
+    def get_recent_jobs(self, limit: int = 5) -> List[ImportJob]:
+        return self.repo.get_recent(_get_user_id(), limit)
+
+    def _run(self, job: ImportJob, payload: List[Tuple[str, bytes]]):
+        job.status = ImportJobStatus.RUNNING
+        self.repo.save(job)
+
+        def on_progress(files_done: int, duplicates: int, errors: List[str]):
+            job.files_done = files_done
+            job.duplicate_count = duplicates
+            job.errors = list(errors)
+            self.repo.save(job)
+
+        try:
+            count, errors, duplicates = self.ledger_svc.import_files(
+                job.owner, payload, batch_id=job.batch_id, on_progress=on_progress
+            )
+            job.imported_count = count
+            job.duplicate_count = duplicates
+            job.errors = errors
+            job.files_done = job.files_total
+            job.status = ImportJobStatus.COMPLETED
+        except Exception as e:
+            logger.exception("Import job id=%s failed: %s", job.id, e)
+            job.errors = list(job.errors or []) + [f"Import failed: {e}"]
+            job.status = ImportJobStatus.FAILED
+        finally:
+            job.finished_at = datetime.now()
+            self.repo.save(job)
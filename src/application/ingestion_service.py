@@ -1,54 +1,120 @@
 # src/application/ingestion_service.py
 from decimal import Decimal
-from typing import List, Tuple, Set
-from uuid import UUID
-from src.core.ingestion.csv_strategy import CsvBankStrategy
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+import numpy as np
+from src.core.accounts import canonical_accounts
+from src.core.instrumentation import timed, span
+from src.core.ingestion.base import IngestionStrategy, NormalizedTransaction
+from src.core.ingestion.registry import StrategyRegistry, default_registry
+from src.core.ingestion.parallel import expand_archives, should_parallelize, map_ordered
+from src.core.money import to_minor_array
+from src.core.transfers import pair_legs
 from src.domain.models.MTransaction import Transaction
-from src.domain.enums import TransactionType
+from src.domain.enums import TransactionType, TransferCategory
 from src.application.rule_service import RuleService
 from src.application.asset_service import AssetService
 
 
+def _parse_entry(handler: Optional[IngestionStrategy], filename: str, content: bytes) -> Tuple[
+        List[NormalizedTransaction], List[str]]:
+    """
+    Decode, parse and normalize one file. Module-level so it can run in a worker process.
+    """
+    if not handler:
+        return [], [f"No parser found for file: {filename}"]
+
+    normalized_txs, error_msg = handler.parse(filename, content)
+    if error_msg:
+        return [], [f"File {filename}: {error_msg}"]
+
+    if not normalized_txs:
+        return [], [f"File {filename}: Parsed 0 transactions."]
+
+    return normalized_txs, []
+
+
 class IngestionService:
-    def __init__(self, rule_service: RuleService, asset_service: AssetService):
-        self.strategies = [CsvBankStrategy()]
+    def __init__(self, rule_service: RuleService, asset_service: AssetService,
+                 registry: Optional[StrategyRegistry] = None):
+        self.registry = registry or default_registry()
         self.rule_svc = rule_service
         self.asset_svc = asset_service
 
+    def _find_handler(self, filename: str, content: bytes) -> Optional[IngestionStrategy]:
+        return self.registry.find(filename, content)
+
+    def _unrecognized(self, filename: str, content: bytes) -> List[str]:
+        # e.g. the header columns of a CSV no bank config matches
+        reason = self.registry.explain(filename, content)
+        return [f"File {filename}: {reason}"] if reason else [f"No parser found for file: {filename}"]
+
+    @timed()
     def process_file(self, filename: str, content: bytes, user_id: UUID, batch_id: str) -> Tuple[
         List[Transaction], List[str]]:
-        handler = next((s for s in self.strategies if s.can_handle(filename, content)), None)
-        if not handler:
-            return [], [f"No parser found for file: {filename}"]
+        handler = self._find_handler(filename, content)
+        if handler is None:
+            return [], self._unrecognized(filename, content)
+        normalized_txs, errors = _parse_entry(handler, filename, content)
+        if errors:
+            return [], errors
+        return self._to_domain(normalized_txs, user_id, batch_id), []
 
-        normalized_txs, error_msg = handler.parse(filename, content)
-        if error_msg:
-            return [], [f"File {filename}: {error_msg}"]
+    def process_files(self,
+                      files: List[Tuple[str, bytes]],
+                      user_id: UUID,
+                      batch_id: str,
+                      parallel: Optional[bool] = None) -> Iterator[Tuple[str, List[Transaction], List[str]]]:
+        """
+        Multi-file variant of process_file. ZIP uploads are expanded to their CSV members.
+        Parsing fans out to the process pool (see src/core/ingestion/parallel.py);
+        categorization stays here because the rule engine lives in this process.
+        Yields (filename, transactions, errors) per entry, in input order.
+        """
+        entries = expand_archives(files)
+        handlers = [self._find_handler(name, content) for name, content in entries]
+        names = [name for name, _ in entries]
 
-        if not normalized_txs:
-            return [], [f"File {filename}: Parsed 0 transactions."]
+        parsed = map_ordered(_parse_entry, handlers, names, [content for _, content in entries],
+                             parallel=should_parallelize(entries, parallel))
 
-        # Fetch User Accounts for "Internal Transfer" detection
-        user_assets = self.asset_svc.get_user_assets()
-        my_accounts: Set[str] = set()
-        for a in user_assets:
-            if a.account_number: my_accounts.add(a.account_number.replace(" ", ""))
-            if a.iban: my_accounts.add(a.iban.replace(" ", ""))
+        for (filename, content), handler, (normalized_txs, errors) in zip(entries, handlers, parsed):
+            if handler is None:
+                yield filename, [], self._unrecognized(filename, content)
+            elif errors:
+                yield filename, [], errors
+            else:
+                yield filename, self._to_domain(normalized_txs, user_id, batch_id), []
 
-        domain_txs = []
-        for n_tx in normalized_txs:
-            # Check for Internal Transfer
-            # If the target account is in my_accounts, it's a transfer!
-            target_clean = (n_tx.target_account or "").replace(" ", "")
-            is_internal = target_clean in my_accounts and target_clean != ""
+    def _to_domain(self, normalized_txs: List[NormalizedTransaction], user_id: UUID, batch_id: str) -> List[Transaction]:
+        # Internal Transfer: the counterparty is one of the user's own accounts.
+        # The account index is cached per user until their assets change.
+        own = self.asset_svc.get_account_index(user_id)
+        sources = canonical_accounts(n_tx.source_account for n_tx in normalized_txs)
+        targets = canonical_accounts(n_tx.target_account for n_tx in normalized_txs)
+        # Banks list the exported account itself as counterparty on fees and interest
+        internal = own.contains(targets) & (targets != sources)
+
+        # AI / Rule Lookup: one batched query for the whole file
+        with span("IngestionService.rule_lookup"):
+            lookups = iter(self.rule_svc.suggest_categories(
+                [n_tx.description for n_tx, is_internal in zip(normalized_txs, internal) if not is_internal],
+                user_id))
 
+        domain_txs = []
+        for n_tx, is_internal in zip(normalized_txs, internal):
+            suggested, suggested_type, confidence = None, None, None
             if is_internal:
-                cat = "Internal Transfer"
+                cat = TransferCategory.INTERNAL.value
                 t_type = TransactionType.TRANSFER
             else:
-                # AI / Rule Lookup
-                cat, t_type = self.rule_svc.find_category(n_tx.description, user_id)
-
+                lookup = next(lookups)
+                cat, t_type = lookup.category, lookup.transaction_type
+                suggested, suggested_type = lookup.suggested_category, lookup.suggested_type
+                confidence = lookup.confidence
+                if t_type is None:
+                    # No rule matched: the sign is the best guess (type is NOT NULL in the DB)
+                    t_type = TransactionType.EXPENSE if n_tx.amount < 0 else TransactionType.INCOME
 
             tx = Transaction(
                 date=n_tx.date,
@@ -57,6 +123,9 @@ class IngestionService:
                 currency=n_tx.currency,
                 category=cat,
                 transaction_type=t_type,
+                suggested_category=suggested,
+                suggested_type=suggested_type,
+                confidence=confidence,
                 source_account=n_tx.source_account,
                 target_account=n_tx.target_account,
                 batch_id=batch_id,
@@ -64,4 +133,30 @@ class IngestionService:
             )
             domain_txs.append(tx)
 
-        return domain_txs, []
\ No newline at end of file
+        return domain_txs
+
+    @timed()
+    def link_transfers(self, transactions: List[Transaction]) -> int:
+        """
+        Gives both legs of each internal transfer in `transactions` (the -X in one
+        account's export and the +X in the other's) a shared transfer_id. Legs pair
+        when they move the same amount between the same two accounts within
+        TRANSFER_WINDOW_DAYS. Returns the number of pairs linked.
+        """
+        legs = [t for t in transactions if t.category == TransferCategory.INTERNAL.value and t.transfer_id is None]
+        if len(legs) < 2:
+            return 0
+
+        sources = canonical_accounts(t.source_account for t in legs)
+        targets = canonical_accounts(t.target_account for t in legs)
+        minor = to_minor_array(t.amount for t in legs)
+        # Direction of the money, the same on both legs: paying account > receiving account
+        keys = np.where(minor < 0, sources + ">" + targets, targets + ">" + sources)
+        partner = pair_legs(keys, minor, [t.date for t in legs])
+
+        pairs = 0
+        for i, j in enumerate(partner):
+            if i < j:
+                legs[i].transfer_id = legs[j].transfer_id = uuid4()
+                pairs += 1
+        return pairs
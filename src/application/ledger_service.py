@@ -1,28 +1,82 @@
+import os
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 import pandas as pd
 import streamlit as st
-from typing import List, Tuple
+from typing import Dict, List, Tuple, Optional, Callable
 from uuid import UUID
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+from src.core import data_version
+from src.core.money import from_minor, minor_to_float
+from src.core.instrumentation import timed, span
+from src.core.transfers import TRANSFER_WINDOW_DAYS, pair_account_legs
 from src.application.ingestion_service import IngestionService
-from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.repositories.transaction_repository import TransactionRepository, CategoryChange, TransferLink
 from src.domain.models.MTransaction import Transaction
+from src.domain.enums import TransactionType
 from src.views.models.transaction_view_model import TransactionViewModel
 
 
+# Rows per keyset page in recategorize(); bounds memory regardless of ledger size
+RECATEGORIZE_PAGE = int(os.environ.get("CFO_RECATEGORIZE_PAGE", "5000"))
+# Never re-derived from rules: entered by hand / detected from own accounts
+MANUAL_BATCH = "Manual"
+INTERNAL_CATEGORY = "Internal Transfer"
+UNCATEGORIZED = "Uncategorized"
+# Legs pair_transfers may claim: a rule-categorized row is a real payment, not a transfer leg
+TRANSFER_CANDIDATE_CATEGORIES = (UNCATEGORIZED, INTERNAL_CATEGORY)
+
+# One import at a time per owner: deduplication reads the stored ledger before saving,
+# so two overlapping imports of the same statement would both insert it
+_import_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_import_locks_guard = threading.Lock()
+
+
+def _import_lock(user_id: UUID) -> threading.Lock:
+    with _import_locks_guard:
+        return _import_locks[str(user_id)]
+
+
 def _get_user_id() -> UUID:
     return UUID(st.session_state["user"]["id"])
 
 
+@dataclass
+class RecategorizeSummary:
+    scanned: int = 0
+    changed: int = 0  # category or type changed
+    suggested: int = 0  # pending suggestion added, changed or cleared
+    # (old category, new category) -> number of transactions moved
+    transitions: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
 class LedgerService:
     def __init__(self, repo: TransactionRepository, ingestion_service: IngestionService):
         self.repo = repo
         self.ingestion_svc = ingestion_service
 
+    @timed()
     def get_recent_transactions(self) -> pd.DataFrame:
         transactions = self.repo.get_all(_get_user_id())
-        view_models = [self._create_view_model(tx) for tx in transactions]
-        return pd.DataFrame([vm.__dict__ for vm in view_models])
+        with span("LedgerService.build_dataframe"):
+            view_models = [self._create_view_model(tx) for tx in transactions]
+            return pd.DataFrame([vm.__dict__ for vm in view_models])
+
+    @timed()
+    def get_ledger_frame(self) -> pd.DataFrame:
+        """Columnar ledger read for view models; no per-row ORM or view-model objects."""
+        return self.repo.get_ledger_frame(_get_user_id())
 
+    @timed()
+    def get_cashflow_totals(self) -> Tuple[Decimal, Decimal, Decimal]:
+        """(balance, income, spend) over the whole ledger; spend is negative."""
+        balance, income, spend = self.repo.get_cashflow_totals(_get_user_id())
+        return from_minor(balance), from_minor(income), from_minor(spend)
+
+    @timed()
     def get_batch_history(self) -> pd.DataFrame:
         df = self.get_recent_transactions()
         if df.empty or 'batch_id' not in df.columns:
@@ -38,9 +92,30 @@ class LedgerService:
         stats.rename(columns={'batch_id': 'Batch_ID'}, inplace=True)
         return stats.sort_values('Upload_Date', ascending=False)
 
+    @timed()
     def process_uploads(self, files) -> Tuple[int, List[str], int]:
         user_id = _get_user_id()
-        batch_id = f"Import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return self.import_files(user_id, [(file.name, file.getvalue()) for file in files])
+
+    @timed()
+    def import_files(self,
+                     user_id: UUID,
+                     files: List[Tuple[str, bytes]],
+                     batch_id: Optional[str] = None,
+                     on_progress: Optional[Callable[[int, int, List[str]], None]] = None,
+                     parallel: Optional[bool] = None) -> Tuple[int, List[str], int]:
+        """
+        Session-independent import used by both the synchronous upload and background jobs.
+        :param files: (filename, raw bytes) pairs; ZIP archives are expanded
+        :param on_progress: called after each parsed file with (files_done, duplicates_so_far, errors_so_far)
+        :param parallel: force the process pool on/off (None = decide from the workload)
+        Imports for the same owner run one at a time (other owners' run concurrently).
+        """
+        with _import_lock(user_id):
+            return self._import_files(user_id, files, batch_id, on_progress, parallel)
+
+    def _import_files(self, user_id, files, batch_id, on_progress, parallel) -> Tuple[int, List[str], int]:
+        batch_id = batch_id or f"Import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
         # Fetch Existing Transactions for Deduplication
         existing_txs = self.repo.get_all(user_id)
@@ -52,13 +127,8 @@ class LedgerService:
         all_errors = []
         duplicates_count = 0
 
-        for file in files:
-            newly_parsed_txs, errors = self.ingestion_svc.process_file(
-                filename=file.name,
-                content=file.getvalue(),
-                user_id=user_id,
-                batch_id=batch_id
-            )
+        results = self.ingestion_svc.process_files(files, user_id=user_id, batch_id=batch_id, parallel=parallel)
+        for files_done, (filename, newly_parsed_txs, errors) in enumerate(results, start=1):
             all_errors.extend(errors)
 
             for tx in newly_parsed_txs:
@@ -71,11 +141,124 @@ class LedgerService:
                 transactions_to_save.append(tx)
                 existing_signatures.add(signature)
 
+            if on_progress:
+                on_progress(files_done, duplicates_count, all_errors)
+
         if transactions_to_save:
+            with span("LedgerService.link_transfers"):
+                self.ingestion_svc.link_transfers(transactions_to_save)
+            # Read before saving: committed ORM objects are expired
+            earliest = min(tx.date for tx in transactions_to_save)
             self.repo.save_bulk(transactions_to_save)
+            # Legs in other banks' exports may have been imported in earlier batches
+            self.pair_transfers(user_id, since=earliest - timedelta(days=TRANSFER_WINDOW_DAYS))
+            data_version.bump(user_id, data_version.LEDGER)
 
         return len(transactions_to_save), all_errors, duplicates_count
 
+    @timed()
+    def recategorize(self, owner: Optional[UUID] = None, since: Optional[date] = None,
+                     page_size: int = RECATEGORIZE_PAGE,
+                     on_progress: Optional[Callable[[int, int], None]] = None) -> RecategorizeSummary:
+        """
+        Re-applies the current rules to stored transactions (optionally only
+        those dated on/after `since`). Streams the ledger in keyset pages, looks
+        each page up in one batch, and bulk-updates only rows whose category or
+        type (or pending suggestion) changed. Manual entries and internal
+        transfers are skipped; rows no rule is close enough to keep their
+        category but get a refreshed suggestion.
+        :param on_progress: called after each page with (rows_scanned, rows_changed)
+        """
+        owner = owner or _get_user_id()
+        rule_svc = self.ingestion_svc.rule_svc
+        summary = RecategorizeSummary()
+        transitions = Counter()
+        after_id = None
+
+        while True:
+            page = self.repo.get_categorization_page(owner, after_id, page_size, since=since)
+            if not page:
+                break
+            after_id = page[-1].id
+            summary.scanned += len(page)
+
+            candidates = [row for row in page
+                          if row.batch_id != MANUAL_BATCH and row.category != INTERNAL_CATEGORY]
+            lookups = rule_svc.suggest_categories([row.description for row in candidates], owner)
+
+            changes = []
+            for row, lookup in zip(candidates, lookups):
+                current = (row.category, TransactionType(row.transaction_type))
+                # No rule close enough: keep the category, refresh only the suggestion
+                applied = (lookup.category, lookup.transaction_type) if lookup.transaction_type else current
+                # Nothing to review when the row already has the suggested category
+                # or the user dismissed that suggestion before
+                suggested = (lookup.suggested_category
+                             if lookup.suggested_category not in (applied[0], row.dismissed_category) else None)
+                suggested_type = lookup.suggested_type if suggested else None
+                if ((*applied, suggested, suggested_type, lookup.confidence)
+                        == (*current, row.suggested_category, row.suggested_type, row.confidence)):
+                    continue
+                changes.append(CategoryChange(row.id, *applied, suggested, suggested_type, lookup.confidence))
+                if applied != current:
+                    summary.changed += 1
+                    transitions[(row.category, applied[0])] += 1
+                if suggested != row.suggested_category:
+                    summary.suggested += 1
+
+            self.repo.update_categories(owner, changes)
+            if on_progress:
+                on_progress(summary.scanned, summary.changed)
+
+        summary.transitions = dict(transitions)
+        if summary.changed or summary.suggested:
+            data_version.bump(owner, data_version.LEDGER)
+        return summary
+
+    @timed()
+    def pair_transfers(self, owner: Optional[UUID] = None, since: Optional[date] = None) -> int:
+        """
+        Finds transfers between the owner's own accounts at different banks across
+        all imported batches: -X in one export and +X in another, booked within
+        TRANSFER_WINDOW_DAYS (see pair_account_legs for the guards). Both legs
+        become Internal Transfers sharing a transfer_id, so income and spend
+        totals leave them out. Returns the number of pairs linked.
+        """
+        owner = owner or _get_user_id()
+        legs = self.repo.get_transfer_candidates(owner, TRANSFER_CANDIDATE_CATEGORIES, since)
+        if len(legs) < 2:
+            return 0
+
+        partner = pair_account_legs([leg.source_account for leg in legs], [leg.target_account for leg in legs],
+                                    [leg.amount_minor for leg in legs], [leg.date for leg in legs])
+        links = []
+        for i, j in enumerate(partner):
+            if i < j:
+                transfer_id = uuid4()
+                links += [TransferLink(legs[i].id, transfer_id), TransferLink(legs[j].id, transfer_id)]
+        self.repo.link_transfers(owner, links)
+        if links:
+            data_version.bump(owner, data_version.LEDGER)
+        return len(links) // 2
+
+    @timed()
+    def get_review_queue(self, max_confidence: float = 1.0, limit: int = 500) -> pd.DataFrame:
+        """Pending suggestions below max_confidence, least confident first."""
+        df = self.repo.get_review_queue(_get_user_id(), max_confidence, limit)
+        if not df.empty:
+            df['id'] = df['id'].astype(str)
+            df['amount'] = minor_to_float(df.pop('amount_minor').to_numpy())
+        return df
+
+    @timed()
+    def resolve_suggestions(self, ids: List[str], accept: bool) -> int:
+        """Applies (accept=True) or dismisses the suggested categories of the given transactions."""
+        user_id = _get_user_id()
+        changed = self.repo.resolve_suggestions(user_id, [UUID(i) for i in ids], accept)
+        if changed:
+            data_version.bump(user_id, data_version.LEDGER)
+        return changed
+
     def _create_view_model(self, tx: Transaction) -> TransactionViewModel:
         """
         Creates a view model from a transaction.
@@ -93,17 +276,23 @@ class LedgerService:
             is_duplicate=False,
             owner=None,
             raw_description=tx.description,
-            suggested_category=None,
-            confidence=None,
+            suggested_category=tx.suggested_category,
+            confidence=tx.confidence,
             notes=tx.notes,
             tags=tx.tags or []
         )
 
+    @timed()
     def delete_batch(self, batch_id: str):
-        self.repo.delete_batch(batch_id, _get_user_id())
+        user_id = _get_user_id()
+        self.repo.delete_batch(batch_id, user_id)
+        data_version.bump(user_id, data_version.LEDGER)
 
+    @timed()
     def add_manual_transaction(self, data: dict):
         # Keep existing manual entry logic
         if 'type' in data: data['transaction_type'] = data.pop('type')
-        tx = Transaction(**data, owner=_get_user_id())
-        self.repo.save_bulk([tx])
\ No newline at end of file
+        user_id = _get_user_id()
+        tx = Transaction(**data, owner=user_id)
+        self.repo.save_bulk([tx])
+        data_version.bump(user_id, data_version.LEDGER)
\ No newline at end of file
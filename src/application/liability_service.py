@@ -4,6 +4,9 @@ from uuid import UUID
 from decimal import Decimal
 import streamlit as st
 
+from src.core import data_version
+from src.core.money import from_minor
+from src.core.instrumentation import timed
 from src.domain.models.MLiability import Liability
 from src.domain.enums import LiabilityCategory
 from src.domain.repositories.liability_repository import LiabilityRepository
@@ -20,10 +23,12 @@ class LiabilityService:
     def __init__(self, repo: LiabilityRepository):
         self.repo = repo
 
+    @timed()
     def get_user_liabilities(self) -> List[Liability]:
         uid = _get_current_user_id()
         return self.repo.get_all(uid)
 
+    @timed()
     def create_liability(self,
                          amount: Decimal,
                          liability_type: LiabilityCategory,
@@ -37,8 +42,10 @@ class LiabilityService:
             **kwargs
         )
         self.repo.save(new_liab)
+        data_version.bump(uid, data_version.LIABILITIES)
         return new_liab
 
+    @timed()
     def update_liability_details(self, liability: Liability, **kwargs) -> None:
         """
         Updates any field passed in kwargs (name, amount, interest_rate, etc.)
@@ -51,10 +58,14 @@ class LiabilityService:
                     setattr(liability, key, value)
 
         self.repo.save(liability)
+        data_version.bump(liability.owner, data_version.LIABILITIES)
 
+    @timed()
     def delete_liability(self, liability_id: UUID):
-        self.repo.delete(liability_id)
+        uid = _get_current_user_id()
+        self.repo.delete(uid, liability_id)
+        data_version.bump(uid, data_version.LIABILITIES)
 
+    @timed()
     def get_total_liabilities(self) -> Decimal:
-        liabs = self.get_user_liabilities()
-        return sum((l.amount for l in liabs), Decimal(0))
\ No newline at end of file
+        return from_minor(self.repo.get_total_amount(_get_current_user_id()))
\ No newline at end of file
@@ -2,21 +2,35 @@
 from typing import List, Tuple
 from uuid import UUID
 from decimal import Decimal
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 # Updated Import: Added parse_portfolio_history
 from src.core.parsers import parse_portfolio_snapshot, parse_portfolio_history
+from src.core import data_version
+from src.core.money import from_minor, minor_to_float
+from src.core.instrumentation import timed
 from src.domain.models.MPortfolio import InvestmentPosition, PortfolioMetrics
 from src.domain.repositories.portfolio_repository import PortfolioRepository
 
 def _get_user_id() -> UUID:
     return UUID(st.session_state["user"]["id"])
 
+
+def _flow_masks(event_types: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(dividend, inflow, outflow) masks over event types, matched case-insensitively."""
+    et = event_types.str.upper()
+    is_div = et.str.contains('DIV', regex=False).to_numpy()
+    is_in = (et.str.contains('BUY', regex=False) | et.str.contains('DEPOSIT', regex=False)).to_numpy()
+    is_out = (et.str.contains('SELL', regex=False) | et.str.contains('WITHDRAW', regex=False)).to_numpy()
+    return is_div, is_in, is_out
+
 class PortfolioService:
     def __init__(self, repo: PortfolioRepository):
         self.repo = repo
 
+    @timed()
     def process_files(self, snap_file=None, hist_file=None):
         uid = _get_user_id()
 
@@ -32,30 +46,28 @@ class PortfolioService:
             if events:
                 self.repo.save_events(events)
 
+        data_version.bump(uid, data_version.PORTFOLIO)
+
+    @timed()
     def get_portfolio_overview(self) -> Tuple[List[InvestmentPosition], PortfolioMetrics]:
         uid = _get_user_id()
         positions = self.repo.get_snapshot(uid)
-        history = self.repo.get_history(uid)
-
-        # 1. Aggregates from Snapshot
-        total_val = sum((p.market_value for p in positions), Decimal(0))
-        total_cost_snap = sum((p.cost_basis for p in positions), Decimal(0))
-        proj_divs = sum((p.projected_annual_income for p in positions), Decimal(0))
-
-        # 2. Aggregates from History
-        realized_divs = Decimal(0)
-        invested_cap_hist = Decimal(0)
-
-        # Simple History Sums
-        for evt in history:
-            et = evt.event_type.upper()
-            amt = abs(evt.total_amount)
-            if 'DIV' in et:
-                realized_divs += amt
-            elif 'BUY' in et or 'DEPOSIT' in et:
-                invested_cap_hist += amt
-            elif 'SELL' in et or 'WITHDRAW' in et:
-                invested_cap_hist -= amt
+
+        # 1. Aggregates from Snapshot (summed in SQL, in minor units)
+        value_m, cost_m, proj_divs_m = self.repo.get_snapshot_totals(uid)
+        total_val = from_minor(value_m)
+        total_cost_snap = from_minor(cost_m)
+        proj_divs = from_minor(proj_divs_m)
+
+        # 2. Aggregates from History: exact int64 reductions
+        history = self.repo.get_history_frame(uid)
+        amt = np.abs(history['amount_minor'].to_numpy())
+        is_div, is_in, is_out = _flow_masks(history['event_type'])
+        # Classification precedence: dividend, then inflow, then outflow
+        is_in = is_in & ~is_div
+        is_out = is_out & ~is_div & ~is_in
+        realized_divs = from_minor(amt[is_div].sum())
+        invested_cap_hist = from_minor(amt[is_in].sum() - amt[is_out].sum())
 
         # 3. Strategy: Prefer Snapshot Cost, Fallback to History Flow
         final_cost = total_cost_snap if total_cost_snap > 0 else invested_cap_hist
@@ -73,38 +85,28 @@ class PortfolioService:
 
         return positions, metrics
 
+    @timed()
     def get_invested_capital_curve(self) -> pd.DataFrame:
         """Recreates the 'Invested Capital' area chart logic."""
-        history = self.repo.get_history(_get_user_id())
-        if not history: return pd.DataFrame()
+        history = self.repo.get_history_frame(_get_user_id())
+        if history.empty: return pd.DataFrame()
 
-        data = []
-        cumulative = Decimal(0)
-        sorted_hist = sorted(history, key=lambda x: x.date)
+        _, is_in, is_out = _flow_masks(history['event_type'])
+        sign = np.where(is_in, 1, np.where(is_out, -1, 0))
+        cumulative = np.cumsum(sign * np.abs(history['amount_minor'].to_numpy()))
 
-        for evt in sorted_hist:
-            et = evt.event_type.upper()
-            amt = abs(evt.total_amount)
-            if 'BUY' in et or 'DEPOSIT' in et:
-                cumulative += amt
-            elif 'SELL' in et or 'WITHDRAW' in et:
-                cumulative -= amt
+        curve = pd.DataFrame({"Date": history['date'], "Invested Capital": minor_to_float(cumulative)})
+        return curve.drop_duplicates('Date', keep='last')
 
-            data.append({"Date": evt.date, "Invested Capital": float(cumulative)})
+    @timed()
+    def get_dividend_history(self) -> pd.DataFrame:
+        history = self.repo.get_history_frame(_get_user_id())
+        if history.empty: return pd.DataFrame()
 
-        if not data: return pd.DataFrame()
-        return pd.DataFrame(data).drop_duplicates('Date', keep='last')
+        is_div, _, _ = _flow_masks(history['event_type'])
+        divs = history[is_div]
+        if divs.empty: return pd.DataFrame()
 
-    def get_dividend_history(self) -> pd.DataFrame:
-        history = self.repo.get_history(_get_user_id())
-        data = []
-        for evt in history:
-            if 'DIV' in evt.event_type.upper():
-                data.append({
-                    "Year": evt.date.year,
-                    "Amount": float(evt.total_amount)
-                })
-
-        if not data: return pd.DataFrame()
-        df = pd.DataFrame(data)
-        return df.groupby('Year')['Amount'].sum().reset_index()
\ No newline at end of file
+        years = pd.to_datetime(divs['date']).dt.year.rename('Year')
+        per_year = divs['amount_minor'].groupby(years).sum()
+        return pd.DataFrame({"Year": per_year.index, "Amount": minor_to_float(per_year.to_numpy())})
\ No newline at end of file
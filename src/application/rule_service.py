@@ -1,17 +1,73 @@
 # src/application/rule_service.py
 
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
 from uuid import UUID
-from sqlmodel import Session
-from src.core.database import engine
+from sqlmodel import Session, select
+from src.core import data_version
+from src.core.database import get_engine
+from src.core.instrumentation import timed
+from src.core.rule_engine import RuleEngine, RuleIndexRow, build_rule_engine
 from src.domain.models.MRule import CategoryRule
-from src.core.vector_store import VectorRuleEngine
 from src.domain.enums import TransactionType
 
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# Maximum cosine distance for a rule to categorize a transaction automatically
+MATCH_THRESHOLD = float(os.environ.get("CFO_RULE_ACCEPT_DISTANCE", "0.4"))
+# Up to this distance the best rule is kept as a suggestion for review
+SUGGEST_THRESHOLD = float(os.environ.get("CFO_RULE_SUGGEST_DISTANCE", "0.7"))
+# Candidates returned per description by suggest_categories
+SUGGESTION_K = 3
+# Descriptions per batched rule-engine query
+LOOKUP_CHUNK = int(os.environ.get("CFO_RULE_LOOKUP_CHUNK", "512"))
+# Rules per rule-engine upsert (and per embedding batch)
+INDEX_CHUNK = int(os.environ.get("CFO_RULE_INDEX_CHUNK", "1000"))
+# Per-owner progress of an unfinished bulk index, so it can resume after a crash
+CHECKPOINT_DIR = Path(os.environ.get("CFO_RULE_INDEX_CHECKPOINTS", "data/rule_index"))
+
+ProgressCallback = Callable[[int, int], None]  # (rules_indexed, rules_total)
+
+
+@dataclass
+class CategorySuggestion:
+    category: str  # applied category, "Uncategorized" unless a rule was close enough
+    transaction_type: Optional[TransactionType]  # None unless a rule was applied
+    suggested_category: Optional[str] = None  # best rule between the accept and suggest thresholds
+    suggested_type: Optional[TransactionType] = None  # that rule's type
+    confidence: Optional[float] = None  # 1 - cosine distance of the best rule
+    candidates: List[Tuple[str, float]] = field(default_factory=list)  # (category, confidence), best first
+
+
+def _confidence(distance: float) -> float:
+    return round(min(1.0, max(0.0, 1.0 - distance)), 4)
+
+
+def _rule_metadata(category: str, t_type: TransactionType, owner: UUID) -> dict:
+    return {
+        "category": category,
+        "type": t_type.value,
+        "owner_id": str(owner)
+    }
+
 
 class RuleService:
-    def __init__(self):
-        self.vector_engine = VectorRuleEngine()
+    def __init__(self, rule_engine: Optional[RuleEngine] = None):
+        self._rule_engine: Optional[RuleEngine] = rule_engine
 
+    @property
+    def rule_engine(self) -> RuleEngine:
+        # Built on first rule lookup, not when the container is assembled (CFO_RULE_ENGINE picks which)
+        if self._rule_engine is None:
+            self._rule_engine = build_rule_engine(rule_loader=self._owner_rule_rows)
+        return self._rule_engine
+
+    @timed()
     def add_rule(self, pattern: str, category: str, t_type: TransactionType, owner: UUID):
         # 1. Save to SQL (Source of Truth for User Editing)
         rule = CategoryRule(
@@ -21,38 +77,209 @@ class RuleService:
             owner=owner
         )
 
-        with Session(engine) as session:
+        with Session(get_engine(owner)) as session:
             session.add(rule)
             session.commit()
             session.refresh(rule)
+        # Other sessions' and processes' TF-IDF engines reload the owner's rules
+        data_version.bump(owner, data_version.RULES)
 
-        # 2. Save to Vector Store (Source of Truth for Searching)
-        self.vector_engine.add_rule(
+        # 2. Save to the rule engine (Source of Truth for Searching)
+        self.rule_engine.add_rule(
             rule_id=str(rule.id),
             description=pattern,
-            metadata={
-                "category": category,
-                "type": t_type.value,
-                "owner_id": str(owner)
-            }
+            metadata=_rule_metadata(category, t_type, owner)
         )
         return rule
 
+    @timed()
+    def add_rules_bulk(self, rules: Iterable[Tuple[str, str, TransactionType]], owner: UUID,
+                       on_progress: Optional[ProgressCallback] = None) -> int:
+        """
+        Learns many (pattern, category, type) rules at once: one SQL transaction,
+        then chunked batch upserts into the rule engine. If indexing is
+        interrupted, rebuild_vector_index(owner) picks up where it stopped.
+        Upserts on (owner, pattern): a pattern the owner already has is updated
+        in place, so re-running a bootstrap adds nothing. A pattern repeated in
+        the input keeps its last category.
+        Returns the number of rules added or changed.
+        """
+        latest = {}
+        for pattern, category, t_type in rules:
+            if pattern.strip():
+                latest[pattern.strip()] = (category, TransactionType(t_type))
+        if not latest:
+            return 0
+
+        with Session(get_engine(owner)) as session:
+            existing = {r.pattern: r for r in session.exec(
+                select(CategoryRule).where(CategoryRule.owner == owner)).all()}
+            changed = []
+            for pattern, (category, t_type) in latest.items():
+                rule = existing.get(pattern)
+                if rule is None:
+                    rule = CategoryRule(pattern=pattern, category=category, transaction_type=t_type, owner=owner)
+                elif (rule.category, rule.transaction_type) == (category, t_type):
+                    continue
+                else:
+                    rule.category, rule.transaction_type = category, t_type
+                changed.append(rule)
+            if not changed:
+                return 0
+            # Ids are generated client-side, so the index payload is known before commit
+            payload = [(str(r.id), r.pattern, _rule_metadata(r.category, r.transaction_type, owner))
+                       for r in changed]
+            session.add_all(changed)
+            session.commit()
+        data_version.bump(owner, data_version.RULES)
+
+        # Same ids as before for updated patterns, so their index entries are replaced
+        self._index_rules(owner, payload, on_progress)
+        return len(payload)
+
+    @timed()
+    def rebuild_vector_index(self, owner: UUID, on_progress: Optional[ProgressCallback] = None,
+                             resume: bool = True) -> int:
+        """
+        Re-indexes all of the owner's rules from SQL (e.g. after an embedding
+        model change). Resumes an interrupted run from its checkpoint unless
+        resume=False. Returns the number of rules indexed by this call.
+        """
+        checkpoint = self._load_checkpoint(owner) if resume else None
+        payload = self._owner_rule_rows(owner)
+
+        if checkpoint is None:
+            # From scratch: also drops vectors of rules deleted in SQL
+            self.rule_engine.delete_owner_rules(owner)
+        else:
+            # Indexed: the interrupted run's rules up to its last finished chunk. Rules it
+            # did not plan (created since, with any id) are indexed now as well.
+            after = checkpoint.get("after") or ""
+            planned = self._load_plan(owner)
+            payload = [row for row in payload if row[0] > after or row[0] not in planned]
+            logger.info("Resuming rule index for %s: %d rule(s) left", owner, len(payload))
+
+        return self._index_rules(owner, payload, on_progress)
+
+    def _index_rules(self, owner: UUID, payload: List[RuleIndexRow],
+                     on_progress: Optional[ProgressCallback]) -> int:
+        # Id order makes "the planned rules after the last finished chunk" a valid resume point
+        payload = sorted(payload, key=lambda row: row[0])
+        total = len(payload)
+        self._save_plan(owner, [row[0] for row in payload])
+        self._save_checkpoint(owner, None)
+        for start in range(0, total, INDEX_CHUNK):
+            ids, patterns, metadatas = zip(*payload[start:start + INDEX_CHUNK])
+            self.rule_engine.add_rules(list(ids), list(patterns), list(metadatas))
+            self._save_checkpoint(owner, ids[-1])
+            if on_progress:
+                on_progress(min(start + INDEX_CHUNK, total), total)
+        self._checkpoint_path(owner).unlink(missing_ok=True)
+        self._plan_path(owner).unlink(missing_ok=True)
+        logger.info("Indexed %d rule(s) for %s", total, owner)
+        return total
+
+    @staticmethod
+    def _owner_rule_rows(owner: UUID) -> List[RuleIndexRow]:
+        with Session(get_engine(owner)) as session:
+            rules = session.exec(select(CategoryRule).where(CategoryRule.owner == owner)).all()
+            return [(str(r.id), r.pattern, _rule_metadata(r.category, r.transaction_type, owner)) for r in rules]
+
+    @staticmethod
+    def _checkpoint_path(owner: UUID) -> Path:
+        return CHECKPOINT_DIR / f"{owner}.json"
+
+    @staticmethod
+    def _plan_path(owner: UUID) -> Path:
+        return CHECKPOINT_DIR / f"{owner}.ids"
+
+    def _load_plan(self, owner: UUID) -> set:
+        """Ids the interrupted run set out to index (empty if unknown: everything is redone)."""
+        try:
+            return set(self._plan_path(owner).read_text().split())
+        except FileNotFoundError:
+            return set()
+
+    def _save_plan(self, owner: UUID, ids: List[str]):
+        # Written once per run; the per-chunk checkpoint stays small
+        path = self._plan_path(owner)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".ids.tmp")
+        tmp.write_text("\n".join(ids))
+        os.replace(tmp, path)
+
+    def _load_checkpoint(self, owner: UUID) -> Optional[dict]:
+        try:
+            return json.loads(self._checkpoint_path(owner).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _save_checkpoint(self, owner: UUID, after: Optional[str]):
+        path = self._checkpoint_path(owner)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"owner": str(owner), "after": after}))
+        os.replace(tmp, path)
+
+    @timed()
     def find_category(self, description: str, user_id: UUID):
-        # 1. Query Vector Store
-        match = self.vector_engine.find_match(description, threshold=0.4)
+        # 1. Query the rule engine
+        match = self.rule_engine.find_match(description, threshold=MATCH_THRESHOLD, owner=user_id)
 
         if match:
-            # Optional: Verify owner match if needed, though local DB is usually single-tenant enough for MVP
             return match['category'], TransactionType(match['type'])
 
         return "Uncategorized", None
 
+    @timed()
+    def find_categories(self, descriptions: List[str], user_id: UUID) -> List[Tuple[str, Optional[TransactionType]]]:
+        """Batched find_category, in input order."""
+        return [(s.category, s.transaction_type) for s in self.suggest_categories(descriptions, user_id, k=1)]
+
+    @timed()
+    def suggest_categories(self, descriptions: List[str], user_id: UUID,
+                           k: int = SUGGESTION_K) -> List[CategorySuggestion]:
+        """
+        Top-k rule candidates with confidence for each description. Each distinct
+        description is looked up once, in chunked rule-engine queries.
+        Results are in input order.
+        """
+        unique = list(dict.fromkeys(descriptions))
+        resolved = {}
+        for start in range(0, len(unique), LOOKUP_CHUNK):
+            chunk = unique[start:start + LOOKUP_CHUNK]
+            candidates = self.rule_engine.find_candidates(chunk, k=k, owner=user_id)
+            for description, hits in zip(chunk, candidates):
+                resolved[description] = self._to_suggestion(hits)
+        return [resolved[d] for d in descriptions]
+
+    @staticmethod
+    def _to_suggestion(hits: List[Tuple[dict, float]]) -> CategorySuggestion:
+        if not hits:
+            return CategorySuggestion("Uncategorized", None)
+
+        best_rule, best_distance = hits[0]
+        per_category = {}
+        for rule, distance in hits:
+            # Hits are closest first, so the first rule seen decides a category's confidence
+            per_category.setdefault(rule['category'], _confidence(distance))
+
+        suggestion = CategorySuggestion("Uncategorized", None, confidence=_confidence(best_distance),
+                                        candidates=list(per_category.items()))
+        if best_distance < MATCH_THRESHOLD:
+            suggestion.category = best_rule['category']
+            suggestion.transaction_type = TransactionType(best_rule['type'])
+        elif best_distance < SUGGEST_THRESHOLD:
+            suggestion.suggested_category = best_rule['category']
+            suggestion.suggested_type = TransactionType(best_rule['type'])
+        return suggestion
+
+    @timed()
     def get_user_rules(self, user_id: UUID) -> list[dict]:
         """
         Retrieves all categorization rules for a specific user.
         """
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             rules = session.query(CategoryRule).filter(CategoryRule.owner == user_id).all()
             return [{"pattern": r.pattern, "category": r.category} for r in rules]
 
@@ -1,6 +1,7 @@
 # src/application/summary_service.py
 from decimal import Decimal
 from dataclasses import dataclass
+from src.core.instrumentation import timed
 from src.application.asset_service import AssetService
 from src.application.ledger_service import LedgerService
 from src.application.portfolio_service import PortfolioService
@@ -30,10 +31,10 @@ class SummaryService:
         self.port_svc = portfolio_service
         self.liab_svc = liability_service
 
+    @timed()
     def get_executive_summary(self) -> ExecutiveSummary:
         # 1. Assets
-        assets = self.asset_svc.get_user_assets()
-        hard_assets_val = sum((a.value for a in assets), Decimal(0))
+        hard_assets_val = self.asset_svc.get_total_value()
 
         # 2. Liabilities
         liabilities_val = self.liab_svc.get_total_liabilities()
@@ -42,20 +43,8 @@ class SummaryService:
         _, port_metrics = self.port_svc.get_portfolio_overview()
 
         # 4. Ledger
-        ledger_df = self.ledger_svc.get_recent_transactions()
-
-        # Normalize column names to lowercase to handle inconsistencies
-        if not ledger_df.empty:
-            ledger_df.columns = [col.lower() for col in ledger_df.columns]
-
-        if not ledger_df.empty and 'amount' in ledger_df.columns:
-            ledger_balance = Decimal(ledger_df['amount'].sum())
-            monthly_income = ledger_df[ledger_df['amount'] > 0]['amount'].sum()
-            monthly_spend = ledger_df[ledger_df['amount'] < 0]['amount'].sum()
-        else:
-            ledger_balance = Decimal(0)
-            monthly_income = Decimal(0)
-            monthly_spend = Decimal(0)
+        # Aggregated in the database in integer minor units; exact and no row transfer
+        ledger_balance, monthly_income, monthly_spend = self.ledger_svc.get_cashflow_totals()
 
         # 5. Aggregation
         total_assets = hard_assets_val + ledger_balance + port_metrics.total_value
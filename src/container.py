@@ -8,7 +8,8 @@ from src.domain.repositories.sql_repository import (
     SqlTransactionRepository,
     SqlPortfolioRepository,
     SqlLiabilityRepository,
-    SqlTaxLotRepository
+    SqlTaxLotRepository,
+    SqlImportJobRepository
 )
 
 # Services
@@ -20,9 +21,11 @@ from src.application.auth_service import AuthService
 from src.application.liability_service import LiabilityService
 from src.application.rule_service import RuleService
 from src.application.ingestion_service import IngestionService
+from src.application.import_job_service import ImportJobService
 
 # ViewModels
 from src.views.models.portfolio_vm import PortfolioViewModel
+from src.views.models.cashflow_vm import CashflowViewModel
 
 
 def get_container():
@@ -43,6 +46,7 @@ def get_container():
         asset_service = AssetService(asset_repo)
         ingestion_service = IngestionService(rule_service, asset_service)
         ledger_service = LedgerService(ledger_repo, ingestion_service)
+        import_job_service = ImportJobService(SqlImportJobRepository(), ledger_service)
         portfolio_service = PortfolioService(portfolio_repo)
         liability_service = LiabilityService(liability_repo)
 
@@ -56,6 +60,7 @@ def get_container():
 
         # ViewModels
         portfolio_vm = PortfolioViewModel(portfolio_service)
+        cashflow_vm = CashflowViewModel(ledger_service)
 
         st.session_state["container"] = {
             "auth": auth_service,
@@ -66,7 +71,9 @@ def get_container():
             "summary": summary_service,
             "rule": rule_service,
             "ingestion": ingestion_service,
-            "portfolio_vm": portfolio_vm
+            "import_jobs": import_job_service,
+            "portfolio_vm": portfolio_vm,
+            "cashflow_vm": cashflow_vm
         }
 
     return st.session_state["container"]
@@ -0,0 +1,106 @@
+# src/core/accounts.py
+"""
+Canonical bank account identifiers, so one account matches however an export
+or the user wrote it:
+
+    "CZ65 0800 0000 1920 0014 5399"  ->  "19-2000145399/0800"
+    "000019-2000145399/0800"         ->  "19-2000145399/0800"
+    "0000192000145399/0800"          ->  "19-2000145399/0800"
+    "2000145399"                     ->  "2000145399"   (no bank code)
+    "de89 3704 0044 0532 0130 00"    ->  "DE89370400440532013000"
+
+Czech IBANs embed the domestic prefix, number and bank code, so they reduce to
+the domestic form; other IBANs are kept compact and upper-case.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+_DOMESTIC = re.compile(r"^(?:(\d{1,6})-)?(\d{1,16})(?:/(\d{4}))?$")
+_IBAN = re.compile(r"^[A-Z]{2}\d{2}[A-Z0-9]{11,30}$")
+# account_identifier may hold several identifiers of one account
+_SEPARATORS = re.compile(r"[,;|\n]+")
+
+
+def _domestic(prefix: str, number: str, bank: str) -> str:
+    if not prefix and len(number) > 10:
+        # Prefix and number written as one 16-digit block
+        prefix, number = number[:-10], number[-10:]
+    prefix = prefix.lstrip("0")
+    number = number.lstrip("0") or "0"
+    account = f"{prefix}-{number}" if prefix else number
+    return f"{account}/{bank}" if bank else account
+
+
+def canonical_account(value) -> str:
+    """Canonical form of one identifier; "" for missing values."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    compact = re.sub(r"\s+", "", str(value)).upper()
+    if compact in ("", "NAN", "NONE"):
+        return ""
+    if compact.startswith("CZ") and len(compact) == 24 and _IBAN.match(compact):
+        return _domestic(compact[8:14], compact[14:], compact[4:8])
+    m = _DOMESTIC.match(compact)
+    if m:
+        return _domestic(m.group(1) or "", m.group(2), m.group(3) or "")
+    return compact
+
+
+def account_number(canonical: str) -> str:
+    """The canonical identifier without its bank code (domestic accounts only)."""
+    return canonical.split("/", 1)[0]
+
+
+def _map_unique(values: Iterable, fn: Callable[[object], str]) -> np.ndarray:
+    # Exports repeat the same few accounts, so each distinct value is converted once
+    codes, uniques = pd.factorize(pd.Series(list(values), dtype=object), use_na_sentinel=True)
+    mapped = np.array([fn(u) for u in uniques] + [""], dtype=object)
+    return mapped[codes]  # the na sentinel (-1) picks the trailing ""
+
+
+def canonical_accounts(values: Iterable) -> np.ndarray:
+    """Vectorized canonical_account."""
+    return _map_unique(values, canonical_account)
+
+
+def account_numbers(canonical: Iterable[str]) -> np.ndarray:
+    """Vectorized account_number."""
+    return _map_unique(canonical, account_number)
+
+
+@dataclass(frozen=True)
+class AccountIndex:
+    """The user's own accounts, for set-membership tests over whole batches."""
+    accounts: frozenset  # canonical identifiers
+    numbers: frozenset  # account numbers of the domestic identifiers that have a bank code
+
+    @classmethod
+    def build(cls, identifiers: Iterable[str]) -> "AccountIndex":
+        accounts = set()
+        for identifier in identifiers:
+            for part in _SEPARATORS.split(identifier or ""):
+                canonical = canonical_account(part)
+                if canonical:
+                    accounts.add(canonical)
+        numbers = {account_number(a) for a in accounts if "/" in a}
+        return cls(frozenset(accounts), frozenset(numbers))
+
+    def __bool__(self) -> bool:
+        return bool(self.accounts)
+
+    def contains(self, canonical: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over canonical identifiers. An identifier without a bank code
+        matches an own account with the same number, and vice versa.
+        """
+        values = pd.Series(canonical, dtype=object)
+        if values.empty or not self.accounts:
+            return np.zeros(len(values), dtype=bool)
+        numbers = pd.Series(account_numbers(values), dtype=object)
+        bare = numbers.eq(values)
+        hit = values.isin(self.accounts) | numbers.isin(self.accounts) | (bare & values.isin(self.numbers))
+        return (hit & values.ne("")).to_numpy()
@@ -0,0 +1,107 @@
+# src/core/data_version.py
+"""
+Per-user data-version counters.
+
+Every write path in the application services bumps the counter for its scope
+("ledger", "portfolio", "assets", "liabilities", "rules"); the per-user total moves with
+any of them. Read caches key on these numbers, so they invalidate exactly when
+the user's data changes and never on pure UI reruns.
+
+Counters are rows in the shared database, so a write made by another process
+(e.g. the src/jobs CLIs) invalidates the app's caches like one made in-process.
+Reads come from an in-process copy. Every bump also advances the modification
+time of a marker file next to the database, so a read costs one stat() and the
+owner's rows are reloaded (one query) only after some process wrote.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+from uuid import UUID
+
+LEDGER = "ledger"
+PORTFOLIO = "portfolio"
+ASSETS = "assets"
+LIABILITIES = "liabilities"
+RULES = "rules"
+# Row holding the per-user total
+ALL = "*"
+
+_lock = threading.Lock()
+# owner -> {scope: version}, and the marker stamp they were loaded at
+_versions: Dict[str, Dict[str, int]] = {}
+_loaded_at: Dict[str, int] = {}
+_marker: Optional[str] = None
+
+
+def _marker_path() -> str:
+    global _marker
+    if _marker is None:
+        from src.core.database import DB_FILE
+        _marker = f"{DB_FILE}.version"
+    return _marker
+
+
+def _stamp() -> int:
+    try:
+        return os.stat(_marker_path()).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _touch():
+    # Strictly increasing, even for bumps within one tick of the file system clock
+    path = _marker_path()
+    stamp = max(time.time_ns(), _stamp() + 1)
+    with open(path, "a"):
+        os.utime(path, ns=(stamp, stamp))
+
+
+def bump(user_id: UUID, scope: str) -> int:
+    """Marks the user's data in `scope` as changed. Returns the new scope version."""
+    # Deferred: sqlalchemy is not loaded at app start-up
+    from sqlalchemy.dialects.sqlite import insert
+    from sqlmodel import Session, select
+    from src.core.database import get_engine
+    from src.domain.models.MDataVersion import DataVersion
+
+    uid = str(user_id)
+    statement = insert(DataVersion).values([
+        {"owner": uid, "scope": ALL, "version": 1},
+        {"owner": uid, "scope": scope, "version": 1},
+    ])
+    # Atomic increment, so concurrent writers (app and jobs) never lose a bump
+    statement = statement.on_conflict_do_update(index_elements=["owner", "scope"],
+                                                set_={"version": DataVersion.version + 1})
+    with Session(get_engine()) as session:
+        session.exec(statement)
+        version = session.exec(select(DataVersion.version)
+                               .where(DataVersion.owner == uid, DataVersion.scope == scope)).one()
+        session.commit()
+    _touch()
+    return version
+
+
+def get(user_id: UUID, scope: Optional[str] = None) -> int:
+    """Current version of one scope, or of all the user's data when scope is None."""
+    uid = str(user_id)
+    # Read before loading: a bump landing during the load moves the stamp, so it is reloaded next time
+    stamp = _stamp()
+    with _lock:
+        if _loaded_at.get(uid) == stamp:
+            return _versions[uid].get(scope or ALL, 0)
+
+    versions = _load(uid)
+    with _lock:
+        _versions[uid], _loaded_at[uid] = versions, stamp
+    return versions.get(scope or ALL, 0)
+
+
+def _load(uid: str) -> Dict[str, int]:
+    from sqlalchemy import select
+    from src.core.database import get_engine
+    from src.domain.models.MDataVersion import DataVersion
+
+    with get_engine().connect() as conn:
+        rows = conn.execute(select(DataVersion.scope, DataVersion.version).where(DataVersion.owner == uid))
+        return dict(rows.all())
@@ -1,10 +1,19 @@
-from sqlalchemy import create_engine, event
+from sqlalchemy import MetaData, create_engine, event, inspect, select
+from sqlalchemy.engine import Engine
 from sqlmodel import SQLModel
 import os
 import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+from uuid import UUID
+
+from src.core.instrumentation import instrument_engine
 
 # --- DB Setup ---
-DB_FILE = "data/cfo_tracker.db"
+# CFO_DB_FILE lets benchmarks and scripts point the app at a scratch database.
+DB_FILE = os.environ.get("CFO_DB_FILE", "data/cfo_tracker.db")
 DB_URL = f"sqlite:///{DB_FILE}"
 
 # Suppress verbose SQLAlchemy logging
@@ -12,15 +21,165 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 
 engine = create_engine(DB_URL, echo=False)
+instrument_engine(engine)
 
+# --- Per-user sharding (opt-in) ---
+# CFO_DB_SHARDING=1 gives every owner a SQLite file at <shard root>/<owner id>/<SHARD_FILE>,
+# i.e. inside the per-user directory AuthService creates. The shared DB keeps
+# cross-user bookkeeping (SHARED_TABLES). A new shard starts as a copy of the owner's
+# rows in the shared DB, so switching sharding on does not hide existing data.
+SHARDING = os.environ.get("CFO_DB_SHARDING", "0").lower() in ("1", "on", "true")
+SHARD_ROOT = Path(os.environ.get("CFO_SHARD_ROOT") or os.path.dirname(DB_FILE) or ".")
+SHARD_FILE = "cfo_tracker.db"
+MAX_OPEN_SHARDS = int(os.environ.get("CFO_MAX_OPEN_SHARDS", "32"))
+# Tables that stay in the shared DB when sharding is on
+SHARED_TABLES = ("importjob", "dataversion")
 
-def init_db(recreate: bool = False):
+_shards: "OrderedDict[str, Engine]" = OrderedDict()
+_shards_lock = threading.Lock()
+
+
+def _copy_owner_rows(shard: Engine, owner: str) -> int:
     """
-    Initializes the database, creating tables from SQLModel metadata.
+    Copies the owner's rows of every per-owner table from the shared DB into a
+    new shard (one INSERT ... SELECT per table over an ATTACHed shared DB).
+    The shared rows are left in place. Returns the number of rows copied.
+    """
+    if not os.path.exists(DB_FILE):
+        return 0
+    shared = inspect(engine)
+    copied = 0
+    # The attachment lives as long as the connection; the caller disposes the engine
+    with shard.begin() as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ? AS shared", (os.path.abspath(DB_FILE),))
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name in SHARED_TABLES or "owner" not in table.c or not shared.has_table(table.name):
+                continue
+            # Columns the shared table lacks (not migrated yet) keep their defaults
+            present = {c["name"] for c in shared.get_columns(table.name)}
+            columns = [c for c in table.columns if c.name in present]
+            source = table.to_metadata(MetaData(), schema="shared")
+            rows = select(*(source.c[c.name] for c in columns)).where(source.c.owner == UUID(owner))
+            copied += conn.execute(table.insert().from_select(columns, rows)).rowcount
+    return copied
+
+
+def _open_shard(owner: str) -> Engine:
+    path = SHARD_ROOT / owner / SHARD_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _import_models()
+    if not path.exists():
+        # Built under a temporary name, so a crash mid-copy leaves no half-filled shard behind
+        staging = path.with_name(SHARD_FILE + ".tmp")
+        staging.unlink(missing_ok=True)
+        builder = create_engine(f"sqlite:///{staging}", echo=False)
+        try:
+            SQLModel.metadata.create_all(builder)
+            copied = _copy_owner_rows(builder, owner)
+        finally:
+            builder.dispose()
+        os.replace(staging, path)
+        if copied:
+            logger.warning("Created shard %s with %d row(s) copied from %s; they remain in the shared DB",
+                           path, copied, DB_FILE)
+
+    shard = create_engine(f"sqlite:///{path}", echo=False)
+    instrument_engine(shard)
+    SQLModel.metadata.create_all(shard)
+    _add_missing_columns(shard)
+    logger.debug("Opened shard %s", path)
+    return shard
+
+
+def get_engine(owner: Optional[UUID] = None) -> Engine:
+    """
+    Engine holding `owner`'s data: the shared engine unless sharding is enabled.
+    Open shard engines are kept in an LRU; evicted ones are disposed.
+    """
+    if not SHARDING or owner is None:
+        return engine
+
+    key = str(owner)
+    with _shards_lock:
+        shard = _shards.get(key)
+        if shard is not None:
+            _shards.move_to_end(key)
+            return shard
+
+        shard = _open_shard(key)
+        _shards[key] = shard
+        while len(_shards) > MAX_OPEN_SHARDS:
+            _, evicted = _shards.popitem(last=False)
+            # Checked-out connections finish normally; pooled ones are closed
+            evicted.dispose()
+        return shard
+
+
+def shard_owners() -> List[UUID]:
     """
+    Owners to visit in jobs that run across all users: those with a shard on disk
+    and those whose rows are still only in the shared DB (get_engine seeds their
+    shard on first use).
+    """
+    if not SHARDING:
+        return []
+    owners = set()
+    for path in SHARD_ROOT.glob(f"*/{SHARD_FILE}"):
+        try:
+            owners.add(UUID(path.parent.name))
+        except ValueError:
+            continue
+    _import_models()
+    shared = inspect(engine)
+    with engine.connect() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name in SHARED_TABLES or "owner" not in table.c or not shared.has_table(table.name):
+                continue
+            owners.update(conn.execute(select(table.c.owner).distinct()).scalars())
+    return sorted(owners)
+
+
+def _import_models():
     # Import all models here so SQLModel knows about them
     from src.domain.models.MAsset import Asset
+    from src.domain.models.MLiability import Liability
+    from src.domain.models.MTransaction import Transaction
+    from src.domain.models.MPortfolio import InvestmentPosition, InvestmentEvent
+    from src.domain.models.MTax import TaxLot
     from src.domain.models.MRule import CategoryRule
+    from src.domain.models.MImportJob import ImportJob
+    from src.domain.models.MDataVersion import DataVersion
+
+
+def _add_missing_columns(bind: Engine):
+    """
+    create_all only creates missing tables. Nullable columns (and their indexes)
+    added to a model later are added to existing tables here.
+    """
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    logger.warning("Cannot add NOT NULL column %s.%s to an existing table", table.name, column.name)
+                    continue
+                col_type = column.type.compile(dialect=bind.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}')
+                logger.info("Added column %s.%s", table.name, column.name)
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+def init_db(recreate: bool = False):
+    """
+    Initializes the database, creating tables from SQLModel metadata.
+    """
+    _import_models()
 
     if recreate:
         logger.info("Recreating database tables...")
@@ -28,6 +187,7 @@ def init_db(recreate: bool = False):
 
     logger.info("Creating database tables if they don't exist...")
     SQLModel.metadata.create_all(engine)
+    _add_missing_columns(engine)
 
     # Ensure the data directory exists and is writable
     db_dir = os.path.dirname(DB_FILE)
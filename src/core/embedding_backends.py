@@ -0,0 +1,193 @@
+# src/core/embedding_backends.py
+"""
+CPU embedding backends for VectorRuleEngine, selected with CFO_EMBEDDING_BACKEND:
+
+    sentence-transformers  full-precision PyTorch model (default; existing indexes use it)
+    torch-int8             the same model with torch dynamic int8 quantization of Linear layers
+    onnx-int8              int8-quantized ONNX export run by onnxruntime; never imports torch
+
+The int8 backends produce slightly different vectors, so each one gets its own
+Chroma collection; fill it with RuleService.rebuild_vector_index.
+
+onnx-int8 reads CFO_EMBEDDING_ONNX_DIR, which must hold tokenizer.json and
+either model_int8.onnx or a full-precision model.onnx. In the second case the
+model is quantized once on first use (this needs the `onnx` package). A
+directory from `optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2`
+works, and so does Chroma's cached onnx/ folder.
+"""
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+from chromadb.utils.embedding_functions import register_embedding_function
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+DEFAULT_BACKEND = "sentence-transformers"
+BACKENDS = (DEFAULT_BACKEND, "torch-int8", "onnx-int8")
+
+BACKEND = os.environ.get("CFO_EMBEDDING_BACKEND", DEFAULT_BACKEND)
+THREADS = int(os.environ.get("CFO_EMBEDDING_THREADS", "0"))  # 0 = library default
+BATCH_SIZE = int(os.environ.get("CFO_EMBEDDING_BATCH_SIZE", "64"))
+ONNX_DIR = Path(os.environ.get("CFO_EMBEDDING_ONNX_DIR", "data/models/all-MiniLM-L6-v2-onnx"))
+
+# all-MiniLM-L6-v2 was trained with 256-token inputs
+MAX_TOKENS = 256
+
+
+def model_id(model_name: str, backend: str = BACKEND) -> str:
+    """Identity of the vectors a backend produces (embedding cache key, collection suffix)."""
+    return model_name if backend == DEFAULT_BACKEND else f"{model_name}@{backend}"
+
+
+def _set_torch_threads(threads: int):
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+class BatchedSentenceTransformerEmbeddingFunction(SentenceTransformerEmbeddingFunction):
+    """Chroma's sentence-transformers function with a configurable encode batch size."""
+
+    def __init__(self, model_name: str, batch_size: int = BATCH_SIZE, **kwargs: Any):
+        super().__init__(model_name=model_name, **kwargs)
+        self.batch_size = batch_size
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = self._model.encode(
+            list(input),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize_embeddings,
+        )
+        return [np.array(embedding, dtype=np.float32) for embedding in embeddings]
+
+
+@register_embedding_function
+class TorchInt8EmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self, model_name: str, threads: int = THREADS, batch_size: int = BATCH_SIZE):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.threads = threads
+        self.batch_size = batch_size
+        _set_torch_threads(threads)
+        # Own instance: Chroma caches full-precision models by name and quantization is in place
+        model = SentenceTransformer(model_name, device="cpu")
+        self._model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = self._model.encode(list(input), batch_size=self.batch_size, convert_to_numpy=True)
+        return [np.array(embedding, dtype=np.float32) for embedding in embeddings]
+
+    @staticmethod
+    def name() -> str:
+        return "cfo_torch_int8"
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "threads": self.threads, "batch_size": self.batch_size}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "TorchInt8EmbeddingFunction":
+        return TorchInt8EmbeddingFunction(**config)
+
+
+def ensure_quantized_onnx(model_dir: Path) -> Path:
+    """Path of model_int8.onnx in model_dir, quantizing model.onnx into it on first use."""
+    quantized = model_dir / "model_int8.onnx"
+    if quantized.exists():
+        return quantized
+    source = model_dir / "model.onnx"
+    if not source.exists():
+        raise FileNotFoundError(
+            f"No ONNX model in {model_dir}: expected model_int8.onnx or model.onnx (plus tokenizer.json)")
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise ImportError("Quantizing the ONNX model needs the `onnx` package (pip install onnx), "
+                          f"or place a pre-quantized model_int8.onnx in {model_dir}") from e
+
+    logger.info("Quantizing %s to int8 (one-off)", source)
+    tmp = quantized.with_suffix(".tmp")
+    quantize_dynamic(str(source), str(tmp), weight_type=QuantType.QInt8)
+    os.replace(tmp, quantized)
+    return quantized
+
+
+@register_embedding_function
+class OnnxInt8EmbeddingFunction(EmbeddingFunction[Documents]):
+    def __init__(self, model_dir: str = str(ONNX_DIR), threads: int = THREADS, batch_size: int = BATCH_SIZE):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = str(model_dir)
+        self.threads = threads
+        self.batch_size = batch_size
+
+        path = Path(model_dir)
+        self._tokenizer = Tokenizer.from_file(str(path / "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=MAX_TOKENS)
+        # Pad to the longest text in each batch, not to MAX_TOKENS
+        self._tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self._session = ort.InferenceSession(str(ensure_quantized_onnx(path)), options,
+                                             providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+    def __call__(self, input: Documents) -> Embeddings:
+        texts = list(input)
+        embeddings: List[np.ndarray] = []
+        for start in range(0, len(texts), self.batch_size):
+            encoded = self._tokenizer.encode_batch(texts[start:start + self.batch_size])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask,
+                     "token_type_ids": np.zeros_like(input_ids)}
+            hidden = self._session.run(None, {k: v for k, v in feeds.items() if k in self._input_names})[0]
+
+            # Mean pooling over real tokens, then L2 norm (what sentence-transformers does)
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            embeddings.extend(pooled.astype(np.float32))
+        return embeddings
+
+    @staticmethod
+    def name() -> str:
+        return "cfo_onnx_int8"
+
+    def default_space(self) -> str:
+        return "cosine"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model_dir": self.model_dir, "threads": self.threads, "batch_size": self.batch_size}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "OnnxInt8EmbeddingFunction":
+        return OnnxInt8EmbeddingFunction(**config)
+
+
+def build_embedding_function(model_name: str, backend: str = BACKEND, threads: int = THREADS,
+                             batch_size: int = BATCH_SIZE) -> EmbeddingFunction:
+    if backend == DEFAULT_BACKEND:
+        _set_torch_threads(threads)
+        return BatchedSentenceTransformerEmbeddingFunction(model_name, batch_size=batch_size)
+    if backend == "torch-int8":
+        return TorchInt8EmbeddingFunction(model_name, threads=threads, batch_size=batch_size)
+    if backend == "onnx-int8":
+        return OnnxInt8EmbeddingFunction(str(ONNX_DIR), threads=threads, batch_size=batch_size)
+    raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {', '.join(BACKENDS)}")
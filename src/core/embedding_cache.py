@@ -0,0 +1,235 @@
+# src/core/embedding_cache.py
+"""
+Content-addressed, on-disk cache of description embeddings.
+
+Rows are keyed by blake2b(model name, normalized text) and appended to a flat
+float32 matrix that is memory-mapped read-only, so opening the cache costs a
+key scan and no vector copies. Layout per model under CACHE_DIR/<model>/:
+
+    meta.json    {"model", "dim", "dtype"}
+    keys.bin     16-byte digests, one per row, in row order
+    vectors.bin  rows x dim, C order
+
+The files are append-only. A torn append (crash between the two writes) is
+healed by truncating both files to the shorter row count before the next write.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+CACHE_DIR = Path(os.environ.get("CFO_EMBEDDING_CACHE_DIR", "data/embeddings"))
+CACHE_ENABLED = os.environ.get("CFO_EMBEDDING_CACHE", "1").lower() not in ("0", "off", "false")
+KEY_BYTES = 16
+
+_caches: Dict[Tuple[Path, str], "EmbeddingCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    # Tokenizers split on whitespace, so runs of it don't change the embedding
+    return " ".join(str(text).split())
+
+
+def cache_key(model_name: str, text: str) -> bytes:
+    payload = f"{model_name}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingCache:
+    def __init__(self, root: Path, model_name: str, dtype=np.float32):
+        self.model_name = model_name
+        self.dir = Path(root) / re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._rows = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.dir / "meta.json"
+
+    @property
+    def _keys_path(self) -> Path:
+        return self.dir / "keys.bin"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.dir / "vectors.bin"
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _load(self):
+        if not self._meta_path.exists():
+            return
+        try:
+            meta = json.loads(self._meta_path.read_text())
+        except Exception as e:
+            logger.warning("Ignoring unreadable embedding cache %s: %s", self.dir, e)
+            return
+        self.dim = int(meta["dim"])
+        self.dtype = np.dtype(meta["dtype"])
+        self._read_rows()
+        logger.debug("Embedding cache %s: %d vector(s)", self.dir, self._rows)
+
+    def _disk_rows(self) -> int:
+        keys = self._keys_path.stat().st_size // KEY_BYTES if self._keys_path.exists() else 0
+        vecs = self._vectors_path.stat().st_size // self._row_bytes() if self._vectors_path.exists() else 0
+        return min(keys, vecs)
+
+    def _read_rows(self):
+        """(Re)builds the key index and maps the matrix; only new keys are scanned."""
+        rows = self._disk_rows()
+        if rows == self._rows:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._rows * KEY_BYTES)
+            raw = f.read((rows - self._rows) * KEY_BYTES)
+        for i in range(len(raw) // KEY_BYTES):
+            self._index[raw[i * KEY_BYTES:(i + 1) * KEY_BYTES]] = self._rows + i
+        self._rows = rows
+        self._matrix = (np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(rows, self.dim))
+                        if rows else None)
+
+    @contextmanager
+    def _file_lock(self):
+        # Serializes appends between processes sharing the cache directory
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.dir / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """Cached vectors in key order; None where the key is unknown."""
+        with self._lock:
+            rows = [self._index.get(k) for k in keys]
+            found = [None if r is None else self._matrix[r] for r in rows]
+        hits = sum(v is not None for v in found)
+        self.hits += hits
+        self.misses += len(found) - hits
+        return found
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        vectors = np.asarray(vectors)
+        if not len(keys):
+            return
+        with self._lock, self._file_lock():
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                self._meta_path.write_text(json.dumps(
+                    {"model": self.model_name, "dim": self.dim, "dtype": self.dtype.name}))
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match cache ({self.dim})")
+
+            # Pick up rows appended by other processes, then drop any torn tail
+            if self._keys_path.exists():
+                self._read_rows()
+            new = {}
+            for key, vec in zip(keys, vectors):
+                if key not in self._index and key not in new:
+                    new[key] = vec
+            if not new:
+                return
+
+            for path, row_bytes in ((self._vectors_path, self._row_bytes()), (self._keys_path, KEY_BYTES)):
+                with open(path, "ab") as f:
+                    f.truncate(self._rows * row_bytes)
+            # Vectors first: a key is only valid once its row is on disk
+            block = np.ascontiguousarray(np.stack(list(new.values())), dtype=self.dtype)
+            with open(self._vectors_path, "ab") as f:
+                f.write(block.tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(new))
+            self._read_rows()
+        logger.debug("Embedding cache %s: added %d vector(s)", self.dir, len(new))
+
+    def __len__(self) -> int:
+        return self._rows
+
+
+def get_embedding_cache(model_name: str, root: Path = CACHE_DIR) -> EmbeddingCache:
+    """One shared cache per model and directory."""
+    key = (Path(root).resolve(), model_name)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = EmbeddingCache(key[0], model_name)
+        return _caches[key]
+
+
+class CachedEmbeddingFunction:
+    """
+    Chroma embedding function wrapper: known descriptions are served from the
+    cache, only the rest go through the model (deduplicated, in one call).
+    Identity (name/config) is the wrapped function's, so persisted collections
+    still match.
+    """
+
+    def __init__(self, inner, model_name: str, cache: Optional[EmbeddingCache] = None):
+        self.inner = inner
+        self.model_name = model_name
+        self.cache = cache if cache is not None else get_embedding_cache(model_name)
+
+    def __call__(self, input: Sequence[str]) -> List[np.ndarray]:
+        texts = list(input)
+        keys = [cache_key(self.model_name, t) for t in texts]
+        found = self.cache.get_many(keys)
+
+        missing: Dict[bytes, str] = {}
+        for key, text, vec in zip(keys, texts, found):
+            if vec is None:
+                missing.setdefault(key, text)
+        if missing:
+            fresh = np.asarray(self.inner(list(missing.values())), dtype=np.float32)
+            self.cache.put_many(list(missing), fresh)
+            by_key = dict(zip(missing, fresh))
+            found = [by_key[k] if v is None else v for k, v in zip(keys, found)]
+
+        return [np.asarray(v, dtype=np.float32) for v in found]
+
+    def embed_query(self, input: Sequence[str]) -> List[np.ndarray]:
+        return self(input)
+
+    def name(self) -> str:
+        return self.inner.name()
+
+    def get_config(self) -> dict:
+        return self.inner.get_config()
+
+    def default_space(self):
+        return self.inner.default_space()
+
+    def supported_spaces(self):
+        return self.inner.supported_spaces()
+
+    def is_legacy(self) -> bool:
+        return self.inner.is_legacy()
+
+    def __getattr__(self, item):
+        return getattr(self.inner, item)
@@ -0,0 +1,68 @@
+# src/core/ingestion/bank_configs.py
+"""
+Column layout of each supported bank's CSV export: the single source for
+CsvBankStrategy and the legacy parsers in src/core/parsers.py.
+
+A bank is recognized from the header line alone. SIGNATURES maps each bank's
+trigger column to the bank(s) using it, so detection is one hash lookup per
+header column however many banks are configured; the other required columns
+confirm the match.
+"""
+from typing import Dict, List, Optional, Sequence
+
+BANK_CONFIGS = {
+    'CS': {
+        'trigger': 'Own account name',
+        'date': 'Processing Date',
+        'desc': ['Partner Name', 'Note'],
+        'amt': 'Amount',
+        'own_acc': 'Own account number',
+        'target_acc': 'Partner account number'
+    },
+    'RB': {
+        'trigger': 'Datum provedení',
+        'date': 'Datum provedení',
+        'desc': ['Název protiúčtu', 'Zpráva'],
+        'amt': 'Zaúčtovaná částka',
+        'own_acc': 'Číslo účtu',
+        'target_acc': 'Číslo protiúčtu'
+    },
+}
+
+
+def normalize_column(name: str) -> str:
+    # Exports differ in BOMs, quoting, padding and case of the same header
+    return str(name).strip().lstrip("\ufeff").strip('"').strip().casefold()
+
+
+def config_columns(config: dict) -> List[str]:
+    """Every column a config reads, each once."""
+    columns = [config['trigger'], config['date'], *config['desc'], config['amt'],
+               config.get('own_acc'), config.get('target_acc')]
+    return list(dict.fromkeys(c for c in columns if c))
+
+
+def _required(config: dict) -> List[str]:
+    return [normalize_column(c) for c in (config['trigger'], config['date'], config['amt'])]
+
+
+SIGNATURES: Dict[str, List[str]] = {}
+for _bank, _config in BANK_CONFIGS.items():
+    SIGNATURES.setdefault(normalize_column(_config['trigger']), []).append(_bank)
+
+
+def detect_bank(header: Sequence[str]) -> Optional[str]:
+    """Bank key for a header row, or None if no configured bank matches."""
+    columns = [normalize_column(c) for c in header]
+    present = set(columns)
+    for column in columns:
+        for bank in SIGNATURES.get(column, ()):
+            if present.issuperset(_required(BANK_CONFIGS[bank])):
+                return bank
+    return None
+
+
+def column_renames(header: Sequence[str], bank: str) -> Dict[str, str]:
+    """Header name as written in the file -> name used in BANK_CONFIGS[bank]."""
+    canonical = {normalize_column(c): c for c in config_columns(BANK_CONFIGS[bank])}
+    return {c: canonical[normalize_column(c)] for c in header if normalize_column(c) in canonical}
@@ -16,10 +16,18 @@ class NormalizedTransaction:
     raw_source: str = ""
 
 class IngestionStrategy(ABC):
+    # File extensions (lower case, with dot) the registry offers to this strategy
+    extensions: Tuple[str, ...] = ()
+
     @abstractmethod
     def can_handle(self, filename: str, content: bytes) -> bool:
+        """Cheap check on the file's header; must not parse the body."""
         pass
 
+    def rejection(self, filename: str, content: bytes) -> Optional[str]:
+        """Why can_handle declined the file, for the import error shown to the user."""
+        return None
+
     @abstractmethod
     def parse(self, filename: str, content: bytes) -> Tuple[List[NormalizedTransaction], Optional[str]]:
         """
@@ -1,97 +1,115 @@
 # src/core/ingestion/csv_strategy.py
-import logging
-
 import pandas as pd
 import io
-from decimal import Decimal
+import warnings
+from decimal import Decimal, InvalidOperation
 from typing import List, Tuple, Optional
 from .base import IngestionStrategy, NormalizedTransaction
+from .bank_configs import BANK_CONFIGS, column_renames, config_columns, detect_bank
+from .sniffer import sniff, decode_text, read_header
+from src.core.instrumentation import timed
+
+
+def _decimal(text: str) -> Optional[Decimal]:
+    try:
+        return Decimal(text)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _accounts(column: pd.Series) -> List[Optional[str]]:
+    return [a or None for a in column.fillna('').astype(str).str.strip().tolist()]
+
+
+def _descriptions(parts: pd.DataFrame) -> pd.Series:
+    # Non-empty parts joined by one space, as " ".join(filter(None, parts)) per row
+    result = parts.iloc[:, 0]
+    for col in parts.columns[1:]:
+        part = parts[col]
+        result = result.where(part.eq(''), result.where(result.eq(''), result + ' ') + part)
+    return result.str.strip()
+
+
+def _dates(column: pd.Series) -> pd.Series:
+    with warnings.catch_warnings():
+        # An unparseable first row makes pandas fall back to per-row parsing, which is fine here
+        warnings.simplefilter('ignore', UserWarning)
+        dates = pd.to_datetime(column, dayfirst=True, errors='coerce')
+    # The format is inferred from the first row; rows written differently get a second pass
+    retry = dates.isna() & column.notna()
+    if retry.any():
+        dates[retry] = pd.to_datetime(column[retry], dayfirst=True, errors='coerce', format='mixed')
+    return dates
 
-# Configs mapped to your specific bank exports
-BANK_CONFIGS = {
-    'CS': {
-        'trigger': 'Own account name',
-        'date': 'Processing Date',
-        'desc': ['Partner Name', 'Note'],
-        'amt': 'Amount'
-    },
-    'RB': {
-        'trigger': 'Datum provedení',
-        'date': 'Datum provedení',
-        'desc': ['Název protiúčtu', 'Zpráva'],
-        'amt': 'Zaúčtovaná částka',
-    },
-}
+
+def _unknown_format(header: List[str]) -> str:
+    return f"Unknown Bank Format. Could not find trigger columns. Found: [{', '.join(header)}]"
 
 
 class CsvBankStrategy(IngestionStrategy):
+    extensions = ('.csv',)
+
     def can_handle(self, filename: str, content: bytes) -> bool:
-        return filename.lower().endswith('.csv')
+        # Only the first line is decoded; the body is left to parse()
+        return detect_bank(read_header(content, sniff(content))) is not None
+
+    def rejection(self, filename: str, content: bytes) -> Optional[str]:
+        return _unknown_format(read_header(content, sniff(content)))
 
+    @timed()
     def parse(self, filename: str, content: bytes) -> Tuple[List[NormalizedTransaction], Optional[str]]:
-        text_data = self._decode(content)
+        # Encoding and separator come from a bounded sample; the file is decoded once
+        sniffed = sniff(content)
+        header = read_header(content, sniffed)
+        bank = detect_bank(header)
+        if bank is None:
+            return [], _unknown_format(header)
+        config = BANK_CONFIGS[bank]
+
+        text_data = decode_text(content, sniffed)
         if not text_data:
-            return [], "Failed to decode file (Unknown encoding)."
-
-        # Robust Separator Detection
-        sep = ';' if text_data.count(';') > text_data.count(',') else ','
+            return [], "File is empty."
 
+        renames = column_renames(header, bank)
         try:
-            # Skip bad lines to be safe
-            df = pd.read_csv(io.StringIO(text_data), sep=sep, on_bad_lines='skip')
+            # Skip bad lines to be safe; only the configured columns, as text
+            # (account numbers keep their leading zeros, amounts stay exact)
+            df = pd.read_csv(io.StringIO(text_data), sep=sniffed.delimiter, on_bad_lines='skip', dtype=str,
+                             usecols=lambda c: c in renames)
         except Exception as e:
             return [], f"CSV Parsing Error: {str(e)}"
 
         if df.empty:
             return [], "File is empty."
+        df = df.rename(columns=renames).reindex(columns=config_columns(config))
 
-        # Identify Bank
-        config = None
-        for key, cfg in BANK_CONFIGS.items():
-            if cfg['trigger'] in df.columns:
-                config = cfg
-                break
+        # Extract column-wise
+        amounts = [_decimal(a) for a in
+                   df[config['amt']].fillna('').str.replace(r'[ \xa0]', '', regex=True).str.replace(',', '.')]
+        dates = _dates(df[config['date']])
+        descriptions = _descriptions(df[config['desc']].fillna(''))
+        sources = _accounts(df[config['own_acc']]) if config.get('own_acc') else [None] * len(df)
+        targets = _accounts(df[config['target_acc']]) if config.get('target_acc') else [None] * len(df)
 
-        if not config:
-            # Helpful error message listing found columns
-            found_cols = ", ".join(df.columns[:3]) + "..."
-            return [], f"Unknown Bank Format. Could not find trigger columns. Found: [{found_cols}]"
-
-        # Extract
         results = []
         errors = []
-        for idx, row in df.iterrows():
-            try:
-                amt_str = str(row[config['amt']]).replace(' ', '').replace('\xa0', '').replace(',', '.')
-                amt = Decimal(amt_str)
-
-                desc_parts = [str(row.get(col, '')) for col in config['desc']]
-                full_desc = " ".join([d for d in desc_parts if d and d != 'nan']).strip()
-
-                raw_date = row[config['date']]
-                dt = pd.to_datetime(raw_date, dayfirst=True).date()
-
-                results.append(NormalizedTransaction(
-                    date=dt,
-                    description=full_desc,
-                    amount=amt,
-                    raw_source=filename
-                ))
-            except Exception as e:
-                # Log specific row failure but continue
-                errors.append(f"Row {idx}: {str(e)}")
+        for idx, amt, dt, desc, source, target in zip(df.index, amounts, dates, descriptions, sources, targets):
+            if amt is None:
+                errors.append(f"Row {idx}: invalid amount {df.at[idx, config['amt']]!r}")
+                continue
+            if pd.isna(dt):
+                errors.append(f"Row {idx}: invalid date {df.at[idx, config['date']]!r}")
                 continue
+            results.append(NormalizedTransaction(
+                date=dt.date(),
+                description=desc,
+                amount=amt,
+                source_account=source,
+                target_account=target,
+                raw_source=filename
+            ))
 
         if not results and errors:
             return [], f"Found valid header but failed to parse rows. First error: {errors[0]}"
 
         return results, None
-
-    def _decode(self, content: bytes) -> str:
-        for enc in ['utf-8', 'cp1250', 'windows-1250', 'latin1']:
-            try:
-                return content.decode(enc)
-            except UnicodeDecodeError as e:
-                logging.log(logging.ERROR, f"UnicodeDecodeError: {str(e)}")
-                continue
-        return ""
\ No newline at end of file
@@ -0,0 +1,96 @@
+# src/core/ingestion/parallel.py
+"""
+Fan-out of decode/parse/normalize work across a process pool.
+
+Parsing is pure (bytes in, NormalizedTransactions out), so files and ZIP members
+can be handled in separate processes. Results always come back in input order,
+which keeps deduplication and batch contents deterministic.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+# "auto" uses the pool only when there is enough work to amortize process overhead
+PARALLEL_MODE = os.environ.get("CFO_PARALLEL_INGEST", "auto").lower()
+MAX_PROCESSES = int(os.environ.get("CFO_INGEST_PROCESSES", "0")) or (os.cpu_count() or 1)
+AUTO_MIN_FILES = 2
+AUTO_MIN_BYTES = 256 * 1024
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def expand_archives(files: Iterable[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """Replaces each .zip upload with its .csv members (in archive order)."""
+    entries = []
+    for name, content in files:
+        if name.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(io.BytesIO(content)) as z:
+                    for z_name in z.namelist():
+                        if z_name.lower().endswith('.csv') and not z_name.startswith('__MACOSX'):
+                            entries.append((z_name, z.read(z_name)))
+            except zipfile.BadZipFile as e:
+                logger.warning("Skipping unreadable archive %s: %s", name, e)
+                entries.append((name, content))
+        else:
+            entries.append((name, content))
+    return entries
+
+
+def should_parallelize(entries: Sequence[Tuple[str, bytes]], parallel: Optional[bool] = None) -> bool:
+    if parallel is not None:
+        return parallel and len(entries) > 1
+    if PARALLEL_MODE in ("0", "off", "false") or MAX_PROCESSES < 2:
+        return False
+    if PARALLEL_MODE in ("1", "on", "true"):
+        return len(entries) > 1
+    return (len(entries) >= AUTO_MIN_FILES
+            and sum(len(content) for _, content in entries) >= AUTO_MIN_BYTES)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a server process that may hold threads, DB handles or torch
+            _pool = ProcessPoolExecutor(max_workers=MAX_PROCESSES,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def map_ordered(fn: Callable, *sequences: Sequence, parallel: bool = True) -> Iterator:
+    """
+    Lazy `map` over the process pool, yielding results in input order as they complete.
+    `fn` must be a module-level function. If the pool breaks, the remaining items
+    are processed in-process.
+    """
+    if parallel:
+        done = 0
+        try:
+            for result in _get_pool().map(fn, *sequences, chunksize=1):
+                yield result
+                done += 1
+            return
+        except BrokenProcessPool as e:
+            logger.warning("Ingestion process pool failed (%s); parsing in-process.", e)
+            _reset_pool()
+        sequences = tuple(seq[done:] for seq in sequences)
+    yield from map(fn, *sequences)
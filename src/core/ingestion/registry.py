@@ -0,0 +1,37 @@
+# src/core/ingestion/registry.py
+"""
+Ingestion strategies by file extension. A file is only offered to the
+strategies registered for its extension, and each of those decides from the
+header (can_handle), so adding a format does not slow down detection of the
+others. Strategies are picklable: the chosen one runs in a worker process.
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .base import IngestionStrategy
+from .csv_strategy import CsvBankStrategy
+
+
+class StrategyRegistry:
+    def __init__(self, strategies: Iterable[IngestionStrategy] = ()):
+        self._by_extension: Dict[str, List[IngestionStrategy]] = {}
+        for strategy in strategies:
+            self.register(strategy)
+
+    def register(self, strategy: IngestionStrategy):
+        """Later registrations are tried after earlier ones for the same extension."""
+        for extension in strategy.extensions:
+            self._by_extension.setdefault(extension.lower(), []).append(strategy)
+
+    def find(self, filename: str, content: bytes) -> Optional[IngestionStrategy]:
+        candidates = self._by_extension.get(Path(filename).suffix.lower(), ())
+        return next((s for s in candidates if s.can_handle(filename, content)), None)
+
+    def explain(self, filename: str, content: bytes) -> Optional[str]:
+        """For a file find() returned None for: the first reason a strategy gives, if any."""
+        candidates = self._by_extension.get(Path(filename).suffix.lower(), ())
+        return next((r for r in (s.rejection(filename, content) for s in candidates) if r), None)
+
+
+def default_registry() -> StrategyRegistry:
+    return StrategyRegistry([CsvBankStrategy()])
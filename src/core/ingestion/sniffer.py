@@ -0,0 +1,116 @@
+# src/core/ingestion/sniffer.py
+"""
+Encoding and delimiter detection on a bounded prefix of the raw bytes.
+
+Every ingestion path (bank strategies, legacy parsers, portfolio CSVs) goes through
+`sniff()` + `decode_text()`, so a file is decoded exactly once in the common case.
+"""
+import codecs
+import csv
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+SAMPLE_BYTES = 64 * 1024
+DELIMITERS = ";,\t|"
+HEADER_LINES = 5
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+# Bytes with no mapping in cp1250; their presence means the file is not cp1250
+_CP1250_UNDEFINED = frozenset({0x81, 0x83, 0x88, 0x90, 0x98})
+
+
+@dataclass(frozen=True)
+class SniffResult:
+    encoding: str
+    delimiter: str
+
+
+def detect_encoding(content: bytes, sample_size: int = SAMPLE_BYTES, is_final: Optional[bool] = None) -> str:
+    """
+    :param is_final: whether `content` is the whole file; by default it is
+        unless longer than sample_size. Pass False for a prefix read from a stream.
+    """
+    sample = content[:sample_size]
+    if is_final is None:
+        is_final = len(content) <= sample_size
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    # The incremental decoder tolerates a multi-byte character cut at the sample edge
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=is_final and len(content) <= sample_size)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    # Czech bank exports that are not UTF-8 are practically always Windows-1250
+    if _CP1250_UNDEFINED.isdisjoint(sample):
+        return "cp1250"
+    return "latin1"
+
+
+def detect_delimiter(text_sample: str) -> str:
+    """
+    csv.Sniffer over the first few lines, cross-checked against the header line.
+    Data rows with decimal commas ("1 234,56") can fool the sniffer; the header can't.
+    """
+    lines = [line for line in text_sample.splitlines()[:HEADER_LINES + 1] if line.strip()]
+    if not lines:
+        return ","
+    # The last line of a sample may be cut mid-row
+    if len(lines) > 1 and not text_sample.endswith(("\n", "\r")):
+        lines = lines[:-1]
+
+    header = lines[0]
+    header_counts = {d: header.count(d) for d in DELIMITERS}
+    best_by_header = max(DELIMITERS, key=lambda d: header_counts[d])
+
+    try:
+        sniffed = csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        sniffed = None
+
+    if sniffed and header_counts.get(sniffed, 0) >= header_counts[best_by_header]:
+        return sniffed
+    return best_by_header if header_counts[best_by_header] else ","
+
+
+def sniff(content: bytes, sample_size: int = SAMPLE_BYTES, is_final: Optional[bool] = None) -> SniffResult:
+    """O(sample) detection of encoding and delimiter; see detect_encoding for is_final."""
+    encoding = detect_encoding(content, sample_size, is_final)
+    text_sample = content[:sample_size].decode(encoding, errors="ignore")
+    result = SniffResult(encoding=encoding, delimiter=detect_delimiter(text_sample))
+    logger.debug("Sniffed %s", result)
+    return result
+
+
+def read_header(content: bytes, result: SniffResult) -> List[str]:
+    """Column names from the first line only; the body is not decoded."""
+    end = content.find(b"\n", 0, SAMPLE_BYTES)
+    line = content[:end if end >= 0 else SAMPLE_BYTES].decode(result.encoding, errors="ignore")
+    try:
+        return next(csv.reader([line.strip("\r\n\ufeff")], delimiter=result.delimiter))
+    except StopIteration:
+        return []
+
+
+def decode_text(content: bytes, result: SniffResult) -> str:
+    """
+    Single full decode with the sniffed encoding.
+    If a file was ASCII-only in the sample but isn't UTF-8 further down, fall back to cp1250.
+    """
+    try:
+        return content.decode(result.encoding)
+    except UnicodeDecodeError:
+        logger.debug("Sniffed %s failed beyond the sample; decoding as cp1250", result.encoding)
+        return content.decode("cp1250", errors="replace")
@@ -0,0 +1,187 @@
+# src/core/instrumentation.py
+"""
+Lightweight hot-path timing.
+
+Usage:
+    @timed()                      # name defaults to the function's qualname
+    def get_all(self, user_id): ...
+
+    with span("LedgerService.build_dataframe"):
+        ...
+
+Collection is off unless CFO_DIAGNOSTICS=1 (every session) or `set_enabled(True)`
+was called in the current context (one Streamlit session's rerun); when off, a
+decorated call costs two flag checks. Stats are kept twice: process-wide
+(cumulative) and per Streamlit rerun (thread-local, reset by `begin_rerun`).
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# The only process-wide switch; the diagnostics toggle is per session
+_ENABLED = os.environ.get("CFO_DIAGNOSTICS", "") == "1"
+_session_enabled = contextvars.ContextVar("cfo_diagnostics_enabled", default=False)
+
+# Latency samples kept per metric for percentile estimates
+SAMPLE_SIZE = 1024
+
+
+class _Stat:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.samples.append(elapsed)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            idx = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+            return ordered[idx] * 1000
+
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": self.max * 1000,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe bag of named latency stats plus a SQL statement counter."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _Stat] = {}
+        self.sql_statements = 0
+        self.started_at = time.time()
+
+    def record(self, name: str, elapsed: float):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = _Stat()
+            stat.add(elapsed)
+
+    def record_sql(self):
+        with self._lock:
+            self.sql_statements += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.sql_statements = 0
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = {name: stat.summary() for name, stat in self._stats.items()}
+            return {
+                "started_at": self.started_at,
+                "sql_statements": self.sql_statements,
+                "metrics": dict(sorted(metrics.items(), key=lambda kv: -kv[1]["total_ms"])),
+            }
+
+
+cumulative = MetricsRegistry()
+_local = threading.local()
+
+
+def is_enabled() -> bool:
+    return _ENABLED or _session_enabled.get()
+
+
+def set_enabled(enabled: bool):
+    """Turns collection on/off for the calling context only (see module docstring)."""
+    _session_enabled.set(bool(enabled))
+
+
+def begin_rerun():
+    """Starts a fresh per-rerun registry for the calling (script) thread."""
+    _local.rerun = MetricsRegistry()
+
+
+def current_rerun() -> MetricsRegistry:
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        rerun = _local.rerun = MetricsRegistry()
+    return rerun
+
+
+def _record(name: str, elapsed: float):
+    cumulative.record(name, elapsed)
+    current_rerun().record(name, elapsed)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator recording call count and latency under `name` (default: qualname)."""
+    def decorator(fn):
+        metric = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not (_ENABLED or _session_enabled.get()):
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(metric, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def span(name: str):
+    if not (_ENABLED or _session_enabled.get()):
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+
+def _on_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _ENABLED or _session_enabled.get():
+        cumulative.record_sql()
+        current_rerun().record_sql()
+
+
+def instrument_engine(engine):
+    """Counts every SQL statement the engine sends to the database."""
+    from sqlalchemy import event
+    if not event.contains(engine, "before_cursor_execute", _on_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _on_cursor_execute)
+
+
+def dump_json(indent: int = 2) -> str:
+    return json.dumps({
+        "enabled": is_enabled(),
+        "rerun": current_rerun().snapshot(),
+        "cumulative": cumulative.snapshot(),
+    }, indent=indent)
@@ -0,0 +1,51 @@
+# src/core/money.py
+"""
+Exact integer minor units (haléře/cents) for analytics paths.
+
+Domain models keep Decimal; aggregations convert at the edges and reduce int64
+columns with NumPy (or SQL). Every stored amount has two decimals (Numeric(20, 2)),
+so x100 is exact and int64 covers ±9e16 CZK.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Iterable, Union
+
+import numpy as np
+from sqlalchemy import BigInteger, cast, func
+
+MINOR_PER_UNIT = 100
+
+Number = Union[Decimal, int, float, str]
+
+
+def to_minor(amount: Number) -> int:
+    """Decimal (or anything Decimal accepts) -> int minor units, rounded half-even."""
+    if amount is None:
+        return 0
+    if isinstance(amount, float):
+        # Go through repr so 0.1 means 0.10, not 0.1000000000000000055...
+        amount = repr(amount)
+    return int((Decimal(amount) * MINOR_PER_UNIT).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_minor(minor: Union[int, np.integer]) -> Decimal:
+    """int minor units -> Decimal with exactly two places."""
+    return Decimal(int(minor)).scaleb(-2)
+
+
+def to_minor_array(amounts: Iterable[Number]) -> np.ndarray:
+    return np.fromiter((to_minor(a) for a in amounts), dtype=np.int64)
+
+
+def minor_to_float(minor: np.ndarray) -> np.ndarray:
+    """For display/charting only; never aggregate the result."""
+    return np.asarray(minor, dtype=np.int64) / MINOR_PER_UNIT
+
+
+def minor_sql(column):
+    """
+    SQL expression for a Numeric(…, 2) column in minor units. ROUND absorbs the
+    binary-float representation SQLite uses for NUMERIC values. Rows stored with
+    extra precision (FX-converted portfolio amounts) round ties away from zero,
+    so they can differ by a cent from the ORM's half-even read.
+    """
+    return cast(func.round(column * MINOR_PER_UNIT), BigInteger)
@@ -1,12 +1,15 @@
 # src/core/parsers.py
+import csv
 import logging
-import zipfile
 import io
 import re
 import pandas as pd
 from typing import Generator, Tuple, Optional, List
 from decimal import Decimal
 
+from src.core.ingestion.bank_configs import BANK_CONFIGS, column_renames, detect_bank
+from src.core.ingestion.parallel import expand_archives, should_parallelize, map_ordered
+from src.core.ingestion.sniffer import SAMPLE_BYTES, sniff, decode_text, detect_delimiter
 from src.domain.enums import Currency
 from src.domain.models.MPortfolio import InvestmentPosition, InvestmentEvent
 
@@ -17,24 +20,10 @@ from src.domain.models.MPortfolio import InvestmentPosition, InvestmentEvent
 FX_RATES = {'USD': 23.5, 'EUR': 25.2, 'GBP': 29.5, 'CZK': 1.0}
 
 # --- BANK PARSING CONFIG ---
-BANK_CONFIGS = {
-    'CS': {
-        'trigger': 'Own account name',
-        'date': 'Processing Date',
-        'desc': ['Partner Name', 'Note'],
-        'amt': 'Amount',
-        'own_acc': 'Own account number',
-        'target_acc': 'Partner account number'
-    },
-    'RB_CUR': {
-        'trigger': 'Datum provedení',
-        'date': 'Datum provedení',
-        'desc': ['Název protiúčtu', 'Zpráva'],
-        'amt': 'Zaúčtovaná částka',
-        'own_acc': 'Číslo účtu',
-        'target_acc': 'Číslo protiúčtu'
-    },
-}
+# Shared with the ingestion strategy: src/core/ingestion/bank_configs.py
+# 'Source' labels this parser wrote before the configs were shared; kept so
+# values already stored by earlier imports still match new ones
+SOURCE_LABELS = {'RB': 'RB_CUR'}
 
 # --- NUMERIC HELPERS ---
 
@@ -63,19 +52,12 @@ def _clean_numeric_portfolio(val) -> Decimal:
 def _detect_csv_df(file_obj) -> pd.DataFrame:
     """Helper to safely read CSVs with varying separators/encodings."""
     file_obj.seek(0)
-    # Try reading first few lines to detect separator
-    sample = file_obj.read(1024)
+    content = file_obj.read()
     file_obj.seek(0)
 
-    # Simple separator detection
-    sep = ';' if b';' in sample and sample.count(b';') > sample.count(b',') else ','
-
-    try:
-        return pd.read_csv(file_obj, sep=sep)
-    except Exception:
-        # Retry with different encoding if default fails
-        file_obj.seek(0)
-        return pd.read_csv(file_obj, sep=sep, encoding='cp1250')
+    # Sniffed from a sample; decode_text falls back to cp1250 if the rest is not in that encoding
+    sniffed = sniff(content)
+    return pd.read_csv(io.StringIO(decode_text(content, sniffed)), sep=sniffed.delimiter)
 
 def clean_currency(value):
     """Cleaner for Bank CSVs (legacy helper)."""
@@ -99,8 +81,7 @@ def clean_currency(value):
 def parse_portfolio_snapshot(file_obj, user_id) -> List[InvestmentPosition]:
     """Parses a snapshot CSV into InvestmentPosition objects."""
     try:
-        file_obj.seek(0)
-        df = pd.read_csv(file_obj)
+        df = _detect_csv_df(file_obj)
         positions = []
 
         # Column Mapping (Support for Snowball / Trading 212 exports)
@@ -213,57 +194,57 @@ def parse_portfolio_history(file_obj, user_id) -> List[InvestmentEvent]:
 
 # --- 4. BANK PARSERS (Existing) ---
 
-def parse_bank_content(content: str, filename: str) -> Optional[pd.DataFrame]:
-    sep = ';' if ';' in content.split('\n')[0] else ','
+def parse_bank_content(content: str, filename: str, sep: Optional[str] = None) -> Optional[pd.DataFrame]:
+    if sep is None:
+        sep = detect_delimiter(content[:SAMPLE_BYTES])
+    # The bank is known from the header line before the body is parsed
+    header = next(csv.reader([content.lstrip('\ufeff').split('\n', 1)[0].rstrip('\r')], delimiter=sep), [])
+    bank = detect_bank(header)
+    if bank is None:
+        return None
+    renames = column_renames(header, bank)
     try:
-        df = pd.read_csv(io.StringIO(content), sep=sep)
+        df = pd.read_csv(io.StringIO(content), sep=sep, usecols=lambda c: c in renames).rename(columns=renames)
     except Exception:
         return None
 
-    for bank, cfg in BANK_CONFIGS.items():
-        if cfg['trigger'] in df.columns:
-            std_df = pd.DataFrame()
-            std_df['Date'] = pd.to_datetime(df[cfg['date']], dayfirst=True)
-            std_df['Amount'] = df[cfg['amt']].apply(clean_currency)
-            std_df['Source_Account'] = df.get(cfg.get('own_acc'), '')
-            std_df['Target_Account'] = df.get(cfg.get('target_acc'), '')
-            std_df['Description'] = df[cfg['desc']].fillna('').agg(' '.join, axis=1)
-            std_df['Source'] = f"{bank} {filename}"
-            return std_df
-    return None
-
-
-def process_uploaded_files(uploaded_files) -> Generator[Tuple[str, Optional[pd.DataFrame], Optional[str]], None, None]:
-    encodings = ['utf-8', 'utf-16', 'windows-1250', 'cp1250']
-
+    cfg = BANK_CONFIGS[bank]
+    std_df = pd.DataFrame()
+    std_df['Date'] = pd.to_datetime(df[cfg['date']], dayfirst=True)
+    std_df['Amount'] = df[cfg['amt']].apply(clean_currency)
+    std_df['Source_Account'] = df.get(cfg.get('own_acc'), '')
+    std_df['Target_Account'] = df.get(cfg.get('target_acc'), '')
+    std_df['Description'] = df.reindex(columns=cfg['desc']).fillna('').astype(str).agg(' '.join, axis=1)
+    std_df['Source'] = f"{SOURCE_LABELS.get(bank, bank)} {filename}"
+    return std_df
+
+
+def process_uploaded_files(uploaded_files, parallel: Optional[bool] = None) -> Generator[Tuple[str, Optional[pd.DataFrame], Optional[str]], None, None]:
+    """
+    Yields (filename, DataFrame, error) per CSV, expanding ZIP archives.
+    Files are decoded and parsed on the ingestion process pool when the workload
+    warrants it; results are yielded in upload/archive order either way.
+    """
+    raw_files = []
     for file in uploaded_files:
         file.seek(0)
-        raw_data = file.read()
-
-        if file.name.lower().endswith('.zip'):
-            with zipfile.ZipFile(io.BytesIO(raw_data)) as z:
-                for z_name in z.namelist():
-                    if z_name.lower().endswith('.csv') and not z_name.startswith('__MACOSX'):
-                        with z.open(z_name) as f:
-                            yield _decode_and_parse(z_name, f.read(), encodings)
-        else:
-            yield _decode_and_parse(file.name, raw_data, encodings)
+        raw_files.append((file.name, file.read()))
 
+    entries = expand_archives(raw_files)
+    yield from map_ordered(
+        _decode_and_parse,
+        [name for name, _ in entries],
+        [content for _, content in entries],
+        parallel=should_parallelize(entries, parallel),
+    )
 
-def _decode_and_parse(filename, raw_bytes, encodings):
-    content = None
-    for enc in encodings:
-        try:
-            content = raw_bytes.decode(enc)
-            break
-        except UnicodeDecodeError:
-            continue
 
-    if content is None:
-        content = raw_bytes.decode('utf-8', errors='replace')
+def _decode_and_parse(filename, raw_bytes):
+    sniffed = sniff(raw_bytes)
+    content = decode_text(raw_bytes, sniffed)
 
     try:
-        df = parse_bank_content(content, filename)
+        df = parse_bank_content(content, filename, sep=sniffed.delimiter)
         if df is None:
             return filename, None, "Unknown format"
         return filename, df, None
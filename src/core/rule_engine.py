@@ -0,0 +1,90 @@
+# src/core/rule_engine.py
+"""
+Interface of the rule matchers behind RuleService, and the factory that picks
+one from CFO_RULE_ENGINE:
+
+    vector  VectorRuleEngine, sentence embeddings in Chroma (default)
+    tfidf   TfidfRuleEngine, character n-gram TF-IDF; no model download
+
+If the vector engine cannot be built because a package is missing (ImportError)
+or the model cannot be loaded, e.g. not downloadable on an air-gapped install
+(OSError), the TF-IDF engine is used instead. Any other error propagates.
+"""
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+RULE_ENGINE = os.environ.get("CFO_RULE_ENGINE", "vector")
+RULE_ENGINES = ("vector", "tfidf")
+
+RuleIndexRow = Tuple[str, str, dict]  # (rule id, pattern, metadata)
+RuleLoader = Callable[[UUID], List[RuleIndexRow]]  # all stored rules of one owner
+
+
+class RuleEngine(ABC):
+    """
+    Rule metadata is {"category", "type", "owner_id"}. Distances are cosine
+    distances (0 = identical), so RuleService thresholds apply to every engine.
+    """
+
+    @abstractmethod
+    def add_rule(self, rule_id: str, description: str, metadata: Dict):
+        pass
+
+    @abstractmethod
+    def add_rules(self, rule_ids: List[str], descriptions: List[str], metadatas: List[Dict]):
+        """Batch upsert by rule id."""
+        pass
+
+    @abstractmethod
+    def delete_rule(self, rule_id: str):
+        pass
+
+    @abstractmethod
+    def delete_owner_rules(self, owner: UUID):
+        pass
+
+    @abstractmethod
+    def find_candidates(self, descriptions: List[str], k: int = 3,
+                        owner: Optional[UUID] = None) -> List[List[Tuple[Dict, float]]]:
+        """
+        Per description, in input order, up to k (rule metadata, cosine distance)
+        pairs, closest first. owner=None searches all rules.
+        """
+        pass
+
+    def find_match(self, description: str, threshold: float = 0.3,
+                   owner: Optional[UUID] = None) -> Optional[Dict]:
+        """The closest rule's metadata if its distance is below threshold."""
+        return self.find_matches([description], threshold=threshold, owner=owner)[0]
+
+    def find_matches(self, descriptions: List[str], threshold: float = 0.3,
+                     owner: Optional[UUID] = None) -> List[Optional[Dict]]:
+        """Batched find_match: the closest rule's metadata or None per description."""
+        return [hits[0][0] if hits and hits[0][1] < threshold else None
+                for hits in self.find_candidates(descriptions, k=1, owner=owner)]
+
+
+def build_rule_engine(name: str = RULE_ENGINE, rule_loader: Optional[RuleLoader] = None) -> RuleEngine:
+    """
+    :param rule_loader: Lets the in-memory TF-IDF engine load an owner's rules
+                        from SQL on first use; the vector engine persists its own.
+    """
+    if name not in RULE_ENGINES:
+        raise ValueError(f"Unknown rule engine {name!r}; expected one of {', '.join(RULE_ENGINES)}")
+
+    if name == "vector":
+        try:
+            from src.core.vector_store import VectorRuleEngine
+            return VectorRuleEngine()
+        except (ImportError, OSError) as e:
+            logger.error("Vector rule engine unavailable (%s: %s); falling back to TF-IDF matching",
+                         type(e).__name__, e)
+
+    from src.core.tfidf_rule_engine import TfidfRuleEngine
+    return TfidfRuleEngine(rule_loader)
@@ -0,0 +1,230 @@
+# src/core/tfidf_rule_engine.py
+"""
+Rule matching by character n-gram TF-IDF, for installs without the embedding
+model. Nothing is downloaded and nothing is persisted: each owner's rules are
+loaded from SQL on first use (rule_loader) and held in memory, and reloaded
+when the owner's "rules" data version moves (a rule written by another session
+or process).
+
+Per owner, rule patterns form a sparse rules x n-grams matrix with L2-normalized
+rows, rebuilt lazily after changes. A batch of descriptions is vectorized with
+the same vocabulary and scored against every rule in one sparse matrix
+product; distance is 1 - cosine similarity, like the vector engine.
+"""
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from scipy import sparse
+
+from src.core import data_version
+from src.core.instrumentation import timed
+from src.core.rule_engine import RuleEngine, RuleLoader
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+NGRAM_RANGE = (2, 4)
+
+_WORD = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d+")
+
+
+def _normalize(text: str) -> str:
+    # Bank exports often drop diacritics, and reference numbers vary per payment
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _DIGITS.sub("0", text)
+
+
+def _ngrams(text: str) -> Iterator[str]:
+    """Character n-grams within space-padded words (sklearn's char_wb analyzer)."""
+    low, high = NGRAM_RANGE
+    for word in _WORD.findall(_normalize(text)):
+        padded = f" {word} "
+        if len(padded) < low:
+            yield padded
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+
+
+@dataclass(frozen=True)
+class _Index:
+    metadatas: List[dict]
+    vocabulary: Dict[str, int]
+    idf: np.ndarray
+    unseen_idf: float  # idf of an n-gram no rule contains
+    matrix: sparse.csr_matrix  # rules x vocabulary, rows L2-normalized
+
+    @classmethod
+    def build(cls, rules: List[Tuple[str, dict]]) -> "_Index":
+        vocabulary: Dict[str, int] = {}
+        rows, cols, counts = [], [], []
+        for row, (pattern, _) in enumerate(rules):
+            for gram, count in Counter(_ngrams(pattern)).items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(gram, len(vocabulary)))
+                counts.append(count)
+
+        n = len(rules)
+        cols = np.asarray(cols, dtype=np.int64)
+        # Smoothed idf, as in sklearn's TfidfVectorizer
+        df = np.bincount(cols, minlength=len(vocabulary))
+        idf = np.log((1 + n) / (1 + df)) + 1.0
+        data = np.asarray(counts, dtype=np.float64) * idf[cols]
+        matrix = sparse.csr_matrix((data, (rows, cols)), shape=(n, len(vocabulary)))
+        return cls([meta for _, meta in rules], vocabulary, idf, float(np.log(1 + n) + 1.0),
+                   _normalize_rows(matrix))
+
+    def vectorize(self, texts: List[str]) -> sparse.csr_matrix:
+        rows, cols, counts = [], [], []
+        # Unknown n-grams still count towards the norm, so "Albert xyz" is not a perfect "Albert" match
+        unseen = np.zeros(len(texts))
+        for row, text in enumerate(texts):
+            for gram, count in Counter(_ngrams(text)).items():
+                col = self.vocabulary.get(gram)
+                if col is None:
+                    unseen[row] += (count * self.unseen_idf) ** 2
+                else:
+                    rows.append(row)
+                    cols.append(col)
+                    counts.append(count)
+
+        cols = np.asarray(cols, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float64) * self.idf[cols]
+        query = sparse.csr_matrix((data, (rows, cols)), shape=(len(texts), len(self.vocabulary)))
+        return _normalize_rows(query, extra=unseen)
+
+
+def _normalize_rows(matrix: sparse.csr_matrix, extra: Optional[np.ndarray] = None) -> sparse.csr_matrix:
+    squared = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+    if extra is not None:
+        squared = squared + extra
+    norms = np.sqrt(squared)
+    return sparse.diags(1.0 / np.clip(norms, 1e-12, None)) @ matrix
+
+
+class TfidfRuleEngine(RuleEngine):
+    def __init__(self, rule_loader: Optional[RuleLoader] = None):
+        """
+        :param rule_loader: Returns an owner's stored rules; called on first use of
+                            an owner and again after its rules data version moved.
+                            Without it the engine only knows rules added to it, and
+                            owner=None lookups search only owners already loaded.
+        """
+        self.rule_loader = rule_loader
+        self._lock = threading.RLock()
+        self._rules: Dict[str, Dict[str, Tuple[str, dict]]] = {}  # owner -> rule id -> (pattern, metadata)
+        self._owner_of: Dict[str, str] = {}  # rule id -> owner
+        self._loaded: Dict[str, int] = {}  # owner -> rules data version its rules were loaded at
+        self._indexes: Dict[Optional[str], _Index] = {}  # built lazily; None = all owners
+
+    def _rules_version(self, owner: str) -> int:
+        # Without a loader there is nothing to reload from
+        if self.rule_loader is None:
+            return 0
+        return data_version.get(UUID(owner), data_version.RULES)
+
+    def _ensure_loaded(self, owner: str):
+        version = self._rules_version(owner)
+        if self._loaded.get(owner) == version:
+            return
+        # First use, or rules were written since (RuleService bumps the scope)
+        self._drop_owner(owner)
+        self._loaded[owner] = version
+        if self.rule_loader is None:
+            return
+        rows = self.rule_loader(UUID(owner))
+        for rule_id, pattern, metadata in rows:
+            self._put(rule_id, pattern, metadata)
+        logger.debug("Loaded %d rule(s) for %s at version %d", len(rows), owner, version)
+
+    def _drop_owner(self, owner: str):
+        for rule_id in self._rules.pop(owner, {}):
+            self._owner_of.pop(rule_id, None)
+        self._indexes.pop(owner, None)
+        self._indexes.pop(None, None)
+
+    def _put(self, rule_id: str, pattern: str, metadata: dict):
+        owner = str(metadata.get("owner_id"))
+        previous = self._owner_of.get(rule_id)
+        if previous is not None and previous != owner:
+            self._rules[previous].pop(rule_id, None)
+            self._indexes.pop(previous, None)
+        self._rules.setdefault(owner, {})[rule_id] = (pattern, metadata)
+        self._owner_of[rule_id] = owner
+        self._indexes.pop(owner, None)
+        self._indexes.pop(None, None)
+
+    @timed()
+    def add_rule(self, rule_id: str, description: str, metadata: Dict):
+        self.add_rules([rule_id], [description], [metadata])
+
+    @timed()
+    def add_rules(self, rule_ids: List[str], descriptions: List[str], metadatas: List[Dict]):
+        with self._lock:
+            for rule_id, description, metadata in zip(rule_ids, descriptions, metadatas):
+                self._ensure_loaded(str(metadata.get("owner_id")))
+                self._put(rule_id, description, metadata)
+
+    @timed()
+    def delete_rule(self, rule_id: str):
+        with self._lock:
+            owner = self._owner_of.pop(rule_id, None)
+            if owner is not None:
+                self._rules[owner].pop(rule_id, None)
+                self._indexes.pop(owner, None)
+                self._indexes.pop(None, None)
+
+    @timed()
+    def delete_owner_rules(self, owner: UUID):
+        key = str(owner)
+        with self._lock:
+            self._drop_owner(key)
+            # Nothing left to load: the caller is about to re-add what it wants
+            self._loaded[key] = self._rules_version(key)
+
+    def _index(self, owner: Optional[UUID]) -> Optional[_Index]:
+        key = str(owner) if owner is not None else None
+        with self._lock:
+            if key is not None:
+                self._ensure_loaded(key)
+            index = self._indexes.get(key)
+            if index is None:
+                if key is None:
+                    rules = [rule for owner_rules in self._rules.values() for rule in owner_rules.values()]
+                else:
+                    rules = list(self._rules.get(key, {}).values())
+                if not rules:
+                    return None
+                index = self._indexes[key] = _Index.build(rules)
+            return index
+
+    @timed()
+    def find_candidates(self, descriptions: List[str], k: int = 3,
+                        owner: Optional[UUID] = None) -> List[List[Tuple[Dict, float]]]:
+        """
+        Batched top-k lookup: all descriptions are scored in one sparse product.
+        Rules sharing no n-gram with a description are never returned.
+        """
+        index = self._index(owner)
+        if index is None:
+            return [[] for _ in descriptions]
+
+        scores = (index.vectorize(list(descriptions)) @ index.matrix.T).tocsr()
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            values, columns = scores.data[start:end], scores.indices[start:end]
+            top = np.argsort(-values, kind="stable")
+            if len(top) > k:
+                top = top[:k]
+            results.append([(index.metadatas[columns[i]], max(0.0, 1.0 - float(values[i]))) for i in top])
+        return results
@@ -0,0 +1,92 @@
+# src/core/transfers.py
+"""
+Pairing of the two legs of a transfer: an outflow of X and an inflow of X
+that share a key (e.g. the directed pair of accounts) and lie within a few
+days of each other.
+"""
+import os
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.core.accounts import account_numbers, canonical_accounts
+
+# Days the receiving bank may book a transfer after the sending bank
+TRANSFER_WINDOW_DAYS = int(os.environ.get("CFO_TRANSFER_WINDOW_DAYS", "3"))
+
+
+def pair_legs(keys: np.ndarray, amounts_minor: np.ndarray, dates: np.ndarray,
+              window_days: int = TRANSFER_WINDOW_DAYS,
+              compatible: Optional[Callable[[int, int], bool]] = None) -> np.ndarray:
+    """
+    Index of each leg's partner, -1 where unpaired. Legs are grouped by
+    (key, absolute amount) and sorted by date (O(n log n)); within a group each
+    leg pairs with the earliest unpaired opposite leg at most window_days older
+    for which compatible(outflow, inflow) holds, if given.
+    """
+    n = len(amounts_minor)
+    partner = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return partner
+
+    amounts_minor = np.asarray(amounts_minor, dtype=np.int64)
+    days = pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]").astype(np.int64)
+    key_codes = pd.factorize(pd.Series(list(keys), dtype=object))[0]
+    magnitude = np.abs(amounts_minor)
+    order = np.lexsort((days, magnitude, key_codes))
+
+    sorted_keys, sorted_magnitude = key_codes[order], magnitude[order]
+    new_group = np.r_[True, (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_magnitude[1:] != sorted_magnitude[:-1])]
+    starts = np.flatnonzero(new_group)
+    ends = np.r_[starts[1:], n]
+    # Most amounts occur once; only groups with two or more legs reach the Python loop
+    multi = ends - starts >= 2
+    order, amounts, day_of = order.tolist(), amounts_minor.tolist(), days.tolist()
+    for start, end in zip(starts[multi].tolist(), ends[multi].tolist()):
+        # Unpaired outflows / inflows seen so far in this group, oldest first
+        pending = {True: deque(), False: deque()}
+        for i in order[start:end]:
+            amount, day = amounts[i], day_of[i]
+            if amount == 0:
+                continue
+            opposite = pending[amount > 0]
+            while opposite and day_of[opposite[0]] < day - window_days:
+                opposite.popleft()
+            j = next((j for j in opposite if compatible is None
+                      or (compatible(j, i) if amount > 0 else compatible(i, j))), None)
+            if j is not None:
+                opposite.remove(j)
+                partner[i], partner[j] = j, i
+            else:
+                pending[amount < 0].append(i)
+    return partner
+
+
+def pair_account_legs(sources, targets, amounts_minor: np.ndarray, dates,
+                      window_days: int = TRANSFER_WINDOW_DAYS) -> np.ndarray:
+    """
+    pair_legs for legs from different banks' exports, matched on amount and
+    date. Guards against coincidental equal amounts (a payment on one account
+    and an unrelated refund of the same amount on another):
+      * the legs were booked on two different accounts (source_account), both known;
+      * at least one leg names the other leg's account as its counterparty;
+      * a leg naming any other counterparty is never paired.
+    A missing counterparty is not a wildcard. Accounts compare by number, so a
+    missing or differently written bank code does not prevent a match.
+    """
+    amounts_minor = np.asarray(amounts_minor, dtype=np.int64)
+    own = account_numbers(canonical_accounts(sources)).tolist()
+    other = account_numbers(canonical_accounts(targets)).tolist()
+
+    def compatible(outflow: int, inflow: int) -> bool:
+        if own[outflow] == "" or own[inflow] == "" or own[outflow] == own[inflow]:
+            return False
+        names_inflow, names_outflow = other[outflow] == own[inflow], other[inflow] == own[outflow]
+        return ((names_inflow or names_outflow)
+                and other[outflow] in ("", own[inflow])
+                and other[inflow] in ("", own[outflow]))
+
+    return pair_legs(np.zeros(len(amounts_minor), dtype=np.int64), amounts_minor, dates,
+                     window_days, compatible)
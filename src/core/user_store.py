@@ -0,0 +1,106 @@
+# src/core/user_store.py
+"""
+In-process index over the users JSON file.
+
+The file is parsed once and re-read only when its mtime/size changes (another
+process wrote it). Writes happen only when a record actually changes, and go
+through a temp file + os.replace so readers never see a partial file.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_stores: Dict[Path, "JsonUserStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class JsonUserStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._users: Dict[str, dict] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self):
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        if stamp is None:
+            self._users = {}
+        else:
+            try:
+                self._users = json.loads(self.path.read_text())
+                logger.debug("Loaded %d user(s) from %s", len(self._users), self.path)
+            except Exception as e:
+                # Keep serving the last good index rather than locking everybody out
+                logger.exception("Failed to load users file: %s", e)
+                return
+        self._stamp = stamp
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self._users, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._stamp = self._file_stamp()
+        logger.debug("Saved users file with %d entries", len(self._users))
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            record = self._users.get(key)
+            return dict(record) if record is not None else None
+
+    def apply(self, upserts: Optional[Dict[str, dict]] = None, deletes: Iterable[str] = ()) -> bool:
+        """
+        Applies record changes atomically (one file write, or none if nothing changed).
+        Returns True if the file was written.
+        """
+        with self._lock:
+            self._refresh()
+            changed = False
+            for key, record in (upserts or {}).items():
+                if self._users.get(key) != record:
+                    self._users[key] = dict(record)
+                    changed = True
+            for key in deletes:
+                if self._users.pop(key, None) is not None:
+                    changed = True
+            if changed:
+                self._write()
+            return changed
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._users)
+
+
+def get_user_store(path: Path) -> JsonUserStore:
+    """One shared store per file, so every AuthService instance uses the same index."""
+    key = Path(path).resolve()
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = JsonUserStore(key)
+        return _stores[key]
@@ -1,30 +1,52 @@
 # src/core/vector_store.py
-import chromadb
-from chromadb.utils import embedding_functions
-from typing import Optional, Dict
+import logging
+from typing import Optional, Dict, List, Tuple
+from uuid import UUID
+
+from src.core.embedding_cache import CACHE_ENABLED, CachedEmbeddingFunction
+from src.core.instrumentation import timed
+from src.core.rule_engine import RuleEngine
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 # We use a small, fast, local model. No data leaves the machine.
 # 'all-MiniLM-L6-v2' is standard for this (80MB download once).
 EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+COLLECTION_NAME = "transaction_rules"
 
 
-class VectorRuleEngine:
-    def __init__(self, persist_path=".data/chroma_db"):
+class VectorRuleEngine(RuleEngine):
+    def __init__(self, persist_path=".data/chroma_db", backend: Optional[str] = None):
+        # chromadb pulls in sentence-transformers/torch; load it only when an engine is built
+        import chromadb
+        from src.core import embedding_backends
+
         self.client = chromadb.PersistentClient(path=persist_path)
 
-        # Use default Sentence Transformer (local)
-        self.ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=EMBEDDING_MODEL_NAME
-        )
+        # Local model; the backend (full precision or int8) comes from CFO_EMBEDDING_BACKEND
+        backend = backend or embedding_backends.BACKEND
+        self.ef = embedding_backends.build_embedding_function(EMBEDDING_MODEL_NAME, backend)
+        if CACHE_ENABLED:
+            # Descriptions seen before skip model inference entirely
+            self.ef = CachedEmbeddingFunction(self.ef, embedding_backends.model_id(EMBEDDING_MODEL_NAME, backend))
+
+        # Vectors from different backends don't mix: each non-default one has its own collection
+        name = COLLECTION_NAME
+        if backend != embedding_backends.DEFAULT_BACKEND:
+            name = f"{COLLECTION_NAME}_{backend}"
 
         # Get or create the collection for categorization rules
         self.collection = self.client.get_or_create_collection(
-            name="transaction_rules",
+            name=name,
             embedding_function=self.ef,
             metadata={"hnsw:space": "cosine"}  # Cosine similarity is best for text matching
         )
+        if self.collection.count() == 0 and name != COLLECTION_NAME:
+            logger.warning("Rule collection %s is empty; run RuleService.rebuild_vector_index per user", name)
 
+    @timed()
     def add_rule(self, rule_id: str, description: str, metadata: Dict):
         """
         Learns a new rule.
@@ -37,9 +59,31 @@ class VectorRuleEngine:
             metadatas=[metadata]
         )
 
-    def find_match(self, description: str, threshold: float = 0.3) -> Optional[Dict]:
+    @timed()
+    def add_rules(self, rule_ids: List[str], descriptions: List[str], metadatas: List[Dict]):
+        """Batch upsert: the embedding function sees the whole batch in one call."""
+        self.collection.upsert(
+            ids=rule_ids,
+            documents=descriptions,
+            metadatas=metadatas
+        )
+
+    @timed()
+    def delete_owner_rules(self, owner: UUID):
+        self.collection.delete(where=self._owner_filter(owner))
+
+    @staticmethod
+    def _owner_filter(owner: Optional[UUID]) -> Optional[Dict]:
+        # Every rule carries owner_id metadata; Chroma pre-filters on it before the
+        # nearest-neighbour search, so a lookup only considers that user's rules.
+        return {"owner_id": str(owner)} if owner is not None else None
+
+    @timed()
+    def find_match(self, description: str, threshold: float = 0.3,
+                   owner: Optional[UUID] = None) -> Optional[Dict]:
         """
         Finds the closest matching rule.
+        :param owner: Only consider this user's rules. None searches all rules.
         :param threshold: Maximum cosine distance allowed for a match. Chroma returns
                           a distance where 0 = exact match and smaller values mean
                           closer matches, so lower thresholds are stricter. A value
@@ -48,7 +92,8 @@ class VectorRuleEngine:
         """
         results = self.collection.query(
             query_texts=[description],
-            n_results=1
+            n_results=1,
+            where=self._owner_filter(owner)
         )
 
         if not results['ids'] or not results['ids'][0]:
@@ -61,5 +106,24 @@ class VectorRuleEngine:
 
         return None
 
+    @timed()
+    def find_candidates(self, descriptions: List[str], k: int = 3,
+                        owner: Optional[UUID] = None) -> List[List[Tuple[Dict, float]]]:
+        """
+        Batched top-k lookup: one query (one embedding batch) for all descriptions.
+        Returns, per description in input order, up to k (rule metadata, cosine
+        distance) pairs, closest first.
+        """
+        if not descriptions:
+            return []
+        results = self.collection.query(
+            query_texts=list(descriptions),
+            n_results=k,
+            where=self._owner_filter(owner)
+        )
+        return [list(zip(metadatas, distances))
+                for metadatas, distances in zip(results['metadatas'], results['distances'])]
+
+    @timed()
     def delete_rule(self, rule_id: str):
         self.collection.delete(ids=[rule_id])
\ No newline at end of file
@@ -33,6 +33,13 @@ class TransactionType(str, Enum):
     TRANSFER = "Transfer"
 
 
+class ImportJobStatus(str, Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+
 class ExpenseType(Enum):
     FIXED = "Fixed"
     VARIABLE = "Variable"
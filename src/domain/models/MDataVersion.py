@@ -0,0 +1,10 @@
+# src/domain/models/MDataVersion.py
+from sqlmodel import SQLModel, Field
+
+
+class DataVersion(SQLModel, table=True):
+    """Change counter of one user's data in one scope (see src/core/data_version.py)."""
+    __table_args__ = {'extend_existing': True}
+    owner: str = Field(primary_key=True)
+    scope: str = Field(primary_key=True)  # data_version.ALL for the per-user total
+    version: int = 0
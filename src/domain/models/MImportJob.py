@@ -0,0 +1,35 @@
+# src/domain/models/MImportJob.py
+from typing import Optional, List
+from uuid import UUID, uuid4
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON
+from src.domain.enums import ImportJobStatus
+
+
+class ImportJob(SQLModel, table=True):
+    """A background bank-statement import (one upload click = one job = one batch)."""
+    __table_args__ = {'extend_existing': True}
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    owner: UUID = Field(index=True)
+    batch_id: str
+    status: ImportJobStatus = Field(default=ImportJobStatus.QUEUED, index=True)
+
+    file_names: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    files_total: int = 0
+    files_done: int = 0
+    imported_count: int = 0
+    duplicate_count: int = 0
+    errors: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+
+    created_at: datetime = Field(default_factory=datetime.now, index=True)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def progress(self) -> float:
+        return self.files_done / self.files_total if self.files_total else 0.0
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (ImportJobStatus.QUEUED, ImportJobStatus.RUNNING)
@@ -6,11 +6,15 @@ from datetime import date as dt_date
 from decimal import Decimal
 from sqlmodel import SQLModel, Field
 from src.domain.enums import TransactionType, Currency
-from sqlalchemy import Numeric, Column, JSON
+from sqlalchemy import Numeric, Column, JSON, Index
 
 
 class Transaction(SQLModel, table=True):
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Review queue: one owner's suggestions in confidence order, as a range scan
+        Index("ix_transaction_owner_confidence", "owner", "confidence"),
+        {'extend_existing': True},
+    )
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     date: dt_date = Field(index=True)
     description: str
@@ -25,6 +29,16 @@ class Transaction(SQLModel, table=True):
     target_account: Optional[str] = None
     batch_id: str = Field(index=True)
     notes: Optional[str] = None
+    # Best rule match that was too far to apply automatically, left for review
+    suggested_category: Optional[str] = None
+    # Type of the suggested rule, applied with the category when the suggestion is accepted
+    suggested_type: Optional[TransactionType] = None
+    # Last suggestion the user dismissed; recategorize() does not suggest it again
+    dismissed_category: Optional[str] = None
+    # 1 - cosine distance of the best rule match (None when no rule was consulted)
+    confidence: Optional[float] = None
+    # Shared by the two legs of a transfer between the owner's own accounts
+    transfer_id: Optional[UUID] = Field(default=None, index=True)
     tags: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
 
     @property
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
 from uuid import UUID
 from src.domain.models.MAsset import Asset
+from src.domain.enums import AssetCategory
 
 class BaseRepository(ABC):
     """Generic repository interface."""
@@ -14,13 +16,38 @@ class AssetRepository(BaseRepository):
         """Retrieve all assets for a specific user."""
         pass
 
+    @abstractmethod
+    def get_value_totals(self, user_id: UUID) -> Tuple[int, int]:
+        """(sum of non-negative values, sum of negative values) in minor units."""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, user_id: UUID, asset_id: UUID) -> Optional[Asset]:
+        """Retrieve one asset, only if it belongs to the user."""
+        pass
+
+    @abstractmethod
+    def update_fields(self, user_id: UUID, asset_id: UUID, **fields) -> bool:
+        """Partial update of the user's asset. Returns False if no such asset."""
+        pass
+
+    @abstractmethod
+    def get_by_category(self, user_id: Optional[UUID], category: AssetCategory) -> List[Asset]:
+        """Retrieve one category of assets for a user, or for all users when user_id is None."""
+        pass
+
+    @abstractmethod
+    def update_values(self, user_id: UUID, values: Dict[UUID, Decimal]) -> None:
+        """Bulk update of the user's asset `value`s, keyed by asset id."""
+        pass
+
     @abstractmethod
     def save(self, asset: Asset) -> None:
         """Save or update a single asset."""
         pass
 
     @abstractmethod
-    def delete(self, asset_id: UUID) -> None:
+    def delete(self, user_id: UUID, asset_id: UUID) -> None:
         """Remove an asset."""
         pass
 
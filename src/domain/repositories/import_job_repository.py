@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+from src.domain.models.MImportJob import ImportJob
+
+
+class ImportJobRepository(ABC):
+    @abstractmethod
+    def save(self, job: ImportJob) -> None:
+        """Insert or update a job row."""
+        pass
+
+    @abstractmethod
+    def get(self, job_id: UUID, user_id: UUID) -> Optional[ImportJob]:
+        """Fetch one job, scoped to its owner."""
+        pass
+
+    @abstractmethod
+    def get_recent(self, user_id: UUID, limit: int = 10) -> List[ImportJob]:
+        """Latest jobs for a user, newest first."""
+        pass
+
+    @abstractmethod
+    def fail_unfinished(self, reason: str) -> int:
+        """Mark queued/running jobs as failed (e.g. after a restart). Returns the count."""
+        pass
@@ -9,10 +9,15 @@ class LiabilityRepository(ABC):
     def get_all(self, user_id: UUID) -> List[Liability]:
         pass
 
+    @abstractmethod
+    def get_total_amount(self, user_id: UUID) -> int:
+        """Sum of outstanding amounts in minor units."""
+        pass
+
     @abstractmethod
     def save(self, liability: Liability) -> None:
         pass
 
     @abstractmethod
-    def delete(self, liability_id: UUID) -> None:
+    def delete(self, user_id: UUID, liability_id: UUID) -> None:
         pass
\ No newline at end of file
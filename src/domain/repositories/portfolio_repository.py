@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 from uuid import UUID
+import pandas as pd
 from src.domain.models.MPortfolio import InvestmentPosition, InvestmentEvent
 
 
@@ -15,6 +16,16 @@ class PortfolioRepository(ABC):
         """Get transaction log."""
         pass
 
+    @abstractmethod
+    def get_snapshot_totals(self, user_id: UUID) -> Tuple[int, int, int]:
+        """(market value, cost basis, projected annual income) in minor units."""
+        pass
+
+    @abstractmethod
+    def get_history_frame(self, user_id: UUID) -> pd.DataFrame:
+        """Columns date, event_type, amount_minor (int64), oldest first."""
+        pass
+
     @abstractmethod
     def save_snapshot_file(self, file_obj) -> None:
         """Save raw snapshot CSV."""
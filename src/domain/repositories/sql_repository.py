@@ -1,9 +1,14 @@
 # src/domain/repositories/sql_repository.py
-from typing import List
+from typing import Dict, List, Optional, Sequence, Tuple
+from decimal import Decimal
 from uuid import UUID
+from datetime import date, datetime
 import pandas as pd
-from sqlmodel import Session, select, delete
-from src.core.database import engine
+from sqlalchemy import case, func
+from sqlmodel import Session, select, delete, update
+from src.core.database import get_engine, shard_owners
+from src.core.instrumentation import timed
+from src.core.money import minor_sql
 
 # Models
 from src.domain.models.MAsset import Asset
@@ -11,12 +16,17 @@ from src.domain.models.MTax import TaxLot
 from src.domain.models.MTransaction import Transaction
 from src.domain.models.MPortfolio import InvestmentPosition, InvestmentEvent
 from src.domain.models.MLiability import Liability
+from src.domain.models.MImportJob import ImportJob
+from src.domain.enums import AssetCategory, ImportJobStatus, TransactionType, TransferCategory
 
 # Repository Interfaces
 from src.domain.repositories.asset_repository import AssetRepository
-from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.repositories.transaction_repository import (
+    TransactionRepository, CategorizationRow, CategoryChange, TransferLeg, TransferLink
+)
 from src.domain.repositories.portfolio_repository import PortfolioRepository
 from src.domain.repositories.liability_repository import LiabilityRepository
+from src.domain.repositories.import_job_repository import ImportJobRepository
 
 # Auth service for file operations
 from src.application.auth_service import AuthService
@@ -25,48 +35,129 @@ import logging
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+
+def _engines_for(user_id: Optional[UUID]):
+    """The owner's engine, or every shard's engine when user_id is None (cross-user jobs)."""
+    if user_id is not None:
+        return [get_engine(user_id)]
+    owners = shard_owners()
+    return [get_engine(owner) for owner in owners] if owners else [get_engine()]
+
+
+def _sum_minor(column, condition=None):
+    """SUM of a money column in minor units, optionally only where `condition` holds."""
+    minor = minor_sql(column)
+    if condition is not None:
+        minor = case((condition, minor), else_=0)
+    return func.coalesce(func.sum(minor), 0)
+
+
+def _group_by_owner(items) -> Dict[UUID, list]:
+    groups: Dict[UUID, list] = {}
+    for item in items:
+        groups.setdefault(item.owner, []).append(item)
+    return groups
+
+
 # --- ASSET REPO ---
 class SqlAssetRepository(AssetRepository):
+    @timed()
     def get_all(self, user_id: UUID) -> List[Asset]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             statement = select(Asset).where(Asset.owner == user_id)
             return list(session.exec(statement).all())
 
+    @timed()
+    def get_value_totals(self, user_id: UUID) -> Tuple[int, int]:
+        with Session(get_engine(user_id)) as session:
+            statement = select(_sum_minor(Asset.value, Asset.value >= 0),
+                               _sum_minor(Asset.value, Asset.value < 0)).where(Asset.owner == user_id)
+            positive, negative = session.exec(statement).one()
+            return int(positive), int(negative)
+
+    @timed()
+    def get_by_id(self, user_id: UUID, asset_id: UUID) -> Optional[Asset]:
+        with Session(get_engine(user_id)) as session:
+            statement = select(Asset).where(Asset.id == asset_id).where(Asset.owner == user_id)
+            return session.exec(statement).first()
+
+    @timed()
+    def update_fields(self, user_id: UUID, asset_id: UUID, **fields) -> bool:
+        # Single UPDATE; the owner filter doubles as the authorization check
+        with Session(get_engine(user_id)) as session:
+            statement = update(Asset).where(Asset.id == asset_id).where(Asset.owner == user_id).values(**fields)
+            result = session.exec(statement)
+            session.commit()
+            return result.rowcount > 0
+
+    @timed()
+    def get_by_category(self, user_id: Optional[UUID], category: AssetCategory) -> List[Asset]:
+        statement = select(Asset).where(Asset.category == category)
+        if user_id is not None:
+            statement = statement.where(Asset.owner == user_id)
+        results = []
+        for eng in _engines_for(user_id):
+            with Session(eng) as session:
+                results.extend(session.exec(statement).all())
+        return results
+
+    @timed()
+    def update_values(self, user_id: UUID, values: Dict[UUID, Decimal]) -> None:
+        if not values:
+            return
+        # ORM bulk UPDATE by primary key: one executemany
+        with Session(get_engine(user_id)) as session:
+            session.execute(update(Asset), [{"id": asset_id, "value": value} for asset_id, value in values.items()])
+            session.commit()
+
+    @timed()
     def save(self, asset: Asset) -> None:
-        with Session(engine) as session:
+        with Session(get_engine(asset.owner)) as session:
             session.merge(asset)
             session.commit()
 
-    def delete(self, asset_id: UUID) -> None:
-        with Session(engine) as session:
-            statement = select(Asset).where(Asset.id == asset_id)
+    @timed()
+    def delete(self, user_id: UUID, asset_id: UUID) -> None:
+        with Session(get_engine(user_id)) as session:
+            statement = select(Asset).where(Asset.id == asset_id).where(Asset.owner == user_id)
             obj = session.exec(statement).first()
             if obj:
                 session.delete(obj)
                 session.commit()
 
+    @timed()
     def save_all(self, assets: List[Asset]) -> None:
-        with Session(engine) as session:
-            for asset in assets:
-                session.merge(asset)
-            session.commit()
+        for owner, owned in _group_by_owner(assets).items():
+            with Session(get_engine(owner)) as session:
+                for asset in owned:
+                    session.merge(asset)
+                session.commit()
 
 
 # --- LIABILITY REPO (NEW) ---
 class SqlLiabilityRepository(LiabilityRepository):
+    @timed()
     def get_all(self, user_id: UUID) -> List[Liability]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             statement = select(Liability).where(Liability.owner == user_id)
             return list(session.exec(statement).all())
 
+    @timed()
+    def get_total_amount(self, user_id: UUID) -> int:
+        with Session(get_engine(user_id)) as session:
+            statement = select(_sum_minor(Liability.amount)).where(Liability.owner == user_id)
+            return int(session.exec(statement).one())
+
+    @timed()
     def save(self, liability: Liability) -> None:
-        with Session(engine) as session:
+        with Session(get_engine(liability.owner)) as session:
             session.merge(liability)
             session.commit()
 
-    def delete(self, liability_id: UUID) -> None:
-        with Session(engine) as session:
-            statement = select(Liability).where(Liability.id == liability_id)
+    @timed()
+    def delete(self, user_id: UUID, liability_id: UUID) -> None:
+        with Session(get_engine(user_id)) as session:
+            statement = select(Liability).where(Liability.id == liability_id).where(Liability.owner == user_id)
             obj = session.exec(statement).first()
             if obj:
                 session.delete(obj)
@@ -75,11 +166,13 @@ class SqlLiabilityRepository(LiabilityRepository):
 
 # --- TRANSACTION REPO ---
 class SqlTransactionRepository(TransactionRepository):
+    @timed()
     def get_all(self, user_id: UUID) -> List[Transaction]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             statement = select(Transaction).where(Transaction.owner == user_id).order_by(Transaction.date.desc())
             return list(session.exec(statement).all())
 
+    @timed()
     def get_as_dataframe(self, user_id: UUID) -> pd.DataFrame:
         txs = self.get_all(user_id)
         if not txs: return pd.DataFrame()
@@ -92,14 +185,135 @@ class SqlTransactionRepository(TransactionRepository):
 
         return df
 
-    def save_bulk(self, transactions: List[Transaction]) -> None:
-        with Session(engine) as session:
-            for t in transactions:
-                session.add(t)
+    LEDGER_COLUMNS = ["id", "date", "description", "amount_minor", "currency", "transaction_type", "category",
+                      "source_account", "target_account", "batch_id", "notes", "tags",
+                      "suggested_category", "confidence"]
+
+    @timed()
+    def get_ledger_frame(self, user_id: UUID) -> pd.DataFrame:
+        columns = [minor_sql(Transaction.amount) if c == "amount_minor" else getattr(Transaction, c)
+                   for c in self.LEDGER_COLUMNS]
+        with Session(get_engine(user_id)) as session:
+            statement = select(*columns).where(Transaction.owner == user_id).order_by(Transaction.date.desc())
+            rows = session.exec(statement).all()
+        df = pd.DataFrame.from_records(rows, columns=self.LEDGER_COLUMNS)
+        df["amount_minor"] = df["amount_minor"].astype("int64")
+        return df
+
+    @timed()
+    def get_cashflow_totals(self, user_id: UUID) -> Tuple[int, int, int]:
+        with Session(get_engine(user_id)) as session:
+            # Transfers between own accounts move money but are neither income nor spend
+            external = Transaction.category != TransferCategory.INTERNAL.value
+            statement = select(_sum_minor(Transaction.amount),
+                               _sum_minor(Transaction.amount, external & (Transaction.amount > 0)),
+                               _sum_minor(Transaction.amount, external & (Transaction.amount < 0))
+                               ).where(Transaction.owner == user_id)
+            balance, income, spend = session.exec(statement).one()
+            return int(balance), int(income), int(spend)
+
+    @timed()
+    def get_categorization_page(self, user_id: UUID, after_id: Optional[UUID], limit: int,
+                                since: Optional[date] = None) -> List[CategorizationRow]:
+        statement = select(Transaction.id, Transaction.description, minor_sql(Transaction.amount),
+                           Transaction.category, Transaction.transaction_type, Transaction.batch_id,
+                           Transaction.suggested_category, Transaction.suggested_type, Transaction.confidence,
+                           Transaction.dismissed_category
+                           ).where(Transaction.owner == user_id)
+        if after_id is not None:
+            statement = statement.where(Transaction.id > after_id)
+        if since is not None:
+            statement = statement.where(Transaction.date >= since)
+        with Session(get_engine(user_id)) as session:
+            rows = session.exec(statement.order_by(Transaction.id).limit(limit)).all()
+            return [CategorizationRow(*row) for row in rows]
+
+    @timed()
+    def update_categories(self, user_id: UUID, changes: List[CategoryChange]) -> None:
+        if not changes:
+            return
+        # ORM bulk UPDATE by primary key: one executemany
+        with Session(get_engine(user_id)) as session:
+            session.execute(update(Transaction), [change._asdict() for change in changes])
             session.commit()
 
+    REVIEW_COLUMNS = ["id", "date", "description", "amount_minor", "category", "suggested_category", "confidence"]
+
+    @timed()
+    def get_review_queue(self, user_id: UUID, max_confidence: float, limit: int) -> pd.DataFrame:
+        columns = [minor_sql(Transaction.amount) if c == "amount_minor" else getattr(Transaction, c)
+                   for c in self.REVIEW_COLUMNS]
+        # Range scan on the confidence index; only uncertain rows are read
+        statement = (select(*columns)
+                     .where(Transaction.owner == user_id)
+                     .where(Transaction.confidence < max_confidence)
+                     .where(Transaction.suggested_category.is_not(None))
+                     .order_by(Transaction.confidence).limit(limit))
+        with Session(get_engine(user_id)) as session:
+            rows = session.exec(statement).all()
+        df = pd.DataFrame.from_records(rows, columns=self.REVIEW_COLUMNS)
+        df["amount_minor"] = df["amount_minor"].astype("int64")
+        return df
+
+    @timed()
+    def resolve_suggestions(self, user_id: UUID, ids: Sequence[UUID], accept: bool) -> int:
+        if not ids:
+            return 0
+        values = {"suggested_category": None, "suggested_type": None}
+        if accept:
+            values["category"] = Transaction.suggested_category
+            # Rows suggested before suggested_type existed keep their type
+            values["transaction_type"] = func.coalesce(Transaction.suggested_type, Transaction.transaction_type)
+        else:
+            values["dismissed_category"] = Transaction.suggested_category
+        statement = (update(Transaction)
+                     .where(Transaction.owner == user_id)
+                     .where(Transaction.id.in_(list(ids)))
+                     .where(Transaction.suggested_category.is_not(None))
+                     .values(**values))
+        with Session(get_engine(user_id)) as session:
+            result = session.exec(statement)
+            session.commit()
+            return result.rowcount
+
+    @timed()
+    def get_transfer_candidates(self, user_id: UUID, categories: Sequence[str],
+                                since: Optional[date] = None) -> List[TransferLeg]:
+        statement = select(Transaction.id, Transaction.date, minor_sql(Transaction.amount),
+                           Transaction.source_account, Transaction.target_account
+                           ).where(Transaction.owner == user_id
+                           ).where(Transaction.transfer_id.is_(None)
+                           ).where(Transaction.category.in_(list(categories))
+                           ).where(Transaction.amount != 0)
+        if since is not None:
+            statement = statement.where(Transaction.date >= since)
+        with Session(get_engine(user_id)) as session:
+            return [TransferLeg(*row) for row in session.exec(statement).all()]
+
+    @timed()
+    def link_transfers(self, user_id: UUID, links: List[TransferLink]) -> None:
+        if not links:
+            return
+        with Session(get_engine(user_id)) as session:
+            session.execute(update(Transaction), [
+                {"id": link.id, "transfer_id": link.transfer_id, "category": TransferCategory.INTERNAL.value,
+                 "transaction_type": TransactionType.TRANSFER, "suggested_category": None, "suggested_type": None,
+                 "confidence": None}
+                for link in links
+            ])
+            session.commit()
+
+    @timed()
+    def save_bulk(self, transactions: List[Transaction]) -> None:
+        for owner, owned in _group_by_owner(transactions).items():
+            with Session(get_engine(owner)) as session:
+                for t in owned:
+                    session.add(t)
+                session.commit()
+
+    @timed()
     def delete_batch(self, batch_id: str, user_id: UUID) -> None:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             statement = delete(Transaction).where(Transaction.batch_id == batch_id).where(Transaction.owner == user_id)
             session.exec(statement)
             session.commit()
@@ -107,14 +321,38 @@ class SqlTransactionRepository(TransactionRepository):
 
 # --- PORTFOLIO REPO ---
 class SqlPortfolioRepository(PortfolioRepository):
+    @timed()
     def get_snapshot(self, user_id: UUID) -> List[InvestmentPosition]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             return list(session.exec(select(InvestmentPosition).where(InvestmentPosition.owner == user_id)).all())
 
+    @timed()
     def get_history(self, user_id: UUID) -> List[InvestmentEvent]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             return list(session.exec(select(InvestmentEvent).where(InvestmentEvent.owner == user_id)).all())
 
+    @timed()
+    def get_snapshot_totals(self, user_id: UUID) -> Tuple[int, int, int]:
+        with Session(get_engine(user_id)) as session:
+            statement = select(_sum_minor(InvestmentPosition.market_value),
+                               _sum_minor(InvestmentPosition.cost_basis),
+                               _sum_minor(InvestmentPosition.projected_annual_income)
+                               ).where(InvestmentPosition.owner == user_id)
+            market_value, cost_basis, income = session.exec(statement).one()
+            return int(market_value), int(cost_basis), int(income)
+
+    @timed()
+    def get_history_frame(self, user_id: UUID) -> pd.DataFrame:
+        with Session(get_engine(user_id)) as session:
+            statement = (select(InvestmentEvent.date, InvestmentEvent.event_type,
+                                minor_sql(InvestmentEvent.total_amount))
+                         .where(InvestmentEvent.owner == user_id).order_by(InvestmentEvent.date))
+            rows = session.exec(statement).all()
+        df = pd.DataFrame.from_records(rows, columns=["date", "event_type", "amount_minor"])
+        df["amount_minor"] = df["amount_minor"].astype("int64")
+        return df
+
+    @timed()
     def save_snapshot_file(self, file_obj) -> None:
         # Persist uploaded snapshot CSV into the current user's data folder
         try:
@@ -127,6 +365,7 @@ class SqlPortfolioRepository(PortfolioRepository):
         except Exception as e:
             logger.exception('Failed to save snapshot file: %s', e)
 
+    @timed()
     def save_history_file(self, file_obj) -> None:
         try:
             auth = AuthService()
@@ -138,38 +377,84 @@ class SqlPortfolioRepository(PortfolioRepository):
         except Exception as e:
             logger.exception('Failed to save history file: %s', e)
 
+    @timed()
     def save_positions(self, positions: List[InvestmentPosition]):
-        with Session(engine) as session:
-            if positions:
-                uid = positions[0].owner
-                session.exec(delete(InvestmentPosition).where(InvestmentPosition.owner == uid))
-                session.add_all(positions)
-                session.commit()
+        if not positions:
+            return
+        uid = positions[0].owner
+        with Session(get_engine(uid)) as session:
+            session.exec(delete(InvestmentPosition).where(InvestmentPosition.owner == uid))
+            session.add_all(positions)
+            session.commit()
 
+    @timed()
     def save_events(self, events: List[InvestmentEvent]):
-        with Session(engine) as session:
-            uid = events[0].owner
+        uid = events[0].owner
+        with Session(get_engine(uid)) as session:
             session.exec(delete(InvestmentEvent).where(InvestmentEvent.owner == uid))
             session.add_all(events)
             session.commit()
 
 # --- TAX LOT REPO ---
 class SqlTaxLotRepository:
+    @timed()
     def get_open_lots(self, user_id: UUID, ticker: str = None) -> List[TaxLot]:
-        with Session(engine) as session:
+        with Session(get_engine(user_id)) as session:
             query = select(TaxLot).where(TaxLot.owner == user_id).where(TaxLot.date_sold == None)
             if ticker:
                 query = query.where(TaxLot.ticker == ticker)
             return list(session.exec(query).all())
 
+    @timed()
     def save(self, lot: TaxLot) -> None:
-        with Session(engine) as session:
+        with Session(get_engine(lot.owner)) as session:
             session.merge(lot)
             session.commit()
 
+    @timed()
     def save_bulk(self, lots: List[TaxLot]) -> None:
-        with Session(engine) as session:
-            for lot in lots:
-                session.add(lot)
+        for owner, owned in _group_by_owner(lots).items():
+            with Session(get_engine(owner)) as session:
+                for lot in owned:
+                    session.add(lot)
+                session.commit()
+
+
+# --- IMPORT JOB REPO ---
+# Job bookkeeping is cross-user (restart recovery), so it stays in the shared database
+class SqlImportJobRepository(ImportJobRepository):
+    @timed()
+    def save(self, job: ImportJob) -> None:
+        job.updated_at = datetime.now()
+        with Session(get_engine()) as session:
+            session.merge(job)
             session.commit()
 
+    @timed()
+    def get(self, job_id: UUID, user_id: UUID) -> Optional[ImportJob]:
+        with Session(get_engine()) as session:
+            statement = select(ImportJob).where(ImportJob.id == job_id).where(ImportJob.owner == user_id)
+            return session.exec(statement).first()
+
+    @timed()
+    def get_recent(self, user_id: UUID, limit: int = 10) -> List[ImportJob]:
+        with Session(get_engine()) as session:
+            statement = (select(ImportJob).where(ImportJob.owner == user_id)
+                         .order_by(ImportJob.created_at.desc()).limit(limit))
+            return list(session.exec(statement).all())
+
+    @timed()
+    def fail_unfinished(self, reason: str) -> int:
+        with Session(get_engine()) as session:
+            unfinished = session.exec(
+                select(ImportJob).where(ImportJob.status.in_([ImportJobStatus.QUEUED, ImportJobStatus.RUNNING]))
+            ).all()
+            now = datetime.now()
+            for job in unfinished:
+                job.status = ImportJobStatus.FAILED
+                job.errors = list(job.errors or []) + [reason]
+                job.updated_at = now
+                job.finished_at = now
+                session.add(job)
+            session.commit()
+            return len(unfinished)
@@ -1,10 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import date
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 from uuid import UUID
 import pandas as pd
 from src.domain.models.MTransaction import Transaction
+from src.domain.enums import TransactionType
+
+class CategorizationRow(NamedTuple):
+    id: UUID
+    description: str
+    amount_minor: int
+    category: str
+    transaction_type: TransactionType
+    batch_id: str
+    suggested_category: Optional[str]
+    suggested_type: Optional[TransactionType]
+    confidence: Optional[float]
+    dismissed_category: Optional[str]
+
+
+class CategoryChange(NamedTuple):
+    id: UUID
+    category: str
+    transaction_type: TransactionType
+    suggested_category: Optional[str]
+    suggested_type: Optional[TransactionType]
+    confidence: Optional[float]
+
+class TransferLeg(NamedTuple):
+    id: UUID
+    date: date
+    amount_minor: int
+    source_account: Optional[str]
+    target_account: Optional[str]
+
+
+class TransferLink(NamedTuple):
+    id: UUID
+    transfer_id: UUID
 
 class TransactionRepository(ABC):
+    """
+    Storage of a user's transactions. The four abstract methods are what every
+    backend provides; the ledger queries (columnar reads, recategorization,
+    review queue, transfer pairing) are implemented by SqlTransactionRepository.
+    """
+
     @abstractmethod
     def get_all(self, user_id: UUID) -> List[Transaction]:
         """Retrieve all transactions as Domain Objects."""
@@ -15,6 +56,57 @@ class TransactionRepository(ABC):
         """Retrieve as DataFrame for heavy analytics/charting."""
         pass
 
+    def get_ledger_frame(self, user_id: UUID) -> pd.DataFrame:
+        """
+        Ledger columns only (no ORM objects), one row per transaction, newest first.
+        Amounts come as int64 minor units in `amount_minor` (see src/core/money.py).
+        """
+        raise NotImplementedError
+
+    def get_cashflow_totals(self, user_id: UUID) -> Tuple[int, int, int]:
+        """(balance, income, spend) in minor units; spend is negative."""
+        raise NotImplementedError
+
+    def get_categorization_page(self, user_id: UUID, after_id: Optional[UUID], limit: int,
+                                since: Optional[date] = None) -> List[CategorizationRow]:
+        """
+        Keyset page in id order: up to `limit` rows with id > after_id
+        (and date >= since), for passes over the whole ledger in bounded memory.
+        """
+        raise NotImplementedError
+
+    def update_categories(self, user_id: UUID, changes: List[CategoryChange]) -> None:
+        """Bulk-sets category, type and suggestion fields by transaction id."""
+        raise NotImplementedError
+
+    def get_review_queue(self, user_id: UUID, max_confidence: float, limit: int) -> pd.DataFrame:
+        """
+        Transactions with a pending suggestion and confidence below max_confidence,
+        least confident first (id, date, description, amount_minor, category,
+        suggested_category, confidence).
+        """
+        raise NotImplementedError
+
+    def resolve_suggestions(self, user_id: UUID, ids: Sequence[UUID], accept: bool) -> int:
+        """
+        Clears the suggestion of the given transactions. accept=True first applies
+        the suggested category and type; accept=False records the category as
+        dismissed so it is not suggested again. Returns the number of rows changed.
+        """
+        raise NotImplementedError
+
+    def get_transfer_candidates(self, user_id: UUID, categories: Sequence[str],
+                                since: Optional[date] = None) -> List[TransferLeg]:
+        """Non-zero transactions without a transfer_id in the given categories (and date >= since)."""
+        raise NotImplementedError
+
+    def link_transfers(self, user_id: UUID, links: List[TransferLink]) -> None:
+        """
+        Sets transfer_id on the given transactions and makes them Internal
+        Transfers (type Transfer, suggestion cleared).
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def save_bulk(self, transactions: List[Transaction]) -> None:
         """Bulk save for uploads."""
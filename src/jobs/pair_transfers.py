@@ -0,0 +1,45 @@
+# src/jobs/pair_transfers.py
+"""
+Pairs the legs of transfers between one user's own accounts at different banks
+in the stored ledger (imports do this for their own date range).
+
+Usage (e.g. for ledgers imported before pairing existed):
+    python -m src.jobs.pair_transfers --owner 8c3f...
+    python -m src.jobs.pair_transfers --owner 8c3f... --since 2025-01-01
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from uuid import UUID
+
+from src.application.asset_service import AssetService
+from src.application.ingestion_service import IngestionService
+from src.application.ledger_service import LedgerService
+from src.application.rule_service import RuleService
+from src.core.database import init_db
+from src.domain.repositories.sql_repository import SqlAssetRepository, SqlTransactionRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--owner", type=UUID, required=True, help="User whose ledger to scan.")
+    parser.add_argument("--since", type=date.fromisoformat, help="Only transactions on/after this date (YYYY-MM-DD).")
+    args = parser.parse_args(argv)
+
+    # force: importing streamlit may already have configured the root logger
+    logging.basicConfig(level=logging.INFO, force=True)
+    init_db()
+
+    ingestion = IngestionService(RuleService(), AssetService(SqlAssetRepository()))
+    service = LedgerService(SqlTransactionRepository(), ingestion)
+    pairs = service.pair_transfers(args.owner, since=args.since)
+    logger.info("Linked %d transfer pair(s)", pairs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
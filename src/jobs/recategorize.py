@@ -0,0 +1,50 @@
+# src/jobs/recategorize.py
+"""
+Re-applies the current categorization rules to one user's stored ledger.
+
+Usage (e.g. after bulk-learning rules or rebuilding the vector index):
+    python -m src.jobs.recategorize --owner 8c3f...
+    python -m src.jobs.recategorize --owner 8c3f... --since 2025-01-01
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+from uuid import UUID
+
+from src.application.asset_service import AssetService
+from src.application.ingestion_service import IngestionService
+from src.application.ledger_service import LedgerService
+from src.application.rule_service import RuleService
+from src.core.database import init_db
+from src.domain.repositories.sql_repository import SqlAssetRepository, SqlTransactionRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--owner", type=UUID, required=True, help="User whose ledger to recategorize.")
+    parser.add_argument("--since", type=date.fromisoformat, help="Only transactions on/after this date (YYYY-MM-DD).")
+    args = parser.parse_args(argv)
+
+    # force: importing streamlit may already have configured the root logger
+    logging.basicConfig(level=logging.INFO, force=True)
+    init_db()
+
+    ingestion = IngestionService(RuleService(), AssetService(SqlAssetRepository()))
+    service = LedgerService(SqlTransactionRepository(), ingestion)
+    summary = service.recategorize(
+        args.owner, since=args.since,
+        on_progress=lambda scanned, changed: logger.info("Scanned %d, changed %d", scanned, changed))
+
+    logger.info("Recategorized %d of %d transaction(s); %d suggestion(s) updated",
+                summary.changed, summary.scanned, summary.suggested)
+    for (old, new), count in sorted(summary.transitions.items(), key=lambda item: -item[1]):
+        logger.info("  %s -> %s: %d", old, new, count)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
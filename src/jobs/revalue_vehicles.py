@@ -0,0 +1,40 @@
+# src/jobs/revalue_vehicles.py
+"""
+Scheduled vehicle revaluation for every user (or one owner).
+
+Usage (e.g. from cron, monthly):
+    python -m src.jobs.revalue_vehicles
+    python -m src.jobs.revalue_vehicles --owner 8c3f...  --year 2027
+"""
+import argparse
+import logging
+import sys
+from uuid import UUID
+
+from src.application.asset_service import AssetService
+from src.core.database import init_db
+from src.domain.repositories.sql_repository import SqlAssetRepository
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--owner", type=UUID, help="Only revalue this user's vehicles.")
+    parser.add_argument("--year", type=int, help="Valuation year (defaults to the current year).")
+    args = parser.parse_args(argv)
+
+    # force: importing streamlit may already have configured the root logger
+    logging.basicConfig(level=logging.INFO, force=True)
+    init_db()
+
+    service = AssetService(SqlAssetRepository())
+    updated = service.revalue_vehicles(user_id=args.owner, all_owners=args.owner is None,
+                                       current_year=args.year)
+    logger.info("Revalued %d vehicle(s)", updated)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
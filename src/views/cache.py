@@ -0,0 +1,36 @@
+# src/views/cache.py
+"""
+Version-keyed read cache for page renders.
+
+Results are cached per (kind, user, data version). Tab switches and widget clicks
+rerun the page but hit the cache; a write in any service, in this process or a
+job's, bumps the version (see src/core/data_version.py) and the next render reloads.
+"""
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID
+
+import streamlit as st
+
+from src.core import data_version
+
+
+def _get_user_id() -> UUID:
+    return UUID(st.session_state["user"]["id"])
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _load(kind: str, user_id: str, scopes: tuple, version: tuple, _loader: Callable[[], Any]) -> Any:
+    # `_loader` is excluded from the cache key; (kind, user, scopes, version) identifies the result
+    return _loader()
+
+
+def cached(kind: str, loader: Callable[[], Any], scopes: Optional[Iterable[str]] = None) -> Any:
+    """
+    Returns `loader()` for the current user, reusing the cached result while the
+    user's data in `scopes` is unchanged. `scopes=None` depends on all of it.
+    :param kind: unique name of the result, e.g. "ledger_frame"
+    """
+    uid = _get_user_id()
+    scopes = tuple(scopes) if scopes is not None else (None,)
+    version = tuple(data_version.get(uid, scope) for scope in scopes)
+    return _load(kind, str(uid), scopes, version, loader)
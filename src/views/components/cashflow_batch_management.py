@@ -0,0 +1,15 @@
+import streamlit as st
+import pandas as pd
+
+
+def render_batch_management(batches: pd.DataFrame, service, key_suffix: str = "batch"):
+    if batches.empty:
+        st.info("No import batches yet.")
+        return
+
+    st.dataframe(batches, use_container_width=True, hide_index=True)
+    # use a unique key to avoid DuplicateWidgetID when component is used multiple times
+    sel = st.selectbox("Select Batch", batches['Batch_ID'].unique(), key=f"select_batch_{key_suffix}")
+    if st.button("Delete Batch", key=f"delete_batch_{key_suffix}"):
+        service.delete_batch(sel)
+        st.rerun()
@@ -1,8 +1,9 @@
 import streamlit as st
 from datetime import date
+from src.domain.enums import ImportJobStatus
 
 
-def render_entry_upload_tab(service):
+def render_entry_upload_tab(service, job_service):
     c1, c2 = st.columns(2)
 
     # Manual Entry
@@ -36,22 +37,70 @@ def render_entry_upload_tab(service):
     # Batch Upload
     with c2:
         st.subheader("Batch Upload")
-        files = st.file_uploader("Bank CSVs/ZIPs", accept_multiple_files=True)
+        # Changing the key after a submit clears the uploader
+        nonce = st.session_state.get("bank_upload_nonce", 0)
+        files = st.file_uploader("Bank CSVs/ZIPs", accept_multiple_files=True, key=f"bank_upload_{nonce}")
         if files and st.button("Process Files"):
-            with st.spinner("Processing..."):
-                count, errors, duplicates = service.process_uploads(files)
+            job = job_service.submit(files)
+            st.session_state.setdefault("pending_import_jobs", set()).add(job.id)
+            st.session_state["bank_upload_nonce"] = nonce + 1
+            st.toast(f"Import queued ({job.files_total} files). You can keep working.", icon="📥")
+            st.rerun()
 
-                # Show Success
-                if count > 0:
-                    st.success(f"Processed {count} new transactions.")
+        _render_import_jobs(job_service)
 
-                if duplicates > 0:
-                    st.warning(f"Skipped {duplicates} duplicate transactions.")
 
-                # Show Errors
-                if errors:
-                    for err in errors:
-                        st.error(err)
+def _render_import_jobs(job_service):
+    """
+    Recent imports. Only while one is in flight does a fragment poll the job
+    table; idle sessions read it once per page run.
+    """
+    jobs = job_service.get_recent_jobs()
+    if st.session_state.get("pending_import_jobs") or any(job.is_active for job in jobs):
+        _poll_import_jobs(job_service)
+    else:
+        _show_import_jobs(jobs)
 
-                if count > 0:
-                    st.rerun()
+
+@st.fragment(run_every=2)
+def _poll_import_jobs(job_service):
+    """Only this fragment reruns while imports are in flight."""
+    jobs = job_service.get_recent_jobs()
+    refresh_page = _show_import_jobs(jobs)
+
+    if not any(job.is_active for job in jobs):
+        # Nothing left to wait for; the page rerun renders without this fragment, which stops polling
+        st.session_state["pending_import_jobs"] = set()
+        refresh_page = True
+    if refresh_page:
+        # Refresh the whole page so the ledger picks up the new batch
+        st.rerun(scope="app")
+
+
+def _show_import_jobs(jobs) -> bool:
+    """Renders the jobs; True if one this session submitted has finished."""
+    if not jobs:
+        return False
+
+    pending = st.session_state.setdefault("pending_import_jobs", set())
+    finished = False
+
+    st.caption("Recent imports")
+    for job in jobs:
+        if job.is_active:
+            st.progress(job.progress, text=f"{job.status.value}: {job.files_done}/{job.files_total} files")
+            continue
+
+        label = f"{job.batch_id} – {job.status.value}"
+        if job.status == ImportJobStatus.COMPLETED:
+            st.success(f"{label}: {job.imported_count} new, {job.duplicate_count} duplicates skipped.")
+        else:
+            st.error(label)
+        for err in (job.errors or []):
+            st.error(err)
+
+        if job.id in pending:
+            pending.discard(job.id)
+            finished = True
+
+    return finished
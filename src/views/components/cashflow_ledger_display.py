@@ -1,57 +1,80 @@
+import numpy as np
 import streamlit as st
 import pandas as pd
 
+PAGE_SIZE = 250
 
-def _style_ledger(df: pd.DataFrame):
+# Columns to display
+DISPLAY_COLS = [
+    "date", "description", "amount", "category", "account",
+    "is_internal", "suggested_category", "confidence"
+]
+
+ROW_STYLES = {
+    "internal": "background-color: lightblue",
+    "duplicate": "background-color: lightcoral",
+}
+
+COLUMN_CONFIG = {
+    "date": st.column_config.TextColumn("date"),
+    "amount": st.column_config.NumberColumn("amount", format="%.2f"),
+    "confidence": st.column_config.NumberColumn("confidence", format="percent"),
+}
+
+
+def prepare_ledger(ledger_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Applies styling to the ledger DataFrame for better readability.
+    Sorts, preformats and computes row highlights, for render_ledger_display.
+    Callers cache the result with the ledger it was built from (CashflowViewModel).
+    The hidden `_row_style` column carries the CSS for each row.
     """
-    def style_row(row):
-        style = ''
-        if row.get('is_internal'):
-            style = 'background-color: lightblue'
-        elif row.get('is_duplicate'):
-            style = 'background-color: lightcoral'
-        return [style] * len(row)
+    # Normalize columns: prefer lowercase 'date'
+    sort_col = 'date' if 'date' in ledger_df.columns else 'Date'
 
-    styler = df.style.apply(style_row, axis=1)
+    # Filter out columns that don't exist in the DataFrame
+    existing_cols = [col for col in DISPLAY_COLS if col in ledger_df.columns]
+    display_df = ledger_df.sort_values(sort_col, ascending=False)
 
-    styler.format({
-        "date": lambda x: x.strftime("%Y-%m-%d") if isinstance(x, pd.Timestamp) else x,
-        "amount": "{:,.2f}",
-        "confidence": "{:.2%}"
-    })
+    internal = display_df['is_internal'].fillna(False).astype(bool) if 'is_internal' in display_df else False
+    duplicate = display_df['is_duplicate'].fillna(False).astype(bool) if 'is_duplicate' in display_df else False
+    row_style = np.select([np.asarray(internal), np.asarray(duplicate)],
+                          [ROW_STYLES["internal"], ROW_STYLES["duplicate"]], default="")
 
-    return styler
+    display_df = display_df[existing_cols].copy()
+    if 'date' in display_df:
+        display_df['date'] = pd.to_datetime(display_df['date']).dt.strftime("%Y-%m-%d")
+    if 'amount' in display_df:
+        display_df['amount'] = display_df['amount'].astype(float)
+    if 'confidence' in display_df:
+        display_df['confidence'] = pd.to_numeric(display_df['confidence'], errors='coerce')
+    display_df['_row_style'] = row_style
+    return display_df.reset_index(drop=True)
 
 
-def render_ledger_display(ledger_df, service, key_suffix: str = "default"):
-    if not ledger_df.empty:
-        # Normalize columns: prefer lowercase 'date'
-        sort_col = 'date' if 'date' in ledger_df.columns else 'Date'
+def _style_ledger(page_df: pd.DataFrame):
+    """
+    Applies styling to one page of the prepared ledger with a single frame-wide call.
+    """
+    visible = page_df.drop(columns='_row_style')
+    css = np.repeat(page_df['_row_style'].to_numpy()[:, None], visible.shape[1], axis=1)
+    return visible.style.apply(lambda df: pd.DataFrame(css, index=df.index, columns=df.columns), axis=None)
 
-        # Columns to display
-        display_cols = [
-            "date", "description", "amount", "category", "account",
-            "is_internal", "suggested_category", "confidence"
-        ]
 
-        # Filter out columns that don't exist in the DataFrame
-        existing_cols = [col for col in display_cols if col in ledger_df.columns]
+def render_ledger_display(prepared: pd.DataFrame, key_suffix: str = "default"):
+    """:param prepared: output of prepare_ledger"""
+    if not prepared.empty:
 
-        display_df = ledger_df[existing_cols].sort_values(sort_col, ascending=False)
+        # Only the visible page is styled and sent to the browser
+        n_pages = max(1, -(-len(prepared) // PAGE_SIZE))
+        page = 1
+        if n_pages > 1:
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1,
+                                   key=f"ledger_page_{key_suffix}")
+        start = (page - 1) * PAGE_SIZE
+        page_df = prepared.iloc[start:start + PAGE_SIZE]
 
-        st.dataframe(_style_ledger(display_df), use_container_width=True)
+        st.dataframe(_style_ledger(page_df), use_container_width=True, hide_index=True,
+                     column_config=COLUMN_CONFIG)
+        st.caption(f"Showing {start + 1}–{start + len(page_df)} of {len(prepared)} transactions")
     else:
         st.info("No data found.")
-
-    # Batch management controls
-    history = service.get_batch_history()
-    if not history.empty:
-        st.dataframe(history, use_container_width=True)
-        batch_col = 'Batch_ID' if 'Batch_ID' in history.columns else 'batch_id'
-        # use a unique key to avoid DuplicateWidgetID when component is used multiple times
-        sel = st.selectbox("Select Batch", history[batch_col].unique(), key=f"select_batch_{key_suffix}")
-        if st.button("Delete Batch", key=f"delete_batch_{key_suffix}"):
-            service.delete_batch(sel)
-            st.rerun()
@@ -0,0 +1,44 @@
+import streamlit as st
+
+from src.core import data_version
+from src.views.cache import cached
+
+REVIEW_LIMIT = 500
+
+COLUMN_CONFIG = {
+    "id": None,
+    "amount": st.column_config.NumberColumn("amount", format="%.2f"),
+    "confidence": st.column_config.ProgressColumn("confidence", min_value=0.0, max_value=1.0, format="percent"),
+}
+
+
+def render_review_queue(service, key_suffix: str = "review"):
+    """
+    Triage of rule suggestions that were not confident enough to apply.
+    Only rows below the chosen confidence are read (indexed range query).
+    """
+    max_confidence = st.slider("Show suggestions below confidence", 0.0, 1.0, 1.0, 0.05,
+                               key=f"review_confidence_{key_suffix}")
+    queue = cached(f"review_queue:{max_confidence:.2f}",
+                   lambda: service.get_review_queue(max_confidence, REVIEW_LIMIT),
+                   scopes=[data_version.LEDGER])
+    if queue.empty:
+        st.info("Nothing to review.")
+        return
+
+    st.caption(f"{len(queue)} suggestion(s), least confident first"
+               + (f" (first {REVIEW_LIMIT})" if len(queue) == REVIEW_LIMIT else ""))
+    event = st.dataframe(queue, use_container_width=True, hide_index=True, column_config=COLUMN_CONFIG,
+                         on_select="rerun", selection_mode="multi-row", key=f"review_table_{key_suffix}")
+    selected = queue['id'].iloc[event.selection.rows].tolist()
+
+    c1, c2, c3 = st.columns(3)
+    if c1.button("Accept selected", disabled=not selected, key=f"review_accept_{key_suffix}"):
+        service.resolve_suggestions(selected, accept=True)
+        st.rerun()
+    if c2.button("Dismiss selected", disabled=not selected, key=f"review_dismiss_{key_suffix}"):
+        service.resolve_suggestions(selected, accept=False)
+        st.rerun()
+    if c3.button("Accept all shown", key=f"review_accept_all_{key_suffix}"):
+        service.resolve_suggestions(queue['id'].tolist(), accept=True)
+        st.rerun()
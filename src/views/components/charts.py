@@ -4,8 +4,12 @@ import plotly.express as px
 import pandas as pd
 from typing import List
 from src.domain.models.MPortfolio import InvestmentPosition
+from src.views.downsample import downsample_series
 import plotly.graph_objects as go
 
+# Trailing windows offered by the range selector, in years (None = full history)
+_RANGE_OPTIONS = {"1Y": 1, "3Y": 3, "5Y": 5, "10Y": 10, "All": None}
+
 
 def render_portfolio_allocation(positions: List[InvestmentPosition]):
     if not positions:
@@ -23,39 +27,44 @@ def render_invested_capital_curve(df: pd.DataFrame):
         st.info("No history data available.")
         return
 
-    if 'Date' in df.columns: df.rename(columns={'Date': 'date'}, inplace=True)
-    if 'Invested Capital' not in df.columns:
-        # Fallback if your VM uses different naming
-        pass
+    df = df.rename(columns={'Date': 'date'})
+    df['date'] = pd.to_datetime(df['date'])
+    df = _select_date_range(df, 'date', key="invested_capital_range")
+
+    # Only the selected window is shipped, reduced to a fixed point budget
+    df = downsample_series(df, 'date', 'Invested Capital')
 
     fig = px.area(df, x='date', y='Invested Capital', title="Invested Capital Over Time")
     fig.update_traces(line_color='#2980b9', fillcolor='rgba(41, 128, 185, 0.3)')
     st.plotly_chart(fig, use_container_width=True)
 
 
-def render_spending_trend(df: pd.DataFrame):
-    if df.empty:
-        return
-
-    chart_df = df.copy()
-
-    date_col = 'date' if 'date' in chart_df.columns else 'Date'
-    amt_col = 'amount' if 'amount' in chart_df.columns else 'Amount'
-
-    chart_df['Month'] = pd.to_datetime(chart_df[date_col]).dt.to_period('M').astype(str)
-
-    monthly = chart_df.groupby('Month')[amt_col].agg(
-        Income=lambda x: x[x > 0].sum(),
-        Expense=lambda x: x[x < 0].sum()
-    ).reset_index()
-
-    if monthly.empty:
+def render_spending_trend(trend: pd.DataFrame, label: str = "Monthly"):
+    """
+    :param trend: Income/Expense columns indexed by period; the bucket size is chosen
+                  upstream (see CashflowViewModel) so the bar count stays bounded
+    """
+    if trend.empty:
         st.info("Not enough data for trends.")
         return
 
     fig = go.Figure()
-    fig.add_trace(go.Bar(x=monthly['Month'], y=monthly['Income'], name='Income', marker_color='#2ecc71'))
-    fig.add_trace(go.Bar(x=monthly['Month'], y=monthly['Expense'], name='Expenses', marker_color='#e74c3c'))
+    fig.add_trace(go.Bar(x=trend.index, y=trend['Income'], name='Income', marker_color='#2ecc71'))
+    fig.add_trace(go.Bar(x=trend.index, y=trend['Expense'], name='Expenses', marker_color='#e74c3c'))
+
+    fig.update_layout(barmode='relative', title=f"{label} Cashflow Trend", height=350)
+    st.plotly_chart(fig, use_container_width=True)
 
-    fig.update_layout(barmode='relative', title="Monthly Cashflow Trend", height=350)
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+def _select_date_range(df: pd.DataFrame, date_col: str, key: str) -> pd.DataFrame:
+    """Trailing-window selector; only offers windows shorter than the available history."""
+    start, end = df[date_col].min(), df[date_col].max()
+    span_years = (end - start).days / 365.25
+    options = [name for name, years in _RANGE_OPTIONS.items() if years is None or years < span_years]
+    if len(options) == 1:
+        return df
+
+    choice = st.segmented_control("Range", options, default="All", key=key, label_visibility="collapsed")
+    years = _RANGE_OPTIONS.get(choice)
+    if years is None:
+        return df
+    return df[df[date_col] >= end - pd.DateOffset(years=years)]
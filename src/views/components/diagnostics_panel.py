@@ -0,0 +1,48 @@
+# src/views/components/diagnostics_panel.py
+import streamlit as st
+from src.core import instrumentation
+
+
+def _rows(snapshot: dict) -> list[dict]:
+    return [
+        {
+            "Metric": name,
+            "Calls": s["count"],
+            "Total (ms)": round(s["total_ms"], 1),
+            "Mean (ms)": round(s["mean_ms"], 2),
+            "p50 (ms)": round(s["p50_ms"], 2),
+            "p95 (ms)": round(s["p95_ms"], 2),
+            "p99 (ms)": round(s["p99_ms"], 2),
+        }
+        for name, s in snapshot["metrics"].items()
+    ]
+
+
+def render_diagnostics_panel():
+    """
+    Timing breakdown for the current rerun and since process start.
+    Render it last so the rerun table covers the whole page.
+    """
+    if not instrumentation.is_enabled():
+        return
+
+    rerun = instrumentation.current_rerun().snapshot()
+    total = instrumentation.cumulative.snapshot()
+
+    with st.expander("🩺 Diagnostics", expanded=False):
+        c1, c2 = st.columns(2)
+        c1.metric("SQL statements (this rerun)", rerun["sql_statements"])
+        c2.metric("SQL statements (since start)", total["sql_statements"])
+
+        st.caption("This rerun")
+        st.dataframe(_rows(rerun), use_container_width=True, hide_index=True)
+
+        st.caption("Since process start")
+        st.dataframe(_rows(total), use_container_width=True, hide_index=True)
+
+        d1, d2 = st.columns(2)
+        d1.download_button("Download JSON", instrumentation.dump_json(),
+                           file_name="diagnostics.json", mime="application/json")
+        if d2.button("Reset counters"):
+            instrumentation.cumulative.reset()
+            st.rerun()
@@ -0,0 +1,68 @@
+# src/views/downsample.py
+"""
+Server-side reduction of long series before they are handed to Plotly.
+
+The browser payload grows with the number of points, not with what is visible,
+so charts reduce the selected range to a fixed point/bar budget first.
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+MAX_POINTS = 1500
+MAX_BARS = 60
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: picks `n_out` indices that preserve the visual shape.
+    First and last points are always kept. `x` must be ascending and numeric.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points (the endpoints are their own buckets)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # The next bucket's average is the third vertex of the triangle
+        nxt_start, nxt_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        if nxt_end <= nxt_start:
+            nxt_end = nxt_start + 1
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+
+        bx, by = x[start:end], y[start:end]
+        areas = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample_series(df: pd.DataFrame, x_col: str, y_col: str, max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """Returns at most `max_points` rows of `df` (sorted by `x_col`), chosen by LTTB."""
+    if len(df) <= max_points:
+        return df
+
+    df = df.sort_values(x_col)
+    x = pd.to_datetime(df[x_col]).to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(np.float64)
+    y = df[y_col].to_numpy(dtype=np.float64)
+    return df.iloc[lttb_indices(x, y, max_points)]
+
+
+def bar_granularity(start: pd.Timestamp, end: pd.Timestamp, max_bars: int = MAX_BARS) -> Tuple[str, str]:
+    """Coarsest-needed period so the range fits in `max_bars` bars: (pandas freq, label)."""
+    months = (end.year - start.year) * 12 + (end.month - start.month) + 1
+    if months <= max_bars:
+        return "M", "Monthly"
+    if months / 3 <= max_bars:
+        return "Q", "Quarterly"
+    return "Y", "Yearly"
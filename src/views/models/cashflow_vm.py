@@ -0,0 +1,99 @@
+# src/views/models/cashflow_vm.py
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.application.ledger_service import LedgerService
+from src.core import data_version
+from src.core.money import minor_to_float
+from src.views.cache import cached
+from src.views.components.cashflow_ledger_display import prepare_ledger
+from src.views.downsample import bar_granularity
+
+
+@dataclass
+class CashflowPageData:
+    ledger: pd.DataFrame  # one row per transaction, TransactionViewModel columns
+    grid: pd.DataFrame  # the ledger sorted and styled for render_ledger_display
+    trend: pd.DataFrame  # Income/Expense per period, indexed by period label
+    trend_label: str  # "Monthly", "Quarterly" or "Yearly"
+    batches: pd.DataFrame  # Batch_ID, Upload_Date, Tx_Count, Total_In, Total_Out
+
+
+class CashflowViewModel:
+    """
+    Builds everything the Cashflow page shows from a single columnar ledger read.
+    Cached per ledger data version, so tab switches don't touch the database.
+    """
+
+    def __init__(self, service: LedgerService):
+        self.svc = service
+
+    def get_page_data(self) -> CashflowPageData:
+        return cached("cashflow_page", self._build, scopes=[data_version.LEDGER])
+
+    def _build(self) -> CashflowPageData:
+        raw = self.svc.get_ledger_frame()
+        if raw.empty:
+            empty = pd.DataFrame()
+            return CashflowPageData(ledger=empty, grid=empty, trend=empty, trend_label="Monthly", batches=empty)
+
+        # Sums run on exact int64 minor units; floats only for display
+        minor = raw['amount_minor']
+        dates = pd.to_datetime(raw['date'])
+        income = minor.clip(lower=0)
+        expense = minor.clip(upper=0)
+        # Transfers between own accounts are neither income nor spend
+        external = raw['category'].ne("Internal Transfer")
+
+        ledger = self._ledger_frame(raw, minor)
+        return CashflowPageData(
+            ledger=ledger,
+            grid=prepare_ledger(ledger),
+            **self._trend(dates, income.where(external, 0), expense.where(external, 0)),
+            batches=self._batch_stats(raw['batch_id'], dates, income, expense),
+        )
+
+    @staticmethod
+    def _ledger_frame(raw: pd.DataFrame, minor: pd.Series) -> pd.DataFrame:
+        # Same columns as LedgerService._create_view_model, derived column-wise
+        account = np.where(minor < 0, raw['source_account'], raw['target_account'])
+        return pd.DataFrame({
+            'id': raw['id'].astype(str),
+            'date': raw['date'],
+            'description': raw['description'],
+            'amount': minor_to_float(minor.to_numpy()),
+            'category': raw['category'].fillna("Uncategorized"),
+            'account': pd.Series(account, index=raw.index).fillna("Unknown"),
+            'is_internal': raw['category'].eq("Internal Transfer"),
+            'is_duplicate': False,
+            'suggested_category': raw['suggested_category'],
+            'confidence': pd.to_numeric(raw['confidence'], errors='coerce'),
+            'notes': raw['notes'],
+            'tags': raw['tags'],
+            'batch_id': raw['batch_id'],
+        })
+
+    @staticmethod
+    def _trend(dates: pd.Series, income: pd.Series, expense: pd.Series) -> dict:
+        freq, label = bar_granularity(dates.min(), dates.max())
+        periods = dates.dt.to_period(freq).astype(str).to_numpy()
+        trend = pd.DataFrame({'Income': income, 'Expense': expense}).groupby(periods).sum()
+        trend = trend.apply(lambda col: minor_to_float(col.to_numpy()))
+        return {'trend': trend, 'trend_label': label}
+
+    @staticmethod
+    def _batch_stats(batch_ids: pd.Series, dates: pd.Series, income: pd.Series,
+                     expense: pd.Series) -> pd.DataFrame:
+        stats = pd.DataFrame({
+            'Batch_ID': batch_ids, 'date': dates, 'in': income, 'out': expense,
+        }).groupby('Batch_ID').agg(
+            Upload_Date=('date', 'max'),
+            Tx_Count=('in', 'size'),
+            Total_In=('in', 'sum'),
+            Total_Out=('out', 'sum'),
+        ).reset_index()
+        stats['Total_In'] = minor_to_float(stats['Total_In'].to_numpy())
+        stats['Total_Out'] = minor_to_float(stats['Total_Out'].to_numpy())
+        return stats.sort_values('Upload_Date', ascending=False)
@@ -2,6 +2,8 @@
 import pandas as pd
 from dataclasses import dataclass
 from src.application.portfolio_service import PortfolioService
+from src.core import data_version
+from src.views.cache import cached
 
 
 @dataclass
@@ -27,8 +29,12 @@ class PortfolioViewModel:
             return True
         return False
 
+    def _overview(self):
+        # Shared by metrics, grid and allocation; one load per portfolio version
+        return cached("portfolio_overview", self.svc.get_portfolio_overview, scopes=[data_version.PORTFOLIO])
+
     def get_metrics(self) -> PortfolioDisplayMetrics:
-        _, metrics = self.svc.get_portfolio_overview()
+        _, metrics = self._overview()
 
         # Logic for formatting and colors happens HERE, not in the View
         is_profit = metrics.total_profit >= 0
@@ -45,7 +51,7 @@ class PortfolioViewModel:
         )
 
     def get_holdings_grid(self) -> pd.DataFrame:
-        positions, _ = self.svc.get_portfolio_overview()
+        positions, _ = self._overview()
         if not positions:
             return pd.DataFrame()
 
@@ -64,11 +70,12 @@ class PortfolioViewModel:
         return pd.DataFrame(data)
 
     def get_allocation_chart_data(self):
-        positions, _ = self.svc.get_portfolio_overview()
+        positions, _ = self._overview()
         return positions  # Passing objects to chart is okay, or transform here
 
     def get_curve_data(self) -> pd.DataFrame:
-        return self.svc.get_invested_capital_curve()
+        return cached("invested_capital_curve", self.svc.get_invested_capital_curve,
+                      scopes=[data_version.PORTFOLIO])
 
     def get_dividend_data(self) -> pd.DataFrame:
-        return self.svc.get_dividend_history()
\ No newline at end of file
+        return cached("dividend_history", self.svc.get_dividend_history, scopes=[data_version.PORTFOLIO])
\ No newline at end of file
@@ -2,7 +2,9 @@
 import streamlit as st
 from decimal import Decimal
 from src.container import get_container
+from src.core import data_version
 from src.domain.enums import AssetCategory, LiabilityCategory, CashCategory, Currency, RealEstateType
+from src.views.cache import cached
 from src.views.components.kpi_cards import render_executive_summary_cards
 from src.views.utils import format_currency, get_currency_icon
 
@@ -20,7 +22,8 @@ def render_view():
         container = get_container()
         asset_svc = container['asset']
         liab_svc = container['liability']
-        summary_data = container['summary'].get_executive_summary()
+        summary_data = cached("executive_summary", container['summary'].get_executive_summary)
+        all_assets = cached("user_assets", asset_svc.get_user_assets, scopes=[data_version.ASSETS])
 
     render_executive_summary_cards(summary_data)
 
@@ -28,7 +31,7 @@ def render_view():
 
     # --- 1. REAL ESTATE ---
     with t_re:
-        assets = [a for a in asset_svc.get_user_assets() if a.category == AssetCategory.REAL_ESTATE]
+        assets = [a for a in all_assets if a.category == AssetCategory.REAL_ESTATE]
         for a in assets:
             render_asset_card(a, asset_svc.update_asset_value, asset_svc.delete_asset, "🏡")
 
@@ -39,11 +42,11 @@ def render_view():
     # --- 2. VEHICLES ---
     with t_veh:
         if st.button("Update Vehicle Market Values", key="update_vehicle_values"):
-            asset_svc.run_vehicle_amortization_update()
-            st.toast("Vehicle values updated based on amortization.", icon="🎉")
+            updated = asset_svc.revalue_vehicles()
+            st.toast(f"{updated} vehicle value(s) updated based on amortization.", icon="🎉")
             st.rerun()
 
-        assets = [a for a in asset_svc.get_user_assets() if a.category == AssetCategory.VEHICLE]
+        assets = [a for a in all_assets if a.category == AssetCategory.VEHICLE]
         for a in assets:
             render_asset_card(a, asset_svc.update_asset_value, asset_svc.delete_asset, "🚗")
 
@@ -53,7 +56,7 @@ def render_view():
 
     # --- 3. CASH ---
     with t_cash:
-        assets = [a for a in asset_svc.get_user_assets() if a.category == AssetCategory.CASH]
+        assets = [a for a in all_assets if a.category == AssetCategory.CASH]
         for a in assets:
             render_asset_card(a, asset_svc.update_asset_value, asset_svc.delete_asset, "💰")
 
@@ -63,7 +66,7 @@ def render_view():
 
     # --- 4. LIABILITIES ---
     with t_liab:
-        liabs = liab_svc.get_user_liabilities()
+        liabs = cached("user_liabilities", liab_svc.get_user_liabilities, scopes=[data_version.LIABILITIES])
         for l in liabs:
             render_liability_card(l, liab_svc.update_liability_details, liab_svc.delete_liability, "💳")
 
@@ -163,7 +166,7 @@ def _render_add_asset_form(service, category):
 
         # Correctly check against the string value from the selectbox
         if state['cash_type'] == CashCategory.SAVINGS_ACCOUNT.value:
-            existing_buckets = list(set(a.bucket_name for a in service.get_user_assets() if a.category == AssetCategory.CASH and a.bucket_name))
+            existing_buckets = list(set(a.bucket_name for a in cached("user_assets", service.get_user_assets, scopes=[data_version.ASSETS]) if a.category == AssetCategory.CASH and a.bucket_name))
             all_options = ["Create new..."] + existing_buckets
 
             # Ensure the state's bucket_name is a valid choice, otherwise default
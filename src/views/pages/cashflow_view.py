@@ -4,6 +4,8 @@ from src.container import get_container
 from src.views.components.charts import render_spending_trend
 from src.views.components.cashflow_entry_upload import render_entry_upload_tab
 from src.views.components.cashflow_ledger_display import render_ledger_display
+from src.views.components.cashflow_batch_management import render_batch_management
+from src.views.components.cashflow_review import render_review_queue
 
 
 def render_view():
@@ -11,20 +13,23 @@ def render_view():
 
     container = get_container()
     service = container['ledger']
-    ledger_df = service.get_recent_transactions()
+    # One columnar read per ledger version; each tab gets only its slice
+    data = container['cashflow_vm'].get_page_data()
 
-    tabs = st.tabs(["📊 Analytics", "📥 Entry & Upload", "📜 Ledger Data", "📂 Batch Management"])
+    tabs = st.tabs(["📊 Analytics", "📥 Entry & Upload", "📜 Ledger Data", "🔎 Review", "📂 Batch Management"])
 
     with tabs[0]:
         st.subheader("Cashflow Trends")
-        render_spending_trend(ledger_df)
+        render_spending_trend(data.trend, data.trend_label)
 
     with tabs[1]:
-        render_entry_upload_tab(service)
+        render_entry_upload_tab(service, container['import_jobs'])
 
     with tabs[2]:
-        render_ledger_display(ledger_df, service, key_suffix="ledger")
+        render_ledger_display(data.grid, key_suffix="ledger")
 
     with tabs[3]:
-        # Keep Batch Management in ledger display component to reduce duplication
-        render_ledger_display(ledger_df, service, key_suffix="batch")
+        render_review_queue(service)
+
+    with tabs[4]:
+        render_batch_management(data.batches, service)
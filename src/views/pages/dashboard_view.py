@@ -1,5 +1,6 @@
 import streamlit as st
 from src.container import get_container
+from src.views.cache import cached
 from src.views.components.kpi_cards import render_executive_summary_cards, render_cashflow_summary
 
 
@@ -14,7 +15,7 @@ def render_view():
         summary_svc = container['summary']
 
         # 2. Get Logic (One line!)
-        data = summary_svc.get_executive_summary()
+        data = cached("executive_summary", summary_svc.get_executive_summary)
 
     # 3. Render
     render_executive_summary_cards(data)
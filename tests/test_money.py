@@ -0,0 +1,44 @@
+# tests/test_money.py
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.core.money import from_minor, minor_to_float, to_minor, to_minor_array
+
+
+@pytest.mark.parametrize("amount, minor", [
+    (Decimal("12.34"), 1234),
+    (Decimal("-12.34"), -1234),
+    ("0.125", 12),  # half-even: ties go to the even cent
+    ("0.135", 14),
+    ("-0.125", -12),
+    (0.1, 10),  # floats by repr, not binary expansion
+    (1.005, 100),
+    (19.99, 1999),
+    (7, 700),
+    (None, 0),
+])
+def test_to_minor(amount, minor):
+    assert to_minor(amount) == minor
+
+
+def test_from_minor_has_two_places():
+    assert from_minor(12345) == Decimal("123.45")
+    assert from_minor(np.int64(-5)) == Decimal("-0.05")
+    assert from_minor(100).as_tuple().exponent == -2
+
+
+def test_round_trip_is_exact_for_two_decimal_amounts():
+    amounts = [Decimal("0.01"), Decimal("-999999999.99"), Decimal("1234.50")]
+    assert [from_minor(m) for m in to_minor_array(amounts)] == amounts
+
+
+def test_to_minor_array_is_int64():
+    minor = to_minor_array([Decimal("1.10"), "2.205", 3.3])
+    assert minor.dtype == np.int64
+    assert minor.tolist() == [110, 220, 330]
+
+
+def test_minor_to_float():
+    assert minor_to_float(np.array([150, -5])).tolist() == [1.5, -0.05]
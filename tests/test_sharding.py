@@ -0,0 +1,74 @@
+# tests/test_sharding.py
+"""
+Sharding is configured from the environment at import time, so each scenario
+runs in a fresh interpreter against a scratch database.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SCENARIO = textwrap.dedent("""
+    import json
+    from uuid import UUID
+    from sqlmodel import Session, select
+    from src.core import database
+    from src.domain.enums import TransactionType
+    from src.domain.models.MRule import CategoryRule
+
+    alice = UUID("00000000-0000-0000-0000-00000000000a")
+    bob = UUID("00000000-0000-0000-0000-00000000000b")
+    carol = UUID("00000000-0000-0000-0000-00000000000c")
+
+    database.init_db()
+    # Rows written before sharding was switched on live in the shared DB
+    with Session(database.engine) as session:
+        for owner, pattern in [(alice, "Albert"), (alice, "Shell"), (bob, "Lidl")]:
+            session.add(CategoryRule(pattern=pattern, category="Groceries",
+                                     transaction_type=TransactionType.EXPENSE, owner=owner))
+        session.commit()
+
+    before = [str(o) for o in database.shard_owners()]
+    with Session(database.get_engine(alice)) as session:
+        seeded = sorted(r.pattern for r in session.exec(select(CategoryRule)))
+    # Empty shard for an owner with no shared rows
+    database.get_engine(carol)
+    after = [str(o) for o in database.shard_owners()]
+    shard_files = sorted(p.parent.name for p in database.SHARD_ROOT.glob("*/" + database.SHARD_FILE))
+    print(json.dumps({"before": before, "seeded": seeded, "after": after, "shard_files": shard_files}))
+""")
+
+
+def _run(tmp_path, sharding="1"):
+    env = dict(os.environ, CFO_DB_FILE=str(tmp_path / "db" / "cfo.db"), CFO_DB_SHARDING=sharding,
+               PYTHONPATH=str(ROOT))
+    env.pop("CFO_SHARD_ROOT", None)
+    (tmp_path / "db").mkdir()
+    out = subprocess.run([sys.executable, "-c", SCENARIO], cwd=tmp_path, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_new_shard_is_seeded_with_the_owners_shared_rows(tmp_path):
+    result = _run(tmp_path)
+    assert result["seeded"] == ["Albert", "Shell"]
+
+
+def test_shard_owners_lists_sharded_and_not_yet_sharded_owners(tmp_path):
+    result = _run(tmp_path)
+    alice, bob, carol = (f"00000000-0000-0000-0000-00000000000{c}" for c in "abc")
+    # Nobody has a shard yet: owners come from the shared tables
+    assert result["before"] == [alice, bob]
+    # Alice and Carol have shard files; Bob is still only in the shared DB
+    assert result["shard_files"] == [alice, carol]
+    assert result["after"] == [alice, bob, carol]
+
+
+def test_shard_owners_is_empty_without_sharding(tmp_path):
+    result = _run(tmp_path, sharding="0")
+    assert result["before"] == [] and result["after"] == []
+    assert result["shard_files"] == []
@@ -0,0 +1,64 @@
+# tests/test_sniffer.py
+import io
+
+from src.core.ingestion.sniffer import (SAMPLE_BYTES, decode_text, detect_delimiter, detect_encoding,
+                                        read_header, sniff)
+from src.core.parsers import _detect_csv_df
+
+
+def _cut_at_sample_edge(char: str = "č") -> bytes:
+    """UTF-8 file whose first multi-byte character straddles the SAMPLE_BYTES boundary."""
+    head = b"Datum;Popis\n"
+    filler = b"x" * (SAMPLE_BYTES - len(head) - 1)
+    return head + filler + char.encode("utf-8") + b"\n"
+
+
+def test_utf8_character_cut_at_sample_edge_is_still_utf8():
+    content = _cut_at_sample_edge()
+    assert content[SAMPLE_BYTES - 1:SAMPLE_BYTES + 1] == "č".encode("utf-8")
+    assert detect_encoding(content) == "utf-8"
+    assert sniff(content).encoding == "utf-8"
+
+
+def test_prefix_of_a_stream_is_not_final():
+    prefix = _cut_at_sample_edge()[:SAMPLE_BYTES]
+    assert detect_encoding(prefix, is_final=False) == "utf-8"
+    # As a whole file, the dangling lead byte means it is not UTF-8
+    assert detect_encoding(prefix) == "cp1250"
+
+
+def test_cp1250_and_bom_detection():
+    assert detect_encoding("Částka;Zpráva\n".encode("cp1250")) == "cp1250"
+    assert detect_encoding(b"\xef\xbb\xbfa;b\n") == "utf-8-sig"
+    assert detect_encoding("a;b\n".encode("utf-16")) == "utf-16"
+
+
+def test_cp1250_beyond_the_sample_falls_back_on_decode():
+    rows = b"x;y\n" * (SAMPLE_BYTES // 4 + 1)
+    content = b"a;b\n" + rows + "Žluťoučký;kůň\n".encode("cp1250")
+    sniffed = sniff(content)
+    assert sniffed.encoding == "utf-8"
+    assert decode_text(content, sniffed).endswith("Žluťoučký;kůň\n")
+
+    df = _detect_csv_df(io.BytesIO(content))
+    assert df.iloc[-1].tolist() == ["Žluťoučký", "kůň"]
+
+
+def test_delimiter_with_decimal_commas():
+    sample = "Datum;Částka;Popis\n01.01.2024;1 234,56;Nájem\n02.01.2024;-12,50;Káva\n"
+    assert detect_delimiter(sample) == ";"
+
+
+def test_delimiter_ignores_a_row_cut_at_the_sample_edge():
+    sample = "a,b,c\n1,2,3\n4,5,6\n7;8;9;10;11;1"
+    assert detect_delimiter(sample) == ","
+
+
+def test_delimiter_of_a_single_column_defaults_to_comma():
+    assert detect_delimiter("Amount\n1\n2\n") == ","
+    assert detect_delimiter("") == ","
+
+
+def test_read_header_decodes_only_the_first_line():
+    content = "\ufeffOwn account name;Processing Date\n".encode("utf-8") + b"\xff\xfe garbage"
+    assert read_header(content, sniff(content)) == ["Own account name", "Processing Date"]
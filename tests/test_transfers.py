@@ -0,0 +1,74 @@
+# tests/test_transfers.py
+from datetime import date
+
+import numpy as np
+
+from src.core.transfers import pair_account_legs, pair_legs
+
+D = date(2024, 3, 1)
+E = date(2024, 3, 2)
+
+
+def test_pair_legs_pairs_opposite_legs_within_window():
+    partner = pair_legs(np.array(["k", "k"]), np.array([-500, 500]), [D, E])
+    assert partner.tolist() == [1, 0]
+
+
+def test_pair_legs_respects_key_window_and_sign():
+    keys = np.array(["a", "b", "a", "a", "a"])
+    amounts = np.array([-500, 500, -700, -700, 700])
+    dates = [D, D, date(2024, 2, 1), D, E]
+    # Different key, then same sign, then out of window: only legs 3 and 4 pair
+    assert pair_legs(keys, amounts, dates, window_days=3).tolist() == [-1, -1, -1, 4, 3]
+
+
+def test_pair_legs_claims_earliest_unpaired_leg_once():
+    partner = pair_legs(np.zeros(3), np.array([-100, -100, 100]), [D, E, E])
+    assert partner.tolist() == [2, -1, 0]
+
+
+def test_pair_legs_ignores_zero_amounts():
+    assert pair_legs(np.zeros(2), np.array([0, 0]), [D, D]).tolist() == [-1, -1]
+
+
+def test_pair_legs_empty():
+    assert pair_legs(np.array([]), np.array([], dtype=np.int64), []).tolist() == []
+
+
+def _pair(sources, targets, amounts=(-1000, 1000), dates=(D, E)):
+    return pair_account_legs(list(sources), list(targets), np.array(amounts), list(dates)).tolist()
+
+
+def test_account_legs_pair_when_each_names_the_other():
+    assert _pair(["111/0100", "222/0300"], ["222/0300", "111/0100"]) == [1, 0]
+
+
+def test_account_legs_pair_when_one_names_the_other_and_one_is_blank():
+    assert _pair(["111/0100", "222/0300"], ["222/0300", None]) == [1, 0]
+    assert _pair(["111/0100", "222/0300"], [None, "111/0100"]) == [1, 0]
+
+
+def test_account_legs_match_by_number_across_bank_code_and_iban_forms():
+    assert _pair(["CZ65 0800 0000 1920 0014 5399", "222/0300"], ["222", "19-2000145399"]) == [1, 0]
+
+
+def test_account_legs_missing_counterparty_is_not_a_wildcard():
+    # Equal amounts on two own accounts, neither naming the other: a payment and an unrelated refund
+    assert _pair(["111/0100", "222/0300"], [None, None]) == [-1, -1]
+
+
+def test_account_legs_naming_a_third_account_never_pair():
+    assert _pair(["111/0100", "222/0300"], ["999/0800", "111/0100"]) == [-1, -1]
+    assert _pair(["111/0100", "222/0300"], ["222/0300", "999/0800"]) == [-1, -1]
+
+
+def test_account_legs_need_two_known_different_accounts():
+    assert _pair(["111/0100", "111/0100"], ["111/0100", "111/0100"]) == [-1, -1]
+    assert _pair([None, "222/0300"], ["222/0300", None]) == [-1, -1]
+
+
+def test_account_legs_skip_incompatible_leg_for_a_later_one():
+    # The first inflow is a refund from a shop; the second is the transfer
+    partner = _pair(["111/0100", "222/0300", "222/0300"], ["222/0300", "555/0800", "111/0100"],
+                    amounts=(-1000, 1000, 1000), dates=(D, D, E))
+    assert partner == [2, -1, 0]